@@ -1,10 +1,20 @@
 import streamlit as st
 import os
-from utils.ai_assessment import AIAssessmentEngine
-from utils.data_processing import DataProcessor
-from utils.visualization import create_progress_chart
+import sys
+import datetime
+from utils.resources import warm_up_resources
+from utils.startup import preload_deferred_modules
+from utils.styles import apply_stylesheet
+from utils.session_store import (restore_session_state, persist_session_state, clear_session_state,
+                                 start_authenticated_session)
+from utils.auth import get_authenticator
+from utils.metrics import start_timer, observe_since, metrics_enabled, export_metrics
+from utils.student_search import student_picker
+from utils.page_fragments import student_card_html, teacher_card_html, hero_banner_html, assessment_card_html, learning_path_header_html, module_section_html, challenge_card_html
+from utils.learning_path_view import SUBJECT_VIEWS, mastery_card_html, module_card_html, module_detail_html, learning_style_html, weak_areas_html
 from data.student_data import get_student_data, get_all_students
-from data.sample_assessments import get_available_assessments
+from data.sample_assessments import get_assessment_summaries, get_assessment_completion_stats, create_assessment, get_student_submissions
+from data.item_bank import get_question_parameters
 
 # Set page configuration
 st.set_page_config(
@@ -14,141 +24,24 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-# Custom CSS for enhanced visual design
-st.markdown("""
-<style>
-    /* Main container styles */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 3rem;
-    }
-    
-    /* Headers */
-    h1, h2, h3 {
-        color: #4B8BF4;
-        margin-bottom: 1rem;
-    }
-    h1 {
-        font-size: 2.5rem;
-        font-weight: 700;
-        padding-bottom: 1rem;
-        border-bottom: 2px solid #F0F2F6;
-    }
-    h2 {
-        font-size: 1.8rem;
-        font-weight: 600;
-        margin-top: 1.5rem;
-    }
-    h3 {
-        font-size: 1.3rem;
-        font-weight: 600;
-    }
-    
-    /* Card style elements */
-    .info-card, .stExpander {
-        background-color: #f8f9fa;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        border-left: 4px solid #4B8BF4;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.05);
-    }
-    
-    /* Metrics */
-    .stMetric {
-        background-color: white;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        box-shadow: 0 2px 5px rgba(0, 0, 0, 0.05);
-    }
-    
-    /* Category-specific cards */
-    .math-card {
-        border-left: 4px solid #4285F4;
-    }
-    .science-card {
-        border-left: 4px solid #34A853;
-    }
-    .language-card {
-        border-left: 4px solid #FBBC05;
-    }
-    .history-card {
-        border-left: 4px solid #EA4335;
-    }
-    
-    /* Sidebar styling */
-    .css-1oe6o3n.e1fqkh3o10, .css-1oe6o3n {
-        background-color: #f0f2f6;
-        border-radius: 0.5rem;
-        padding: 1rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Button styling */
-    .stButton button {
-        border-radius: 4px;
-        padding: 0.5rem 1rem;
-        font-weight: 600;
-        transition: all 0.2s ease;
-    }
-    .stButton button:hover {
-        opacity: 0.85;
-        transform: translateY(-1px);
-    }
-    
-    /* Progress bars */
-    .stProgress > div > div {
-        background-color: #4B8BF4;
-    }
-    
-    /* Table styling */
-    .dataframe {
-        border: none;
-    }
-    .dataframe tbody tr:nth-child(odd) {
-        background-color: #f8f9fa;
-    }
-    .dataframe tbody tr:hover {
-        background-color: #eaecef;
-    }
-    
-    /* Info, success, warning boxes */
-    .info-box {
-        background-color: #e8f0fe;
-        border-left: 4px solid #4B8BF4;
-        padding: 1rem;
-        border-radius: 0.5rem;
-    }
-    .success-box {
-        background-color: #e6f4ea;
-        border-left: 4px solid #34A853;
-        padding: 1rem;
-        border-radius: 0.5rem;
-    }
-    .warning-box {
-        background-color: #fef7e0;
-        border-left: 4px solid #FBBC05;
-        padding: 1rem;
-        border-radius: 0.5rem;
-    }
-    
-    /* Dashboard animations */
-    @keyframes fadeIn {
-        from { opacity: 0; transform: translateY(10px); }
-        to { opacity: 1; transform: translateY(0); }
-    }
-    .animate-fadein {
-        animation: fadeIn 0.5s ease forwards;
-    }
-    
-    /* Hover effects for clickable elements */
-    .stExpander:hover, .stButton button:hover {
-        cursor: pointer;
-        transform: translateY(-2px);
-        transition: transform 0.2s ease;
-    }
-</style>
-""", unsafe_allow_html=True)
+# `python app.py --profile-startup` reports where the cold start spends its time
+if __name__ == "__main__" and "--profile-startup" in sys.argv:
+    from utils.startup import main as profile_startup_main
+    sys.exit(profile_startup_main(sys.argv[sys.argv.index("--profile-startup") + 1:]))
+
+# Time the whole run as the page's render span (a no-op unless EDUTUTOR_METRICS=1)
+render_started = start_timer()
+
+# Warm the shared resources already imported for this page once per process.
+# Modules that load langchain, openai, plotly or pandas are imported by the
+# pages that use them, and preloaded once the first page has been drawn.
+warm_up_resources()
+
+# Custom CSS for enhanced visual design (read from assets/ once per process)
+apply_stylesheet("app")
+
+# Restore the user's state when this worker has not seen the session yet
+restore_session_state()
 
 # Initialize session state variables if they don't exist
 if 'user_type' not in st.session_state:
@@ -158,6 +51,11 @@ if 'current_user' not in st.session_state:
 if 'authenticated' not in st.session_state:
     st.session_state.authenticated = False
 
+# Every run re-checks the session token (a cache lookup after the first check)
+if st.session_state.authenticated and get_authenticator().verify(st.session_state.get('auth_token')) is None:
+    clear_session_state()
+    st.rerun()
+
 # Sidebar for navigation with enhanced visuals
 st.sidebar.markdown("""
 <div style='text-align: center; padding: 1rem 0;'>
@@ -173,6 +71,8 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 # Login functionality with improved UI
+# The page selected in the navigation, named in the render span
+nav_page = page = "Login"
 if not st.session_state.authenticated:
     st.sidebar.markdown("""
     <div style='background-color: #f8f9fa; padding: 1.2rem; border-radius: 0.5rem; margin: 1rem 0; 
@@ -181,28 +81,27 @@ if not st.session_state.authenticated:
     </div>
     """, unsafe_allow_html=True)
     
-    user_type = st.sidebar.selectbox("Select User Type", ["Student", "Teacher"])
+    user_type = st.sidebar.selectbox("Select User Type", ["Student", "Teacher"], key="login_user_type")
     
     if user_type == "Student":
-        students = get_all_students()
-        student_ids = [s['id'] for s in students]
-        student_names = [f"{s['first_name']} {s['last_name']}" for s in students]
-        
-        st.sidebar.markdown("""<p style='margin-bottom: 0.3rem; color: #666;'>Select your name:</p>""", unsafe_allow_html=True)
-        selected_student = st.sidebar.selectbox("", student_names, label_visibility="collapsed")
-        selected_index = student_names.index(selected_student)
+        st.sidebar.markdown("""<p style='margin-bottom: 0.3rem; color: #666;'>Find your name or student ID:</p>""", unsafe_allow_html=True)
+        student_id = student_picker("Find your name or student ID", "login_student", container=st.sidebar,
+                                    label_visibility="collapsed")
         
         st.sidebar.markdown("""<p style='margin: 0.8rem 0 0.3rem 0; color: #666;'>Enter your password:</p>""", unsafe_allow_html=True)
         password = st.sidebar.text_input("", type="password", label_visibility="collapsed", 
-                                       placeholder="Use 'password' for demo")
+                                       placeholder="Use 'password' for demo", key="login_password")
         
         # Login button with better styling
-        login_btn = st.sidebar.button("Login", use_container_width=True)
+        login_btn = st.sidebar.button("Login", use_container_width=True, key="login_button")
         
         if login_btn:
-            if password == "password":  # In a real app, use proper authentication
+            token = get_authenticator().login("student", student_id, password)
+            if token:
+                start_authenticated_session()
+                st.session_state.auth_token = token
                 st.session_state.user_type = "student"
-                st.session_state.current_user = student_ids[selected_index]
+                st.session_state.current_user = student_id
                 st.session_state.authenticated = True
                 st.rerun()
             else:
@@ -210,33 +109,37 @@ if not st.session_state.authenticated:
                 
     else:  # Teacher login
         st.sidebar.markdown("""<p style='margin-bottom: 0.3rem; color: #666;'>Teacher ID:</p>""", unsafe_allow_html=True)
-        teacher_id = st.sidebar.text_input("", label_visibility="collapsed", placeholder="Enter your teacher ID")
+        teacher_id = st.sidebar.text_input("", label_visibility="collapsed", placeholder="Enter your teacher ID",
+                                           key="login_teacher_id")
         
         st.sidebar.markdown("""<p style='margin: 0.8rem 0 0.3rem 0; color: #666;'>Enter your password:</p>""", unsafe_allow_html=True)
         password = st.sidebar.text_input(" ", type="password", label_visibility="collapsed", 
-                                       placeholder="Use 'teacher' for demo")
+                                       placeholder="Use 'teacher' for demo", key="login_teacher_password")
         
         # Login button with better styling
-        login_btn = st.sidebar.button("Login", use_container_width=True)
+        login_btn = st.sidebar.button("Login", use_container_width=True, key="login_button")
         
         if login_btn:
-            if password == "teacher":  # In a real app, use proper authentication
+            token = get_authenticator().login("teacher", teacher_id, password)
+            if token:
+                start_authenticated_session()
+                st.session_state.auth_token = token
                 st.session_state.user_type = "teacher"
                 st.session_state.current_user = teacher_id
                 st.session_state.authenticated = True
                 st.rerun()
             else:
-                st.sidebar.error("Incorrect password")
+                st.sidebar.error("Incorrect teacher ID or password")
                 
     # Add demo instructions
     st.sidebar.markdown("""
     <div style='background-color: #e8f0fe; padding: 1rem; border-radius: 0.5rem; margin-top: 1.5rem; 
          border-left: 4px solid #4B8BF4; font-size: 0.9rem;'>
         <p style='margin: 0 0 0.5rem 0; font-weight: 600; color: #4B8BF4;'>Demo Credentials:</p>
-        <p style='margin: 0 0 0.3rem 0;'><b>Student:</b> Any name from the list</p>
+        <p style='margin: 0 0 0.3rem 0;'><b>Student:</b> Search any name, e.g. Emma</p>
         <p style='margin: 0 0 0.3rem 0;'><b>Password:</b> password</p>
         <hr style='margin: 0.5rem 0; border-color: #c6d9f7;'>
-        <p style='margin: 0 0 0.3rem 0;'><b>Teacher ID:</b> Any ID (e.g., T1001)</p>
+        <p style='margin: 0 0 0.3rem 0;'><b>Teacher ID:</b> T1001</p>
         <p style='margin: 0;'><b>Password:</b> teacher</p>
     </div>
     """, unsafe_allow_html=True)
@@ -245,29 +148,11 @@ else:
     if st.session_state.user_type == "student":
         student_data = get_student_data(st.session_state.current_user)
         if student_data:
-            st.sidebar.markdown(f"""
-            <div style='background-color: #f8f9fa; padding: 1rem; border-radius: 0.5rem; 
-                 margin-bottom: 1rem; border-left: 4px solid #4B8BF4; text-align: center;'>
-                <div style='font-size: 0.85rem; color: #666; margin-bottom: 0.2rem;'>STUDENT</div>
-                <div style='font-size: 1.2rem; font-weight: 600; color: #4B8BF4;'>
-                    {student_data['first_name']} {student_data['last_name']}
-                </div>
-                <div style='font-size: 0.85rem; color: #666; margin-top: 0.2rem;'>ID: {student_data['id']}</div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.sidebar.markdown(student_card_html(student_data), unsafe_allow_html=True)
     else:
         # Teacher display
         teacher_id = st.session_state.current_user if st.session_state.current_user else "T1001"
-        st.sidebar.markdown(f"""
-        <div style='background-color: #f8f9fa; padding: 1rem; border-radius: 0.5rem; 
-             margin-bottom: 1rem; border-left: 4px solid #4B8BF4; text-align: center;'>
-            <div style='font-size: 0.85rem; color: #666; margin-bottom: 0.2rem;'>TEACHER</div>
-            <div style='font-size: 1.2rem; font-weight: 600; color: #4B8BF4;'>
-                Teacher Profile
-            </div>
-            <div style='font-size: 0.85rem; color: #666; margin-top: 0.2rem;'>ID: {teacher_id}</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.sidebar.markdown(teacher_card_html(teacher_id), unsafe_allow_html=True)
     
     # Navigation links section with a more modern look
     st.sidebar.markdown("""
@@ -279,8 +164,8 @@ else:
     
     # Logout button with improved styling
     if st.sidebar.button("Logout", type="primary", use_container_width=True):
-        for key in st.session_state.keys():
-            del st.session_state[key]
+        get_authenticator().logout(st.session_state.get('auth_token'))
+        clear_session_state()
         st.rerun()
     
     if st.session_state.user_type == "student":
@@ -291,6 +176,11 @@ else:
             if st.sidebar.button("← Back to Assessments", use_container_width=True):
                 st.session_state.page = None
                 st.rerun()
+        elif st.session_state.get('page') == "adaptive_assessment":
+            page = "adaptive_assessment"
+            if st.sidebar.button("← Back to Assessments", use_container_width=True):
+                st.session_state.page = None
+                st.rerun()
         elif st.session_state.get('page') == "essay_assessment":
             page = "essay_assessment"
             # Add a back button
@@ -300,39 +190,16 @@ else:
         else:
             page = st.sidebar.radio(
                 "Go to:",
-                ["Dashboard", "Available Assessments", "Learning Path", "My Progress", "AI Essay Grading"]
+                ["Dashboard", "Available Assessments", "Learning Path", "My Progress", "AI Essay Grading"],
+                key="student_nav"
             )
         
+        nav_page = page
         if page == "Dashboard":
             # Student Dashboard
             # Welcome section with hero banner
             if student_data:
-                st.markdown(f"""
-                <div style="background-color: #4B8BF4; padding: 2rem; border-radius: 0.8rem; margin-bottom: 2rem; 
-                    background-image: linear-gradient(135deg, #4B8BF4, #3267d6); color: white; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
-                    <h1 style="margin: 0; color: white; font-size: 2.2rem;">Welcome, {student_data['first_name']}!</h1>
-                    <p style="color: rgba(255, 255, 255, 0.9); margin: 0.5rem 0 1.5rem 0; font-size: 1.1rem;">
-                        Your personalized learning journey continues
-                    </p>
-                    <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
-                        <div style="background: rgba(255,255,255,0.2); padding: 0.7rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
-                            <div style="font-size: 0.85rem; opacity: 0.8;">Overall Average</div>
-                            <div style="font-size: 1.5rem; font-weight: 600;">
-                                {sum([
-                                    student_data['performance']['math'], 
-                                    student_data['performance']['science'],
-                                    student_data['performance']['language_arts'],
-                                    student_data['performance']['history']
-                                ]) / 4:.1f}%
-                            </div>
-                        </div>
-                        <div style="background: rgba(255,255,255,0.2); padding: 0.7rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
-                            <div style="font-size: 0.85rem; opacity: 0.8;">Completed Assessments</div>
-                            <div style="font-size: 1.5rem; font-weight: 600;">{student_data['completed_assessments']}</div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(hero_banner_html(student_data), unsafe_allow_html=True)
                 
                 # Modern layout with cards
                 col1, col2 = st.columns([3, 2])
@@ -348,6 +215,7 @@ else:
                     </h2>
                     """, unsafe_allow_html=True)
                     
+                    from utils.visualization import create_progress_chart
                     fig = create_progress_chart(student_data)
                     st.plotly_chart(fig, use_container_width=True)
                     
@@ -361,23 +229,9 @@ else:
                     </h2>
                     """, unsafe_allow_html=True)
                     
-                    assessments = get_available_assessments()
+                    assessments = get_assessment_summaries()
                     for i, assessment in enumerate(assessments[:3]):
-                        subject_color = "#4285F4" if assessment['subject'] == "Math" else "#34A853" if assessment['subject'] == "Science" else "#FBBC05" if assessment['subject'] == "Language Arts" else "#EA4335"
-                        
-                        st.markdown(f"""
-                        <div style="border-left: 4px solid {subject_color}; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;
-                            background-color: white; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                            <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                                <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{assessment['title']}</div>
-                                <div style="background-color: {subject_color}; color: white; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem;">
-                                    {assessment['subject']}
-                                </div>
-                            </div>
-                            <div style="color: #666; margin-bottom: 0.5rem; font-size: 0.9rem;">Due: {assessment['due_date']}</div>
-                            <div style="margin: 0.8rem 0; font-size: 0.9rem;">Type: {assessment['type']} • Est. Time: {assessment['estimated_time']} min</div>
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(assessment_card_html(assessment), unsafe_allow_html=True)
                         
                         # Start button outside the markdown for functionality
                         st.button(f"Start {assessment['title']}", key=f"start_{assessment['id']}", type="primary", use_container_width=(i==0))
@@ -472,7 +326,20 @@ else:
         elif page == "Available Assessments":
             st.title("Available Assessments")
             
-            assessments = get_available_assessments()
+            # Adaptive checks pick each question from the previous answers
+            with st.container(border=True):
+                st.subheader("Adaptive Mastery Check")
+                st.write("A short test that adapts to your answers and measures your mastery level in a few questions.")
+                subject_labels = {"math": "Math", "science": "Science", "language_arts": "Language Arts", "history": "History"}
+                adaptive_subject = st.selectbox("Subject", list(subject_labels), format_func=subject_labels.get,
+                                                key="adaptive_subject_choice")
+                if st.button("Start Mastery Check", key="start_adaptive"):
+                    st.session_state.adaptive_subject = adaptive_subject
+                    st.session_state.adaptive_test = None
+                    st.session_state.page = "adaptive_assessment"
+                    st.rerun()
+            
+            assessments = get_assessment_summaries()
             for assessment in assessments:
                 with st.expander(f"{assessment['title']} - {assessment['subject']}"):
                     st.write(f"**Due Date:** {assessment['due_date']}")
@@ -487,35 +354,18 @@ else:
         elif page == "Learning Path":
             if student_data:
                 # Modern header with motivational message
-                st.markdown(f"""
-                <div style="background-color: #4B8BF4; padding: 2rem; border-radius: 0.8rem; margin-bottom: 2rem; 
-                    background-image: linear-gradient(135deg, #4B8BF4, #3267d6); color: white; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
-                    <h1 style="margin: 0; color: white; font-size: 2.2rem;">Your Learning Journey</h1>
-                    <p style="color: rgba(255, 255, 255, 0.9); margin: 0.5rem 0 0 0; font-size: 1.1rem;">
-                        Personalized path to mastery based on your learning style: <b>{student_data['learning_style']}</b>
-                    </p>
-                </div>
-                """, unsafe_allow_html=True)
+                st.markdown(learning_path_header_html(student_data['learning_style']), unsafe_allow_html=True)
+                
+                # Read the nightly precomputed path, or rank the modules now if it is out of date
+                from utils.recommendations import get_recommendations
+                from utils.insight_scheduler import get_fresh_insight
+                insight = get_fresh_insight(student_data)
+                recommendations = insight["recommendations"] if insight else get_recommendations(student_data)
                 
                 # Split into two columns for better layout
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
-                    # Current Level with visual representation
-                    subjects = ["Math", "Science", "Language Arts", "History"]
-                    current_levels = [student_data['performance']['math'] // 10, 
-                                    student_data['performance']['science'] // 10,
-                                    student_data['performance']['language_arts'] // 10,
-                                    student_data['performance']['history'] // 10]
-                    
-                    # Subject colors
-                    subject_colors = {
-                        "Math": "#4285F4",        # Google Blue
-                        "Science": "#34A853",     # Google Green
-                        "Language Arts": "#FBBC05", # Google Yellow
-                        "History": "#EA4335"      # Google Red
-                    }
-                    
                     st.markdown("""
                     <h2 style="display: flex; align-items: center; margin-bottom: 1.2rem;">
                         <span style="background-color: #4B8BF4; color: white; height: 32px; width: 32px; 
@@ -526,34 +376,9 @@ else:
                     """, unsafe_allow_html=True)
                     
                     # Display as cards with better visual representation
-                    subject_cards = ""
-                    for subject, level in zip(subjects, current_levels):
-                        subject_color = subject_colors.get(subject, "#4B8BF4")
-                        # Create progress circles
-                        progress_html = ""
-                        for i in range(10):
-                            if i < level:
-                                # Filled circle for completed levels
-                                progress_html += f'<span style="display: inline-block; width: 15px; height: 15px; border-radius: 50%; background-color: {subject_color}; margin-right: 4px;"></span>'
-                            else:
-                                # Empty circle for incomplete levels
-                                progress_html += f'<span style="display: inline-block; width: 15px; height: 15px; border-radius: 50%; border: 1px solid {subject_color}; margin-right: 4px;"></span>'
-                        
-                        # Create subject card
-                        subject_cards += f"""
-                        <div style="background-color: white; border-left: 4px solid {subject_color}; padding: 1rem; 
-                            border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                            <div style="display: flex; justify-content: space-between; align-items: center;">
-                                <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{subject}</div>
-                                <div style="font-size: 1rem; color: {subject_color}; font-weight: 600;">Level {level}/10</div>
-                            </div>
-                            <div style="margin-top: 0.8rem;">
-                                {progress_html}
-                            </div>
-                        </div>
-                        """
-                    
-                    st.markdown(subject_cards, unsafe_allow_html=True)
+                    st.markdown("".join(mastery_card_html(subject, level)
+                                        for subject, level in recommendations["levels"].items()),
+                                unsafe_allow_html=True)
                     
                     # Recommended modules section with enhanced styling
                     st.markdown("""
@@ -565,224 +390,52 @@ else:
                     </h2>
                     """, unsafe_allow_html=True)
                     
-                    # Math recommendations with modern toggle
-                    with st.expander("**Mathematics**", expanded=True):
-                        math_level = current_levels[0]
-                        
-                        # Cards for recommended modules
-                        if math_level < 5:
-                            modules = [
-                                {"title": "Foundational Algebra", "icon": "📊", "description": "Strengthen your understanding of algebraic fundamentals including equations, expressions, and inequalities.", "time": "4-6 weeks", "difficulty": "Beginner"},
-                                {"title": "Number Theory Basics", "icon": "🔢", "description": "Learn key properties of numbers, factors, multiples, and prime numbers with practical applications.", "time": "3-4 weeks", "difficulty": "Beginner"}
-                            ]
-                        elif math_level < 8:
-                            modules = [
-                                {"title": "Advanced Functions", "icon": "📈", "description": "Master different function types including quadratic, exponential, and logarithmic functions.", "time": "5-7 weeks", "difficulty": "Intermediate"},
-                                {"title": "Geometry Essentials", "icon": "📐", "description": "Explore spatial relationships, triangles, circles, and coordinate geometry with proofs.", "time": "4-6 weeks", "difficulty": "Intermediate"}
-                            ]
-                        else:
-                            modules = [
-                                {"title": "Calculus Concepts", "icon": "🧮", "description": "Begin exploring calculus principles including limits, derivatives, and basic integration.", "time": "6-8 weeks", "difficulty": "Advanced"},
-                                {"title": "Statistical Analysis", "icon": "🔍", "description": "Advanced data interpretation, hypothesis testing, and statistical inference techniques.", "time": "5-7 weeks", "difficulty": "Advanced"}
-                            ]
-                        
-                        # Display modules as modern cards with functional buttons
-                        for i, module in enumerate(modules):
-                            # Create the card with unique styling
-                            st.markdown(f"""
-                            <div style="background-color: white; border-left: 4px solid #4285F4; padding: 1rem; 
-                                border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                                    <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{module["icon"]} {module["title"]}</div>
-                                    <div style="background-color: #e8f0fe; color: #4285F4; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem; font-weight: 500;">
-                                        {module["difficulty"]}
-                                    </div>
-                                </div>
-                                <div style="color: #555; margin-bottom: 0.8rem; font-size: 0.95rem;">
-                                    {module["description"]}
-                                </div>
-                                <div style="display: flex; justify-content: space-between; align-items: center;">
-                                    <div style="color: #666; font-size: 0.9rem;">
-                                        <i>Estimated time: {module["time"]}</i>
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Add a button that works outside of the markdown for module start
-                            if st.button(f"Start {module['title']}", key=f"math_module_{i}", type="primary" if i == 0 else "secondary"):
-                                st.session_state.current_module = {
-                                    "title": module["title"],
-                                    "subject": "Math",
-                                    "difficulty": module["difficulty"],
-                                    "description": module["description"],
-                                    "icon": module["icon"]
-                                }
-                                st.success(f"Starting {module['title']} module...")
+                    for subject, modules in recommendations["modules"].items():
+                        view = SUBJECT_VIEWS[subject]
+                        with st.expander(f"**{view['title']}**", expanded=(subject == "math")):
+                            # Display modules as modern cards with functional buttons
+                            for i, module in enumerate(modules):
+                                st.markdown(module_card_html(subject, module["icon"], module["title"], module["level"],
+                                                             module["description"], module["time"]),
+                                            unsafe_allow_html=True)
                                 
-                        # Show module content if a module is selected
-                        if st.session_state.get('current_module'):
-                            module = st.session_state.current_module
-                            st.markdown(f"""
-                            <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 0.8rem; margin: 1.5rem 0; 
-                                border-left: 4px solid #4285F4;">
-                                <h3 style="margin-top: 0; font-size: 1.4rem; color: #4285F4; display: flex; align-items: center;">
-                                    <span style="margin-right: 0.5rem;">{module["icon"]}</span> {module["title"]} Module
-                                </h3>
-                                <p style="color: #555; margin-bottom: 1rem;">
-                                    {module["description"]}
-                                </p>
-                                <div style="background-color: white; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;">
-                                    <h4 style="margin-top: 0; font-size: 1.1rem; color: #333;">Learning Objectives</h4>
-                                    <ul style="margin-bottom: 0; padding-left: 1.5rem; color: #555;">
-                                        <li>Understand key concepts related to {module["title"].lower()}</li>
-                                        <li>Apply mathematical reasoning to solve problems</li>
-                                        <li>Develop critical thinking skills through practical examples</li>
-                                    </ul>
-                                </div>
-                                <div style="display: flex; justify-content: space-between; margin-top: 1.5rem;">
-                                    <div style="background-color: #e8f0fe; color: #4285F4; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
-                                        <span style="font-weight: 500;">Difficulty:</span> {module["difficulty"]}
-                                    </div>
-                                    <div style="background-color: #e8f0fe; color: #4285F4; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
-                                        <span style="font-weight: 500;">Subject:</span> {module["subject"]}
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Lesson modules with continue buttons
-                            lessons = ["Introduction", "Core Concepts", "Practice Problems", "Advanced Applications"]
-                            
-                            for i, lesson in enumerate(lessons):
-                                with st.expander(f"Lesson {i+1}: {lesson}", expanded=(i==0)):
-                                    st.markdown(f"""
-                                    <div style="padding: 0.5rem 0;">
-                                        <p>This is the content for the {lesson.lower()} section of {module['title']}.</p>
-                                        <p>In a complete implementation, this would include interactive content, videos, and exercises.</p>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    
-                                    if i < len(lessons) - 1:
-                                        if st.button(f"Continue to {lessons[i+1]}", key=f"continue_lesson_{i}"):
-                                            # This would open the next lesson in a real implementation
-                                            pass
-                                    else:
-                                        if st.button("Complete Module", key="complete_module", type="primary"):
-                                            st.balloons()
-                                            st.success("Congratulations! You've completed this module.")
-                                            # In a real implementation, this would mark the module as completed
-                    
-                    # Science recommendations
-                    with st.expander("**Science**"):
-                        science_level = current_levels[1]
-                        
-                        # Cards for recommended modules
-                        if science_level < 5:
-                            modules = [
-                                {"title": "Scientific Method", "icon": "🧪", "description": "Master the process of scientific inquiry, hypothesis formation, and experimental design.", "time": "3-5 weeks", "difficulty": "Beginner"},
-                                {"title": "Basic Biology", "icon": "🌱", "description": "Introduction to living systems, cell structure, and fundamental biological processes.", "time": "4-6 weeks", "difficulty": "Beginner"}
-                            ]
-                        elif science_level < 8:
-                            modules = [
-                                {"title": "Chemistry Fundamentals", "icon": "⚗️", "description": "Study matter, chemical reactions, and the periodic table with practical applications.", "time": "5-7 weeks", "difficulty": "Intermediate"},
-                                {"title": "Physics Principles", "icon": "🔋", "description": "Explore forces, energy, and motion through Newton's laws and energy conservation.", "time": "5-7 weeks", "difficulty": "Intermediate"}
-                            ]
-                        else:
-                            modules = [
-                                {"title": "Molecular Biology", "icon": "🧬", "description": "Advanced cellular concepts, DNA, and genetic expression with laboratory techniques.", "time": "6-8 weeks", "difficulty": "Advanced"},
-                                {"title": "Astrophysics Introduction", "icon": "🌌", "description": "Understanding the cosmos, stellar evolution, and fundamental forces of the universe.", "time": "6-8 weeks", "difficulty": "Advanced"}
-                            ]
-                        
-                        # Display modules as modern cards with functional buttons
-                        for i, module in enumerate(modules):
-                            # Create the card with unique styling
-                            st.markdown(f"""
-                            <div style="background-color: white; border-left: 4px solid #34A853; padding: 1rem; 
-                                border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                                    <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{module["icon"]} {module["title"]}</div>
-                                    <div style="background-color: #e6f4ea; color: #34A853; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem; font-weight: 500;">
-                                        {module["difficulty"]}
-                                    </div>
-                                </div>
-                                <div style="color: #555; margin-bottom: 0.8rem; font-size: 0.95rem;">
-                                    {module["description"]}
-                                </div>
-                                <div style="display: flex; justify-content: space-between; align-items: center;">
-                                    <div style="color: #666; font-size: 0.9rem;">
-                                        <i>Estimated time: {module["time"]}</i>
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
+                                # Add a button that works outside of the markdown for module start
+                                if st.button(f"Start {module['title']}", key=f"{view['button_prefix']}_{i}", type="primary" if i == 0 else "secondary"):
+                                    st.session_state[view["session_key"]] = {
+                                        "title": module["title"],
+                                        "subject": view["label"],
+                                        "difficulty": module["level"],
+                                        "description": module["description"],
+                                        "icon": module["icon"]
+                                    }
+                                    st.success(f"Starting {module['title']} module...")
                             
-                            # Add a button that works outside of the markdown for module start
-                            if st.button(f"Start {module['title']}", key=f"science_module_{i}", type="primary" if i == 0 else "secondary"):
-                                st.session_state.current_science_module = {
-                                    "title": module["title"],
-                                    "subject": "Science",
-                                    "difficulty": module["difficulty"],
-                                    "description": module["description"],
-                                    "icon": module["icon"]
-                                }
-                                st.success(f"Starting {module['title']} module...")
+                            # Show module content if a module is selected
+                            if st.session_state.get(view["session_key"]):
+                                module = st.session_state[view["session_key"]]
+                                st.markdown(module_detail_html(subject, module["icon"], module["title"],
+                                                               module["difficulty"], module["description"]),
+                                            unsafe_allow_html=True)
                                 
-                        # Show module content if a module is selected
-                        if st.session_state.get('current_science_module'):
-                            module = st.session_state.current_science_module
-                            st.markdown(f"""
-                            <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 0.8rem; margin: 1.5rem 0; 
-                                border-left: 4px solid #34A853;">
-                                <h3 style="margin-top: 0; font-size: 1.4rem; color: #34A853; display: flex; align-items: center;">
-                                    <span style="margin-right: 0.5rem;">{module["icon"]}</span> {module["title"]} Module
-                                </h3>
-                                <p style="color: #555; margin-bottom: 1rem;">
-                                    {module["description"]}
-                                </p>
-                                <div style="background-color: white; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;">
-                                    <h4 style="margin-top: 0; font-size: 1.1rem; color: #333;">Learning Objectives</h4>
-                                    <ul style="margin-bottom: 0; padding-left: 1.5rem; color: #555;">
-                                        <li>Understand key principles of {module["title"].lower()}</li>
-                                        <li>Apply scientific methodology to investigate concepts</li>
-                                        <li>Develop analytical skills through experiments and observation</li>
-                                    </ul>
-                                </div>
-                                <div style="display: flex; justify-content: space-between; margin-top: 1.5rem;">
-                                    <div style="background-color: #e6f4ea; color: #34A853; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
-                                        <span style="font-weight: 500;">Difficulty:</span> {module["difficulty"]}
-                                    </div>
-                                    <div style="background-color: #e6f4ea; color: #34A853; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
-                                        <span style="font-weight: 500;">Subject:</span> {module["subject"]}
-                                    </div>
-                                </div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                            
-                            # Science module components with interactive elements
-                            components = ["Theoretical Concepts", "Lab Experiments", "Data Analysis", "Real-World Applications"]
-                            
-                            for i, component in enumerate(components):
-                                with st.expander(f"Component {i+1}: {component}", expanded=(i==0)):
-                                    st.markdown(f"""
-                                    <div style="padding: 0.5rem 0;">
-                                        <p>This is the content for the {component.lower()} component of {module['title']}.</p>
-                                        <p>In a complete implementation, this would include interactive simulations, video demonstrations, and laboratory guides.</p>
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                                    
-                                    if component == "Lab Experiments":
-                                        st.info("Virtual lab simulations would be available here in the full implementation.")
-                                    
-                                    if i < len(components) - 1:
-                                        if st.button(f"Continue to {components[i+1]}", key=f"continue_component_{i}"):
-                                            # This would open the next component in a real implementation
-                                            pass
-                                    else:
-                                        if st.button("Complete Science Module", key="complete_science_module", type="primary"):
-                                            st.balloons()
-                                            st.success("Congratulations! You've completed this science module.")
-                                            # In a real implementation, this would mark the module as completed
+                                sections = view["sections"]
+                                for i, section in enumerate(sections):
+                                    with st.expander(f"{view['section_name']} {i+1}: {section}", expanded=(i==0)):
+                                        st.markdown(module_section_html(section, view['section_name'], module['title'],
+                                                                        view['section_note']),
+                                                    unsafe_allow_html=True)
+                                        
+                                        if section in view.get("section_info", {}):
+                                            st.info(view["section_info"][section])
+                                        
+                                        if i < len(sections) - 1:
+                                            if st.button(f"Continue to {sections[i+1]}", key=f"{view['continue_key']}_{i}"):
+                                                # This would open the next section in a real implementation
+                                                pass
+                                        else:
+                                            if st.button(view["complete_label"], key=view["complete_key"], type="primary"):
+                                                st.balloons()
+                                                st.success(view["complete_message"])
+                                                # In a real implementation, this would mark the module as completed
                 
                 with col2:
                     # Learning style adaptation section
@@ -795,76 +448,7 @@ else:
                     </h2>
                     """, unsafe_allow_html=True)
                     
-                    # Learning style card
-                    learning_style = student_data['learning_style']
-                    learning_style_icon = "👁️" if learning_style == "Visual" else "👂" if learning_style == "Auditory" else "✍️" if learning_style == "Reading/Writing" else "🤸"
-                    learning_style_color = "#4B8BF4" if learning_style == "Visual" else "#34A853" if learning_style == "Auditory" else "#FBBC05" if learning_style == "Reading/Writing" else "#EA4335"
-                    
-                    learning_style_description = ""
-                    learning_style_tips = []
-                    
-                    if learning_style == "Visual":
-                        learning_style_description = "You learn best through visual aids like charts, graphs, and images."
-                        learning_style_tips = [
-                            "Use color-coding in your notes",
-                            "Create mind maps for complex topics",
-                            "Watch video tutorials when available",
-                            "Transform text into diagrams"
-                        ]
-                    elif learning_style == "Auditory":
-                        learning_style_description = "You learn best through listening, discussions, and verbal explanations."
-                        learning_style_tips = [
-                            "Record lessons to listen again later",
-                            "Participate actively in study discussions",
-                            "Explain concepts out loud to yourself",
-                            "Use rhythm or music for memorization"
-                        ]
-                    elif learning_style == "Reading/Writing":
-                        learning_style_description = "You learn best through text-based materials and writing."
-                        learning_style_tips = [
-                            "Take detailed notes in your own words",
-                            "Rewrite key concepts multiple times",
-                            "Create written summaries of lessons",
-                            "Use flashcards for key terms"
-                        ]
-                    else:  # Kinesthetic
-                        learning_style_description = "You learn best through hands-on activities and physical experiences."
-                        learning_style_tips = [
-                            "Use physical movement while studying",
-                            "Create models or demonstrations",
-                            "Take frequent, active breaks",
-                            "Apply concepts to real-world scenarios"
-                        ]
-                    
-                    st.markdown(f"""
-                    <div style="background-color: white; border-left: 4px solid {learning_style_color}; padding: 1.2rem; 
-                        border-radius: 0.5rem; margin-bottom: 1.5rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                        <div style="display: flex; align-items: center; margin-bottom: 0.8rem;">
-                            <div style="background-color: {learning_style_color}; color: white; height: 40px; width: 40px; 
-                                border-radius: 50%; display: flex; align-items: center; justify-content: center; 
-                                margin-right: 0.8rem; font-size: 1.5rem;">{learning_style_icon}</div>
-                            <div>
-                                <div style="font-weight: 600; font-size: 1.2rem; color: #333;">{learning_style} Learner</div>
-                                <div style="color: #666; font-size: 0.9rem;">Your primary learning style</div>
-                            </div>
-                        </div>
-                        <div style="color: #555; margin-bottom: 1rem; font-size: 0.95rem; padding-left: 0.2rem;">
-                            {learning_style_description}
-                        </div>
-                        <div style="background-color: #f8f9fa; padding: 0.8rem; border-radius: 0.4rem;">
-                            <div style="font-weight: 600; margin-bottom: 0.5rem; color: #333;">Study Tips for Your Style:</div>
-                            <ul style="margin: 0; padding-left: 1.5rem; color: #555;">
-                    """, unsafe_allow_html=True)
-                    
-                    # Add tips as list items
-                    for tip in learning_style_tips:
-                        st.markdown(f'<li style="margin-bottom: 0.3rem;">{tip}</li>', unsafe_allow_html=True)
-                    
-                    st.markdown("""
-                            </ul>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+                    st.markdown(learning_style_html(student_data['learning_style']), unsafe_allow_html=True)
                     
                     # Weekly focus section
                     st.markdown("""
@@ -876,39 +460,10 @@ else:
                     </h2>
                     """, unsafe_allow_html=True)
                     
-                    # Generate a weekly plan based on student performance
-                    weak_areas = []
-                    if student_data['performance']['math'] < 70:
-                        weak_areas.append(("Mathematics", "#4285F4"))
-                    if student_data['performance']['science'] < 70:
-                        weak_areas.append(("Science", "#34A853"))
-                    if student_data['performance']['language_arts'] < 70:
-                        weak_areas.append(("Language Arts", "#FBBC05"))
-                    if student_data['performance']['history'] < 70:
-                        weak_areas.append(("History", "#EA4335"))
-                    
+                    # Weekly plan based on student performance
+                    weak_areas = recommendations["weak_areas"]
                     if weak_areas:
-                        # Focus areas this week
-                        st.markdown("""
-                        <div style="background-color: white; padding: 1.2rem; border-radius: 0.5rem; 
-                            margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                            <div style="font-weight: 600; margin-bottom: 0.8rem; color: #333; font-size: 1.05rem;">
-                                Focus areas this week:
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
-                        for area, color in weak_areas:
-                            st.markdown(f"""
-                            <div style="display: flex; justify-content: space-between; align-items: center; 
-                                margin-bottom: 0.8rem; border-left: 3px solid {color}; padding-left: 0.8rem;">
-                                <div style="color: #333; font-weight: 500;">{area}</div>
-                                <div style="color: #666;">3 hours recommended</div>
-                            </div>
-                            """, unsafe_allow_html=True)
-                        
-                        st.markdown("""
-                        </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(weak_areas_html(tuple(weak_areas)), unsafe_allow_html=True)
                         
                         # Download study plan button
                         if st.button("Download Study Plan", type="primary", use_container_width=True):
@@ -950,22 +505,7 @@ else:
                             ]
                             
                             for i, challenge in enumerate(challenges):
-                                subject_color = "#4285F4" if challenge["subject"] == "Math" else "#34A853" if challenge["subject"] == "Science" else "#FBBC05"
-                                
-                                st.markdown(f"""
-                                <div style="background-color: white; border-left: 4px solid {subject_color}; padding: 1rem; 
-                                    border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-                                    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
-                                        <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{challenge["title"]}</div>
-                                        <div style="background-color: {subject_color}; color: white; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem;">
-                                            {challenge["subject"]}
-                                        </div>
-                                    </div>
-                                    <div style="color: #555; margin-bottom: 0.8rem; font-size: 0.95rem;">
-                                        {challenge["description"]}
-                                    </div>
-                                </div>
-                                """, unsafe_allow_html=True)
+                                st.markdown(challenge_card_html(challenge), unsafe_allow_html=True)
                                 
                                 # Accept challenge button
                                 st.button(f"Accept Challenge", key=f"accept_challenge_{i}", type="primary" if i == 0 else "secondary")
@@ -975,6 +515,10 @@ else:
             from pages.assessment import app as assessment_app
             assessment_app()
             
+        elif page == "adaptive_assessment":
+            from pages.adaptive_assessment import app as adaptive_assessment_app
+            adaptive_assessment_app()
+            
         elif page == "AI Essay Grading":
             # Set the page in session state for navigation
             st.session_state.page = "essay_assessment"
@@ -992,7 +536,9 @@ else:
             
             # Overall performance chart
             st.subheader("Performance Overview")
-            data_processor = DataProcessor()
+            from utils.data_processing import get_data_processor
+            from utils.progress_series import progress_chart_data
+            data_processor = get_data_processor()
             performance_data = {
                 'Subject': ['Math', 'Science', 'Language Arts', 'History'],
                 'Score': [
@@ -1005,15 +551,9 @@ else:
             fig = data_processor.create_subject_performance_chart(performance_data)
             st.plotly_chart(fig, use_container_width=True)
             
-            # Progress over time (mock data for demonstration)
+            # Progress over time from the student's recorded assessment results
             st.subheader("Progress Over Time")
-            progress_data = {
-                'Month': ['January', 'February', 'March', 'April', 'May'],
-                'Math': [65, 68, 72, 75, student_data['performance']['math']],
-                'Science': [70, 72, 75, 78, student_data['performance']['science']],
-                'Language Arts': [80, 82, 80, 83, student_data['performance']['language_arts']],
-                'History': [75, 77, 80, 78, student_data['performance']['history']]
-            }
+            progress_data = progress_chart_data(student_data['id'])
             fig = data_processor.create_progress_over_time_chart(progress_data)
             st.plotly_chart(fig, use_container_width=True)
             
@@ -1041,11 +581,19 @@ else:
                         st.warning("**Area for improvement:** Core concept review recommended")
     
     else:  # Teacher view
+        teacher_pages = ["Class Overview", "Student Performance", "Assessment Management"]
+        # The diagnostics page is only offered while metrics are being recorded
+        if metrics_enabled():
+            teacher_pages.append("Diagnostics")
+        elif st.session_state.get("teacher_nav") == "Diagnostics":
+            del st.session_state["teacher_nav"]
         page = st.sidebar.radio(
             "Go to:",
-            ["Class Overview", "Student Performance", "Assessment Management"]
+            teacher_pages,
+            key="teacher_nav"
         )
         
+        nav_page = page
         if page == "Class Overview":
             st.title("Class Overview Dashboard")
             
@@ -1054,22 +602,26 @@ else:
             
             col1, col2, col3, col4 = st.columns(4)
             
-            # Mock class statistics for demo purposes
+            # Class statistics computed in one vectorized pass
+            from utils.class_analytics import get_class_analytics, RISK_BAND_NAMES, SUBJECTS
+            from utils.data_processing import get_data_processor
+            analytics = get_class_analytics()
+            class_stats = analytics.summary()
             with col1:
-                st.metric("Class Average", "78%", "+2%")
+                st.metric("Class Average", f"{class_stats['class_average']:.0f}%")
             with col2:
-                st.metric("Assessments Completed", "42", "+5")
+                st.metric("Assessments Completed", class_stats['completed_assessments'])
             with col3:
-                st.metric("Active Students", "28", "-1")
+                st.metric("Active Students", class_stats['student_count'])
             with col4:
-                st.metric("At-Risk Students", "5", "-2")
+                st.metric("At-Risk Students", class_stats['at_risk_count'])
             
             # Subject performance
             st.subheader("Performance by Subject")
-            data_processor = DataProcessor()
+            data_processor = get_data_processor()
             class_performance = {
                 'Subject': ['Math', 'Science', 'Language Arts', 'History'],
-                'Average Score': [75, 80, 82, 77]
+                'Score': list(class_stats['subject_averages'].values())
             }
             fig = data_processor.create_subject_performance_chart(class_performance)
             st.plotly_chart(fig, use_container_width=True)
@@ -1077,131 +629,186 @@ else:
             # Student list with quick stats
             st.subheader("Student Overview")
             
-            students = get_all_students()
+            # Filters and sorting for the student table
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                band_filter = st.selectbox("Status", ["All"] + RISK_BAND_NAMES, key="overview_band")
+            with col2:
+                subject_labels = ['All Subjects', 'Math', 'Science', 'Language Arts', 'History']
+                subject_filter = st.selectbox("Subject", subject_labels, key="overview_subject")
+            with col3:
+                min_completed = st.number_input("Min. Completed Assessments", min_value=0, value=0, step=1,
+                                                key="overview_min_completed")
+            with col4:
+                sort_labels = {"Score": "score", "Name": "name", "Completed": "completed"}
+                sort_label = st.selectbox("Sort By", list(sort_labels), key="overview_sort")
+                descending = st.toggle("Descending", value=sort_label != "Name", key="overview_descending")
             
-            # Create expandable sections for each student with basic info
-            for student in students:
-                col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
-                
-                with col1:
-                    st.write(f"**{student['first_name']} {student['last_name']}**")
-                with col2:
-                    avg_score = sum([
-                        student['performance']['math'], 
-                        student['performance']['science'],
-                        student['performance']['language_arts'],
-                        student['performance']['history']
-                    ]) / 4
-                    st.write(f"Avg: {avg_score:.1f}%")
-                with col3:
-                    st.write(f"Complete: {student['completed_assessments']}")
-                with col4:
-                    if avg_score < 70:
-                        st.write("⚠️ At Risk")
-                    elif avg_score > 90:
-                        st.write("⭐ Excellent")
-                    else:
-                        st.write("✓ On Track")
-                
-                st.write("---")
+            subject = None if subject_filter == 'All Subjects' else SUBJECTS[subject_labels.index(subject_filter) - 1]
+            band = None if band_filter == "All" else RISK_BAND_NAMES.index(band_filter)
+            page_size = st.session_state.get("overview_page_size", 25)
+            overview_page = st.session_state.get("overview_page", 1)
+            
+            # Only the current page is materialized and sent to the browser
+            page_frame, total_matches = analytics.query(
+                band=band,
+                subject=subject,
+                min_completed=min_completed,
+                sort_by=sort_labels[sort_label],
+                descending=descending,
+                page=overview_page - 1,
+                page_size=page_size
+            )
+            total_pages = max(1, -(-total_matches // page_size))
+            if overview_page > total_pages:
+                # Filters narrowed the results; jump back to the last page
+                overview_page = total_pages
+                st.session_state.overview_page = overview_page
+                page_frame, total_matches = analytics.query(
+                    band=band, subject=subject, min_completed=min_completed, sort_by=sort_labels[sort_label],
+                    descending=descending, page=overview_page - 1, page_size=page_size
+                )
+            
+            st.dataframe(page_frame, hide_index=True, use_container_width=True)
+            
+            col1, col2, col3 = st.columns([2, 1, 1])
+            with col1:
+                first_row = (overview_page - 1) * page_size + 1 if total_matches else 0
+                st.caption(f"Showing {first_row}-{min(overview_page * page_size, total_matches)} of {total_matches} students")
+            with col2:
+                st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="overview_page")
+            with col3:
+                st.selectbox("Rows per page", [25, 50, 100], key="overview_page_size")
         
         elif page == "Student Performance":
             st.title("Student Performance Analytics")
             
-            # Student selector
-            students = get_all_students()
-            student_names = [f"{s['first_name']} {s['last_name']}" for s in students]
-            selected_student = st.selectbox("Select Student", student_names)
-            selected_index = student_names.index(selected_student)
-            student = students[selected_index]
+            # Student selector: a search box over names and IDs, keyed by student ID
+            student_id = student_picker("Select Student", "performance_student")
+            student = get_student_data(student_id) if student_id else None
             
-            col1, col2 = st.columns([1, 2])
+            if student is None:
+                st.info("Search for a student by name or ID to see their performance.")
+            else:
+                col1, col2 = st.columns([1, 2])
             
-            with col1:
-                st.subheader(f"{student['first_name']} {student['last_name']}")
-                st.write(f"**ID:** {student['id']}")
-                st.write(f"**Grade Level:** {student['grade_level']}")
-                st.write(f"**Completed Assessments:** {student['completed_assessments']}")
+                with col1:
+                    st.subheader(f"{student['first_name']} {student['last_name']}")
+                    st.write(f"**ID:** {student['id']}")
+                    st.write(f"**Grade Level:** {student['grade_level']}")
+                    st.write(f"**Completed Assessments:** {student['completed_assessments']}")
                 
-                # Learning style and preferences
-                st.subheader("Learning Profile")
-                st.write(f"**Primary Learning Style:** {student['learning_style']}")
-                st.write("**Subject Engagement:**")
-                for subject, level in student['engagement'].items():
-                    st.write(f"- {subject.capitalize()}: {level}/10")
+                    # Learning style and preferences
+                    st.subheader("Learning Profile")
+                    st.write(f"**Primary Learning Style:** {student['learning_style']}")
+                    st.write("**Subject Engagement:**")
+                    for subject, level in student['engagement'].items():
+                        st.write(f"- {subject.capitalize()}: {level}/10")
             
-            with col2:
-                # Performance chart
-                st.subheader("Subject Performance")
-                performance_data = {
-                    'Subject': ['Math', 'Science', 'Language Arts', 'History'],
-                    'Score': [
-                        student['performance']['math'],
-                        student['performance']['science'],
-                        student['performance']['language_arts'],
-                        student['performance']['history']
-                    ]
-                }
-                data_processor = DataProcessor()
-                fig = data_processor.create_subject_performance_chart(performance_data)
-                st.plotly_chart(fig, use_container_width=True)
+                with col2:
+                    # Performance chart
+                    st.subheader("Subject Performance")
+                    performance_data = {
+                        'Subject': ['Math', 'Science', 'Language Arts', 'History'],
+                        'Score': [
+                            student['performance']['math'],
+                            student['performance']['science'],
+                            student['performance']['language_arts'],
+                            student['performance']['history']
+                        ]
+                    }
+                    from utils.data_processing import get_data_processor
+                    data_processor = get_data_processor()
+                    fig = data_processor.create_subject_performance_chart(performance_data)
+                    st.plotly_chart(fig, use_container_width=True)
             
-            # Detailed assessment history
-            st.subheader("Recent Assessment History")
+                # Detailed assessment history
+                st.subheader("Recent Assessment History")
             
-            # Mock assessment history for demonstration
-            assessment_history = [
-                {"name": "Math Quiz - Algebra", "score": 85, "date": "2023-05-10", "national_avg": 78},
-                {"name": "Science Lab - Chemistry", "score": 78, "date": "2023-05-05", "national_avg": 75},
-                {"name": "Language Arts - Essay", "score": 90, "date": "2023-04-28", "national_avg": 82},
-                {"name": "History - Civil War Test", "score": 82, "date": "2023-04-20", "national_avg": 80}
-            ]
+                # Mock assessment history for demonstration
+                assessment_history = [
+                    {"name": "Math Quiz - Algebra", "score": 85, "date": "2023-05-10", "national_avg": 78},
+                    {"name": "Science Lab - Chemistry", "score": 78, "date": "2023-05-05", "national_avg": 75},
+                    {"name": "Language Arts - Essay", "score": 90, "date": "2023-04-28", "national_avg": 82},
+                    {"name": "History - Civil War Test", "score": 82, "date": "2023-04-20", "national_avg": 80}
+                ]
             
-            for assessment in assessment_history:
-                col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
+                for assessment in assessment_history:
+                    col1, col2, col3, col4 = st.columns([3, 1, 1, 1])
                 
-                with col1:
-                    st.write(f"**{assessment['name']}**")
-                with col2:
-                    st.write(f"Score: {assessment['score']}%")
-                with col3:
-                    st.write(f"Date: {assessment['date']}")
-                with col4:
-                    comparison = assessment['score'] - assessment['national_avg']
-                    if comparison > 0:
-                        st.write(f"📈 +{comparison}% vs avg")
-                    elif comparison < 0:
-                        st.write(f"📉 {comparison}% vs avg")
-                    else:
-                        st.write(f"📊 At average")
+                    with col1:
+                        st.write(f"**{assessment['name']}**")
+                    with col2:
+                        st.write(f"Score: {assessment['score']}%")
+                    with col3:
+                        st.write(f"Date: {assessment['date']}")
+                    with col4:
+                        comparison = assessment['score'] - assessment['national_avg']
+                        if comparison > 0:
+                            st.write(f"📈 +{comparison}% vs avg")
+                        elif comparison < 0:
+                            st.write(f"📉 {comparison}% vs avg")
+                        else:
+                            st.write(f"📊 At average")
                 
-                st.write("---")
+                    st.write("---")
             
-            # AI-generated intervention suggestions
-            st.subheader("Personalized Intervention Suggestions")
+                # Similarity flags recorded when the student's essays were graded
+                st.subheader("Submission Similarity Flags")
+                flagged = [
+                    (submission, submission["result"]["similarity"]["flags"])
+                    for submission in get_student_submissions(student['id'])
+                    if (submission["result"].get("similarity") or {}).get("flags")
+                ]
+                if flagged:
+                    for submission, flags in flagged:
+                        st.warning(f"**{submission['assessment_id']}** (submitted {submission['submitted_at']}, "
+                                   f"score {submission['score']}): " + "; ".join(flags))
+                else:
+                    st.caption("No recent submissions resemble other students' work.")
             
-            # Generate suggestions based on student performance
-            lowest_subject = min(student['performance'].items(), key=lambda x: x[1])
+                # AI-generated intervention suggestions
+                st.subheader("Personalized Intervention Suggestions")
             
-            if lowest_subject[1] < 70:
-                st.warning(f"**Intervention Needed:** {lowest_subject[0].capitalize()} performance is below target.")
-                st.write("**Suggested Actions:**")
-                st.write("1. Schedule one-on-one tutoring session")
-                st.write("2. Provide additional practice materials")
-                st.write("3. Assign peer learning partner")
-                st.write("4. Consider modified assessment approach")
-            elif student['completed_assessments'] < 5:
-                st.info("**Monitoring Suggested:** Student has completed few assessments.")
-                st.write("**Suggested Actions:**")
-                st.write("1. Ensure student is aware of all required assignments")
-                st.write("2. Check for technical difficulties with platform access")
-                st.write("3. Provide assessment calendar and reminders")
-            else:
-                st.success("**On Track:** Student is performing adequately across subjects.")
-                st.write("**Suggested Actions:**")
-                st.write("1. Challenge with advanced material in strong subjects")
-                st.write("2. Encourage peer tutoring opportunities")
-                st.write("3. Consider project-based assessments to boost engagement")
+                # Use the nightly precomputed flag, or work it out now if the student changed since
+                from utils.insight_scheduler import get_fresh_insight, intervention_flag
+                insight = get_fresh_insight(student)
+                if insight:
+                    flag, flag_subject = insight["intervention"], insight["intervention_subject"]
+                else:
+                    flag, flag_subject = intervention_flag(student)
+            
+                if flag == "intervention":
+                    st.warning(f"**Intervention Needed:** {flag_subject.capitalize()} performance is below target.")
+                    st.write("**Suggested Actions:**")
+                    st.write("1. Schedule one-on-one tutoring session")
+                    st.write("2. Provide additional practice materials")
+                    st.write("3. Assign peer learning partner")
+                    st.write("4. Consider modified assessment approach")
+                elif flag == "monitor":
+                    st.info("**Monitoring Suggested:** Student has completed few assessments.")
+                    st.write("**Suggested Actions:**")
+                    st.write("1. Ensure student is aware of all required assignments")
+                    st.write("2. Check for technical difficulties with platform access")
+                    st.write("3. Provide assessment calendar and reminders")
+                else:
+                    st.success("**On Track:** Student is performing adequately across subjects.")
+                    st.write("**Suggested Actions:**")
+                    st.write("1. Challenge with advanced material in strong subjects")
+                    st.write("2. Encourage peer tutoring opportunities")
+                    st.write("3. Consider project-based assessments to boost engagement")
+            
+                # AI-written summary from the nightly job
+                if insight and insight["summary"]:
+                    summary = insight["summary"]
+                    with st.expander("AI Student Summary"):
+                        if summary["strengths"]:
+                            st.write("**Strengths:** " + "; ".join(summary["strengths"]))
+                        if summary["areas_for_improvement"]:
+                            st.write("**Areas for Improvement:** " + "; ".join(summary["areas_for_improvement"]))
+                        for recommendation in summary["recommendations"]:
+                            st.write(f"- {recommendation}")
+                        st.caption(f"Computed {datetime.datetime.fromtimestamp(insight['computed_at']):%Y-%m-%d %H:%M}")
         
         elif page == "Assessment Management":
             st.title("Assessment Management")
@@ -1211,24 +818,41 @@ else:
             with tab1:
                 st.subheader("Active Assessments")
                 
-                assessments = get_available_assessments()
+                assessments = get_assessment_summaries()
+                completion_stats = get_assessment_completion_stats()
+                question_parameters = get_question_parameters()
+                total = len(get_all_students())
                 for assessment in assessments:
                     with st.expander(f"{assessment['title']} - {assessment['subject']}"):
                         st.write(f"**Due Date:** {assessment['due_date']}")
                         st.write(f"**Description:** {assessment['description']}")
                         st.write(f"**Type:** {assessment['type']}")
                         
-                        # Mock completion statistics
+                        # Completion statistics from recorded submissions
                         st.write("**Completion Statistics:**")
-                        completed = assessment.get('completed', 18)
-                        total = 28  # Total students
-                        st.progress(completed/total)
+                        stats = completion_stats.get(assessment['id'], {})
+                        completed = stats.get('completed', 0)
+                        st.progress(min(1.0, completed/total) if total else 0.0)
                         st.write(f"{completed}/{total} students completed")
                         
                         # Average score if any completions
-                        if completed > 0:
-                            avg_score = assessment.get('avg_score', 76)
-                            st.write(f"**Average Score:** {avg_score}%")
+                        if completed > 0 and stats.get('avg_score') is not None:
+                            st.write(f"**Average Score:** {stats['avg_score']:.0f}%")
+                        
+                        # Question parameters from the latest calibration run
+                        calibrated = question_parameters.get(assessment['id'])
+                        if calibrated:
+                            st.write("**Question Calibration:**")
+                            st.dataframe([
+                                {
+                                    "Question": index + 1,
+                                    "Difficulty": round(parameters['difficulty'], 2),
+                                    "Discrimination": round(parameters['discrimination'], 2),
+                                    "Responses": parameters['responses'],
+                                    "Correct": f"{parameters['p_correct']:.0%}"
+                                }
+                                for index, parameters in sorted(calibrated.items())
+                            ], hide_index=True)
                         
                         col1, col2 = st.columns(2)
                         with col1:
@@ -1249,56 +873,87 @@ else:
                 st.subheader("Assessment Content")
                 description = st.text_area("Assessment Description")
                 
+                # Type-specific content saved alongside the assessment
+                details = {}
+                
                 # Different input methods based on assessment type
                 if assessment_type in ["Quiz", "Test"]:
                     st.write("**Add Questions:**")
                     
                     with st.expander("Question 1"):
-                        st.text_area("Question Text", key="q1_text")
+                        q1_text = st.text_area("Question Text", key="q1_text")
                         q1_type = st.selectbox("Question Type", ["Multiple Choice", "True/False", "Short Answer"], key="q1_type")
                         
                         if q1_type == "Multiple Choice":
-                            st.text_input("Option A", key="q1_a")
-                            st.text_input("Option B", key="q1_b")
-                            st.text_input("Option C", key="q1_c")
-                            st.text_input("Option D", key="q1_d")
-                            st.selectbox("Correct Answer", ["A", "B", "C", "D"], key="q1_correct")
+                            q1_options = [
+                                st.text_input("Option A", key="q1_a"),
+                                st.text_input("Option B", key="q1_b"),
+                                st.text_input("Option C", key="q1_c"),
+                                st.text_input("Option D", key="q1_d")
+                            ]
+                            q1_correct = st.selectbox("Correct Answer", ["A", "B", "C", "D"], key="q1_correct")
+                            question = {"id": "q1", "type": "multiple_choice", "text": q1_text,
+                                        "options": q1_options, "correct_answer": q1_options["ABCD".index(q1_correct)]}
+                        elif q1_type == "True/False":
+                            q1_correct = st.selectbox("Correct Answer", ["True", "False"], key="q1_correct_tf")
+                            question = {"id": "q1", "type": "true_false", "text": q1_text, "correct_answer": q1_correct}
+                        else:
+                            q1_sample = st.text_area("Sample Answer", key="q1_sample")
+                            question = {"id": "q1", "type": "short_answer", "text": q1_text, "sample_answer": q1_sample}
+                    
+                    if q1_text:
+                        details["questions"] = [question]
                     
                     st.button("+ Add Another Question")
                 
                 elif assessment_type == "Essay":
-                    st.text_area("Essay Prompt")
-                    st.number_input("Word Count Minimum", min_value=100, max_value=5000, value=500)
-                    st.number_input("Word Count Maximum", min_value=100, max_value=5000, value=1000)
+                    details["prompt"] = st.text_area("Essay Prompt")
+                    details["word_count_min"] = st.number_input("Word Count Minimum", min_value=100, max_value=5000, value=500)
+                    details["word_count_max"] = st.number_input("Word Count Maximum", min_value=100, max_value=5000, value=1000)
                     
                     st.write("**Rubric Criteria:**")
-                    st.text_input("Criteria 1 (e.g., Thesis Statement)")
-                    st.text_input("Criteria 2 (e.g., Evidence Quality)")
-                    st.text_input("Criteria 3 (e.g., Organization)")
+                    rubric = [
+                        st.text_input("Criteria 1 (e.g., Thesis Statement)"),
+                        st.text_input("Criteria 2 (e.g., Evidence Quality)"),
+                        st.text_input("Criteria 3 (e.g., Organization)")
+                    ]
+                    details["criteria"] = "\n".join(criterion for criterion in rubric if criterion)
                     st.button("+ Add Rubric Criteria")
                 
                 elif assessment_type in ["Project", "Lab"]:
-                    st.text_area("Project/Lab Instructions")
-                    st.text_area("Deliverables")
-                    st.text_area("Evaluation Criteria")
+                    details["instructions"] = st.text_area("Project/Lab Instructions")
+                    details["deliverables"] = st.text_area("Deliverables")
+                    details["criteria"] = st.text_area("Evaluation Criteria")
                     
-                    st.checkbox("Allow File Uploads")
-                    st.checkbox("Allow Team Submissions")
+                    details["allow_file_uploads"] = st.checkbox("Allow File Uploads")
+                    details["allow_team_submissions"] = st.checkbox("Allow Team Submissions")
                 
                 # AI grading options
                 st.subheader("AI Assessment Settings")
-                st.checkbox("Enable AI Grading", value=True)
-                st.checkbox("Generate Personalized Feedback", value=True)
-                st.checkbox("Provide Improvement Suggestions", value=True)
+                details["ai_grading"] = st.checkbox("Enable AI Grading", value=True)
+                details["personalized_feedback"] = st.checkbox("Generate Personalized Feedback", value=True)
+                details["improvement_suggestions"] = st.checkbox("Provide Improvement Suggestions", value=True)
                 
                 # Save the new assessment
                 if st.button("Create Assessment"):
                     if assessment_title and description:
+                        create_assessment({
+                            "title": assessment_title,
+                            "subject": subject,
+                            "type": assessment_type,
+                            "description": description,
+                            "due_date": due_date.isoformat(),
+                            "estimated_time": estimated_time,
+                            **details
+                        })
                         st.success(f"Assessment '{assessment_title}' created successfully!")
-                        # In a complete implementation, this would save to a database
                     else:
                         st.error("Please fill in all required fields.")
 
+        elif page == "Diagnostics":
+            from pages.diagnostics import app as diagnostics_app
+            diagnostics_app()
+
 # Main content area when not authenticated
 if not st.session_state.authenticated:
     st.title("EduTutor AI - Personalized Learning and Assessment System")
@@ -1337,3 +992,16 @@ if not st.session_state.authenticated:
     3. **Teachers** gain insights into student performance with reduced grading workload
     4. **Everyone** benefits from a more efficient, effective learning environment
     """)
+
+# Save the user's state so the next request can be served by any worker
+persist_session_state()
+
+observe_since(f"render.{nav_page}", render_started)
+export_metrics()
+
+# The page has been sent to the browser; load the deferred modules for the next one
+preload_deferred_modules()
+
+# Precompute student insights off-peak in a background thread (started once per process)
+from utils.insight_scheduler import start_insight_scheduler
+start_insight_scheduler()
@@ -0,0 +1,334 @@
+"""
+Headless benchmark of the EduTutor app's page reruns.
+
+Drives app.py with streamlit.testing.v1.AppTest through the student flow
+(login, Dashboard, Learning Path, My Progress, essay submission) and the
+teacher flow (login, Class Overview, Student Performance, Assessment
+Management) with the stub LLM behind AIAssessmentEngine. Each roster size
+runs in its own process on a fresh database filled by
+utils.roster_generator, so rerun latencies and peak memory are measured
+from a cold process and sizes do not share caches.
+
+Every page is opened once and then rerun --runs times; the report gives
+the first render and the p50/p95/max rerun latency per page, and the peak
+RSS per roster size. With --baseline, the run fails if a page's p50
+rerun latency or the peak memory regressed beyond the tolerance; p95 over
+a handful of reruns is reported but too noisy to gate on.
+
+With --rounds, each size is measured in that many fresh processes and
+every figure is the median across them (the p50 is a median of medians).
+Baselines are recorded over BASELINE_ROUNDS rounds by default, so one
+slow run on a busy host cannot set a bar the unchanged tree then misses.
+
+Usage:
+    python -m benchmarks.app_bench --students 100 1000 10000
+    python -m benchmarks.app_bench --baseline benchmarks/baseline.json
+    python -m benchmarks.app_bench --students 100 --baseline benchmarks/baseline.json --update-baseline
+"""
+import os
+import sys
+import json
+import time
+import resource
+import statistics
+import argparse
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(ROOT, "app.py")
+
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_RUNS = 5
+DEFAULT_ROUNDS = 1
+BASELINE_ROUNDS = 5
+# A page regresses when it is this much slower than the baseline and by more than the slack
+DEFAULT_TOLERANCE = 1.5
+DEFAULT_SLACK_MS = 25
+MEMORY_TOLERANCE = 1.3
+SCRIPT_TIMEOUT = 300
+
+ESSAY_SENTENCES = [
+    "Artificial intelligence is changing how students learn and how teachers teach.",
+    "Adaptive tutoring systems adjust the pace of a lesson to each learner.",
+    "However, schools must weigh the benefits against concerns about privacy and fairness.",
+    "For example, automated feedback lets students revise an essay several times before a deadline.",
+    "Therefore, teachers can spend more of their time on discussion and mentoring.",
+    "Critics argue that reliance on algorithms may narrow what counts as good writing.",
+]
+
+def synthetic_essay(words=550):
+    """An essay of about the given length built from stock sentences."""
+    sentences = []
+    while sum(len(sentence.split()) for sentence in sentences) < words:
+        sentences.append(ESSAY_SENTENCES[len(sentences) % len(ESSAY_SENTENCES)])
+    return " ".join(sentences)
+
+def percentile(values, q):
+    """The q-th percentile (0-100) of a list of numbers, by nearest rank."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))]
+
+class FlowRunner:
+    """Runs one AppTest session and times each page."""
+
+    def __init__(self, runs):
+        """
+        Start a session on the login screen.
+
+        Args:
+            runs: Reruns timed per page after it is opened
+        """
+        from streamlit.testing.v1 import AppTest
+
+        self.runs = runs
+        self.pages = {}
+        self.app = AppTest.from_file(APP_SCRIPT, default_timeout=SCRIPT_TIMEOUT)
+        self._run()
+
+    def _run(self):
+        """Run the script once and return its duration in milliseconds."""
+        started = time.perf_counter()
+        self.app.run()
+        elapsed = (time.perf_counter() - started) * 1000
+        if self.app.exception:
+            raise RuntimeError(f"app.py raised: {self.app.exception[0].message}")
+        return elapsed
+
+    def step(self, name, action):
+        """
+        Perform an interaction, then time the page it leads to.
+
+        Args:
+            name: Page name in the report
+            action: Callable taking the AppTest that sets widget values
+        """
+        action(self.app)
+        first = self._run()
+        # A button press or st.rerun() is followed by the run that draws the page
+        reruns = [self._run() for _ in range(self.runs)]
+        self.pages[name] = {
+            "first_ms": round(first, 1),
+            "p50_ms": round(percentile(reruns, 50), 1),
+            "p95_ms": round(percentile(reruns, 95), 1),
+            "max_ms": round(max(reruns), 1)
+        }
+
+    def navigate(self, page):
+        """Select a page in the sidebar radio."""
+        self.step(page, lambda app: app.sidebar.radio[0].set_value(page))
+
+def student_flow(runs, student_id):
+    """Student login, Dashboard, Learning Path, My Progress and an essay submission."""
+    flow = FlowRunner(runs)
+
+    def login(app):
+        app.selectbox(key="login_student").set_value(student_id)
+        app.text_input(key="login_password").set_value("password")
+        app.button(key="login_button").click()
+
+    flow.step("Student Login", login)
+    for page in ["Dashboard", "Learning Path", "My Progress"]:
+        flow.navigate(page)
+    flow.navigate("AI Essay Grading")
+
+    def submit_essay(app):
+        app.text_area(key="ai_essay_input").set_value(synthetic_essay())
+        next(button for button in app.button if button.label == "Submit Essay for AI Evaluation").click()
+
+    flow.step("Essay Submission", submit_essay)
+    return flow.pages
+
+def teacher_flow(runs):
+    """Teacher login, Class Overview, Student Performance and Assessment Management."""
+    flow = FlowRunner(runs)
+
+    def login(app):
+        app.selectbox(key="login_user_type").set_value("Teacher")
+
+    flow.step("Teacher Login Form", login)
+
+    def submit(app):
+        app.text_input(key="login_teacher_id").set_value("T1001")
+        app.text_input(key="login_teacher_password").set_value("teacher")
+        app.button(key="login_button").click()
+
+    flow.step("Teacher Login", submit)
+    for page in ["Class Overview", "Student Performance", "Assessment Management"]:
+        flow.navigate(page)
+    return flow.pages
+
+def run_size(students, runs, seed=0):
+    """
+    Benchmark one roster size in this process.
+
+    Args:
+        students: Number of synthetic students
+        runs: Reruns timed per page
+        seed: Roster seed
+
+    Returns:
+        Dict with students, seconds to seed the roster, pages and peak_rss_mb
+    """
+    from utils.roster_generator import load_roster, student_ids
+
+    started = time.perf_counter()
+    load_roster(students, seed)
+    seed_seconds = time.perf_counter() - started
+
+    pages = student_flow(runs, student_ids(0, 1)[0])
+    pages.update(teacher_flow(runs))
+    return {
+        "students": students,
+        "seed_seconds": round(seed_seconds, 2),
+        "pages": pages,
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+def run_in_subprocess(students, runs, seed=0):
+    """
+    Benchmark one roster size in a fresh process with its own database.
+
+    Args:
+        students: Number of synthetic students
+        runs: Reruns timed per page
+        seed: Roster seed
+
+    Returns:
+        Dict from run_size()
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            EDUTUTOR_DB_PATH=os.path.join(directory, "bench.db"),
+            EDUTUTOR_LLM_BACKEND="stub",
+            EDUTUTOR_LLM_CACHE_PATH="",
+            # Keep the nightly insight job from competing with the timed reruns
+            EDUTUTOR_INSIGHTS_SCHEDULER="0",
+            EDUTUTOR_STATE_DIR=os.path.join(directory, "sessions")
+        )
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.app_bench", "--worker", str(students), "--runs", str(runs),
+             "--seed", str(seed)],
+            cwd=ROOT, env=env, capture_output=True, text=True
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Benchmark of {students} students failed:\n{completed.stderr[-4000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def median_of_rounds(rounds):
+    """
+    Combine the results of several rounds of one roster size.
+
+    Args:
+        rounds: List of run_size() results
+
+    Returns:
+        Dict in the run_size() format holding the median of every figure
+    """
+    def median(values):
+        return round(statistics.median(values), 2)
+
+    pages = {}
+    for page in rounds[0]["pages"]:
+        timings = [result["pages"][page] for result in rounds if page in result["pages"]]
+        pages[page] = {key: median([timing[key] for timing in timings]) for key in timings[0]}
+    return {
+        "students": rounds[0]["students"],
+        "seed_seconds": median([result["seed_seconds"] for result in rounds]),
+        "pages": pages,
+        "peak_rss_mb": median([result["peak_rss_mb"] for result in rounds]),
+        "rounds": len(rounds)
+    }
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, slack_ms=DEFAULT_SLACK_MS):
+    """
+    Find regressions against a baseline.
+
+    Args:
+        results: Dict of {roster size: run_size() result}
+        baseline: Dict in the same format
+        tolerance: Allowed slowdown ratio
+        slack_ms: Slowdowns smaller than this are never regressions
+
+    Returns:
+        List of human-readable regression messages
+    """
+    regressions = []
+    for size, result in results.items():
+        expected = baseline.get(str(size))
+        if not expected:
+            continue
+        for page, timings in result["pages"].items():
+            reference = expected["pages"].get(page)
+            if not reference:
+                continue
+            if timings["p50_ms"] > reference["p50_ms"] * tolerance and timings["p50_ms"] - reference["p50_ms"] > slack_ms:
+                regressions.append(f"{size} students, {page}: p50 {timings['p50_ms']} ms "
+                                   f"(baseline {reference['p50_ms']} ms)")
+        if result["peak_rss_mb"] > expected["peak_rss_mb"] * MEMORY_TOLERANCE:
+            regressions.append(f"{size} students: peak RSS {result['peak_rss_mb']} MB "
+                               f"(baseline {expected['peak_rss_mb']} MB)")
+    return regressions
+
+def format_report(results):
+    """Render the results as a plain-text table."""
+    lines = []
+    for size, result in results.items():
+        lines.append(f"{size} students (roster seeded in {result['seed_seconds']} s, "
+                     f"peak RSS {result['peak_rss_mb']} MB)")
+        lines.append(f"  {'page':<24}{'first':>10}{'p50':>10}{'p95':>10}{'max':>10}")
+        for page, timings in result["pages"].items():
+            lines.append(f"  {page:<24}{timings['first_ms']:>10}{timings['p50_ms']:>10}"
+                         f"{timings['p95_ms']:>10}{timings['max_ms']:>10}")
+    return "\n".join(lines)
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark EduTutor page reruns with AppTest and a stub LLM.")
+    parser.add_argument("--students", type=int, nargs="+", default=DEFAULT_SIZES, help="Roster sizes to run")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS, help="Reruns timed per page")
+    parser.add_argument("--rounds", type=int,
+                        help=f"Fresh processes per size, combined by median (default {DEFAULT_ROUNDS}, "
+                             f"or {BASELINE_ROUNDS} with --update-baseline)")
+    parser.add_argument("--seed", type=int, default=0, help="Roster seed")
+    parser.add_argument("--baseline", help="Baseline JSON file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Allowed slowdown ratio")
+    parser.add_argument("--slack-ms", type=float, default=DEFAULT_SLACK_MS, help="Slowdowns always allowed")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_size(args.worker, args.runs, args.seed)))
+        return 0
+
+    rounds = args.rounds or (BASELINE_ROUNDS if args.update_baseline else DEFAULT_ROUNDS)
+    results = {
+        size: median_of_rounds([run_in_subprocess(size, args.runs, args.seed) for _ in range(rounds)])
+        for size in args.students
+    }
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+    if args.baseline and args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update({str(size): result for size, result in results.items()})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        return 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.slack_ms)
+        for message in regressions:
+            print(f"REGRESSION: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import time
+from data.database import get_connection
+
+IN_PROGRESS = "in_progress"
+SUBMITTED = "submitted"
+
+OPEN_ATTEMPT_QUERY = """
+    SELECT id FROM attempts
+    WHERE student_id = ? AND assessment_id = ? AND status = 'in_progress'
+    ORDER BY id DESC LIMIT 1
+"""
+ATTEMPT_ANSWERS_QUERY = "SELECT question, answer FROM attempt_answers WHERE attempt_id = ?"
+INSERT_ATTEMPT = """
+    INSERT INTO attempts (assessment_id, student_id, status, started_at, updated_at)
+    VALUES (?, ?, 'in_progress', ?, ?)
+"""
+UPSERT_ANSWER = """
+    INSERT INTO attempt_answers (attempt_id, question, answer) VALUES (?, ?, ?)
+    ON CONFLICT (attempt_id, question) DO UPDATE SET answer = excluded.answer
+"""
+TOUCH_ATTEMPT = "UPDATE attempts SET updated_at = ? WHERE id = ?"
+CLOSE_ATTEMPT = "UPDATE attempts SET status = ?, updated_at = ?, submission_id = ? WHERE id = ?"
+
+def find_open_attempt(assessment_id, student_id):
+    """
+    Find a student's unfinished attempt at an assessment.
+
+    Args:
+        assessment_id: The ID of the assessment
+        student_id: The ID of the student
+
+    Returns:
+        Tuple of (attempt ID, {question index: answer}) or None
+    """
+    conn = get_connection()
+    row = conn.execute(OPEN_ATTEMPT_QUERY, (student_id, assessment_id)).fetchone()
+    if row is None:
+        return None
+    answers = {answer_row["question"]: answer_row["answer"]
+               for answer_row in conn.execute(ATTEMPT_ANSWERS_QUERY, (row["id"],))}
+    return row["id"], answers
+
+def start_attempt(assessment_id, student_id):
+    """
+    Start a new attempt.
+
+    Args:
+        assessment_id: The ID of the assessment
+        student_id: The ID of the student
+
+    Returns:
+        The ID of the new attempt
+    """
+    now = time.time()
+    conn = get_connection()
+    with conn:
+        cursor = conn.execute(INSERT_ATTEMPT, (assessment_id, student_id, now, now))
+    return cursor.lastrowid
+
+def save_answers(attempt_id, changes):
+    """
+    Store the answers that changed since the last save.
+
+    Args:
+        attempt_id: The ID of the attempt
+        changes: Dict of {question index: answer}
+    """
+    if not changes:
+        return
+    conn = get_connection()
+    with conn:
+        conn.executemany(UPSERT_ANSWER, [(attempt_id, question, answer) for question, answer in changes.items()])
+        conn.execute(TOUCH_ATTEMPT, (time.time(), attempt_id))
+
+def close_attempt(attempt_id, status=SUBMITTED, submission_id=None):
+    """
+    Mark an attempt as finished.
+
+    Args:
+        attempt_id: The ID of the attempt
+        status: Final status (defaults to "submitted")
+        submission_id: Optional ID of the submission the attempt produced
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(CLOSE_ATTEMPT, (status, time.time(), submission_id, attempt_id))
@@ -0,0 +1,95 @@
+import time
+from data.database import get_connection
+
+PASSWORD_HASH_QUERY = "SELECT password_hash FROM credentials WHERE user_type = ? AND user_id = ?"
+UPSERT_CREDENTIALS = """
+    INSERT INTO credentials (user_type, user_id, password_hash, updated_at) VALUES (?, ?, ?, ?)
+    ON CONFLICT (user_type, user_id) DO UPDATE SET password_hash = excluded.password_hash,
+        updated_at = excluded.updated_at
+"""
+COUNT_USERS_QUERY = "SELECT COUNT(*) FROM credentials WHERE user_type = ?"
+REVOKE_TOKEN = "INSERT OR IGNORE INTO revoked_tokens (token_id, expires_at) VALUES (?, ?)"
+REVOKED_QUERY = "SELECT 1 FROM revoked_tokens WHERE token_id = ?"
+PURGE_REVOKED = "DELETE FROM revoked_tokens WHERE expires_at <= ?"
+INSERT_SECRET = "INSERT OR IGNORE INTO app_secrets (name, value) VALUES (?, ?)"
+SECRET_QUERY = "SELECT value FROM app_secrets WHERE name = ?"
+
+def get_password_hash(user_type, user_id):
+    """
+    Get a user's stored password hash.
+
+    Args:
+        user_type: "student" or "teacher"
+        user_id: The user's ID
+
+    Returns:
+        The encoded hash, or None if the user has no credentials
+    """
+    row = get_connection().execute(PASSWORD_HASH_QUERY, (user_type, user_id)).fetchone()
+    return row["password_hash"] if row else None
+
+def set_password_hash(user_type, user_id, password_hash):
+    """
+    Store a user's password hash.
+
+    Args:
+        user_type: "student" or "teacher"
+        user_id: The user's ID
+        password_hash: Encoded hash from utils.auth.hash_password()
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(UPSERT_CREDENTIALS, (user_type, user_id, password_hash, time.time()))
+
+def count_users(user_type):
+    """
+    Count the users of a type that have credentials.
+
+    Args:
+        user_type: "student" or "teacher"
+
+    Returns:
+        int: Number of users
+    """
+    return get_connection().execute(COUNT_USERS_QUERY, (user_type,)).fetchone()[0]
+
+def revoke_token(token_id, expires_at):
+    """
+    Revoke a session token for every worker until it would have expired.
+
+    Args:
+        token_id: The token's unique ID
+        expires_at: Unix time at which the token expires anyway
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(REVOKE_TOKEN, (token_id, expires_at))
+        conn.execute(PURGE_REVOKED, (time.time(),))
+
+def is_token_revoked(token_id):
+    """
+    Check whether a session token has been revoked.
+
+    Args:
+        token_id: The token's unique ID
+
+    Returns:
+        True if the token was revoked
+    """
+    return get_connection().execute(REVOKED_QUERY, (token_id,)).fetchone() is not None
+
+def get_or_create_secret(name, generate):
+    """
+    Get a secret shared by every worker, creating it on first use.
+
+    Args:
+        name: Name of the secret
+        generate: Callable returning a new secret value
+
+    Returns:
+        str: The stored value; concurrent first calls all get the same one
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(INSERT_SECRET, (name, generate()))
+    return conn.execute(SECRET_QUERY, (name,)).fetchone()["value"]
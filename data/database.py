@@ -0,0 +1,343 @@
+import os
+import sqlite3
+import threading
+
+# Location of the local database file; override with EDUTUTOR_DB_PATH
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "edututor.db")
+
+SUBJECTS = ["math", "science", "language_arts", "history"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    id TEXT PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    grade_level INTEGER,
+    learning_style TEXT,
+    completed_assessments INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_students_name ON students (last_name, first_name);
+
+CREATE TABLE IF NOT EXISTS performance (
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    subject TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (student_id, subject)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_performance_subject ON performance (subject, score);
+
+CREATE TABLE IF NOT EXISTS engagement (
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    subject TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    PRIMARY KEY (student_id, subject)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS assessments (
+    id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    type TEXT NOT NULL,
+    description TEXT,
+    due_date TEXT,
+    estimated_time INTEGER,
+    details TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_due ON assessments (due_date);
+CREATE INDEX IF NOT EXISTS idx_assessments_subject ON assessments (subject);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    assessment_id TEXT NOT NULL REFERENCES assessments (id) ON DELETE CASCADE,
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    submitted_at TEXT NOT NULL DEFAULT (datetime('now')),
+    score REAL,
+    content TEXT,
+    result TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_assessment ON submissions (assessment_id, student_id);
+CREATE INDEX IF NOT EXISTS idx_submissions_student ON submissions (student_id, submitted_at);
+
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    assessment_id TEXT NOT NULL REFERENCES assessments (id) ON DELETE CASCADE,
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    status TEXT NOT NULL DEFAULT 'in_progress',
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    submission_id INTEGER REFERENCES submissions (id) ON DELETE SET NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_student ON attempts (student_id, assessment_id, status);
+
+CREATE TABLE IF NOT EXISTS attempt_answers (
+    attempt_id INTEGER NOT NULL REFERENCES attempts (id) ON DELETE CASCADE,
+    question INTEGER NOT NULL,
+    answer TEXT,
+    PRIMARY KEY (attempt_id, question)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS progress_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    subject TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    score REAL NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_progress_events_student ON progress_events (student_id, id);
+
+CREATE TABLE IF NOT EXISTS modules (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    icon TEXT,
+    level TEXT NOT NULL,
+    difficulty INTEGER NOT NULL,
+    time TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    prerequisite_ids TEXT NOT NULL DEFAULT '[]',
+    learning_styles TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_modules_subject ON modules (subject, level, difficulty);
+
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    subject TEXT NOT NULL,
+    type TEXT NOT NULL,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL DEFAULT '[]',
+    correct_answer TEXT NOT NULL,
+    discrimination REAL NOT NULL DEFAULT 1.0,
+    difficulty REAL NOT NULL DEFAULT 0.0,
+    guessing REAL NOT NULL DEFAULT 0.0,
+    calibrated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_items_subject ON items (subject);
+
+CREATE TABLE IF NOT EXISTS item_responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_id TEXT NOT NULL REFERENCES items (id) ON DELETE CASCADE,
+    student_id TEXT NOT NULL REFERENCES students (id) ON DELETE CASCADE,
+    correct INTEGER NOT NULL,
+    theta REAL,
+    answered_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_item_responses_item ON item_responses (item_id);
+
+CREATE TABLE IF NOT EXISTS calibration_runs (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    items INTEGER NOT NULL,
+    responses INTEGER NOT NULL,
+    seconds REAL
+);
+
+CREATE TABLE IF NOT EXISTS item_parameters (
+    version INTEGER NOT NULL REFERENCES calibration_runs (version) ON DELETE CASCADE,
+    item_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    discrimination REAL NOT NULL,
+    difficulty REAL NOT NULL,
+    guessing REAL NOT NULL,
+    responses INTEGER NOT NULL,
+    p_correct REAL,
+    PRIMARY KEY (version, item_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS user_sessions (
+    id TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_expiry ON user_sessions (expires_at);
+
+CREATE TABLE IF NOT EXISTS credentials (
+    user_type TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_type, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    token_id TEXT PRIMARY KEY,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS app_secrets (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS insight_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    heartbeat_at REAL,
+    owner TEXT,
+    cursor TEXT NOT NULL DEFAULT '',
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_insight_jobs_status ON insight_jobs (status, id);
+
+CREATE TABLE IF NOT EXISTS student_insights (
+    student_id TEXT PRIMARY KEY REFERENCES students (id) ON DELETE CASCADE,
+    job_id INTEGER,
+    version INTEGER NOT NULL,
+    inputs TEXT NOT NULL,
+    computed_at REAL NOT NULL,
+    intervention TEXT NOT NULL,
+    intervention_subject TEXT,
+    recommendations TEXT NOT NULL,
+    summary TEXT
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS essay_index (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT,
+    context TEXT NOT NULL,
+    embedder TEXT NOT NULL,
+    minhash BLOB NOT NULL,
+    embedding BLOB NOT NULL,
+    result TEXT,
+    created_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+BUMP_DATA_VERSION = """
+    INSERT INTO data_versions (name, version) VALUES (?, 1)
+    ON CONFLICT (name) DO UPDATE SET version = version + 1
+"""
+DATA_VERSION_QUERY = "SELECT version FROM data_versions WHERE name = ?"
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+_initialized_paths = set()
+
+def get_db_path():
+    """
+    Get the path of the SQLite database file.
+
+    Returns:
+        Absolute path from EDUTUTOR_DB_PATH, or the default under data/
+    """
+    return os.environ.get("EDUTUTOR_DB_PATH", DEFAULT_DB_PATH)
+
+def _connect(path):
+    """Open and configure a new connection to the database at path."""
+    conn = sqlite3.connect(path, timeout=30, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    # WAL lets page renders read while a writer is active in another worker
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+def init_db(conn, path):
+    """
+    Create the schema once per process for the given database.
+
+    Args:
+        conn: An open connection to the database
+        path: Path of the database file the connection points to
+    """
+    if path in _initialized_paths:
+        return
+    with _schema_lock:
+        if path not in _initialized_paths:
+            conn.executescript(SCHEMA)
+            _initialized_paths.add(path)
+
+def get_connection():
+    """
+    Get the connection owned by the current worker thread.
+
+    Each Streamlit script thread keeps one long-lived connection, so the
+    sqlite3 statement cache acts as a pool of prepared queries.
+
+    Returns:
+        sqlite3.Connection with rows returned as sqlite3.Row
+    """
+    path = get_db_path()
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != path:
+        if conn is not None:
+            conn.close()
+        conn = _connect(path)
+        _local.conn = conn
+        _local.path = path
+        _local.versions = {}
+        _local.data_version = None
+    init_db(conn, path)
+    return conn
+
+def close_connection():
+    """Close the current thread's connection if one is open."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+        _local.path = None
+
+def is_empty(conn, table):
+    """
+    Check whether a table has no rows.
+
+    Args:
+        conn: An open connection
+        table: Name of one of the schema tables
+
+    Returns:
+        True if the table is empty
+    """
+    return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is None
+
+def bump_data_version(conn, name):
+    """
+    Mark a dataset as changed, inside the writer's transaction.
+
+    Args:
+        conn: The connection making the change
+        name: Dataset name (e.g. "students")
+    """
+    conn.execute(BUMP_DATA_VERSION, (name,))
+    # This connection's own commits do not change PRAGMA data_version
+    getattr(_local, "versions", {}).pop(name, None)
+
+def get_data_version(name):
+    """
+    Get a dataset's version, shared by every process using the database.
+
+    Process-wide caches compare it on read to notice writes made by other
+    workers or by command-line loaders. The version row is only re-read
+    after some other connection has committed, so the usual cost is one
+    PRAGMA data_version.
+
+    Args:
+        name: Dataset name (e.g. "students")
+
+    Returns:
+        int: The version, or 0 if the dataset was never written
+    """
+    conn = get_connection()
+    data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    if getattr(_local, "data_version", None) != data_version:
+        _local.data_version = data_version
+        _local.versions = {}
+    versions = _local.versions
+    if name not in versions:
+        row = conn.execute(DATA_VERSION_QUERY, (name,)).fetchone()
+        versions[name] = row[0] if row else 0
+    return versions[name]
@@ -0,0 +1,361 @@
+import json
+import time
+import random
+from data.database import get_connection, is_empty, bump_data_version, get_data_version
+
+# Hand-written items: (text, options, correct answer, difficulty, discrimination).
+# Difficulty is on the ability scale (0 = an average student); the values
+# are initial estimates until the items are calibrated against responses.
+_WRITTEN_ITEMS = {
+    "science": [
+        ("Which organelle is known as the powerhouse of the cell?", ["Nucleus", "Mitochondria", "Ribosome", "Golgi apparatus"], "Mitochondria", -1.8, 1.2),
+        ("Water boils at 100°C at sea level.", ["True", "False"], "True", -2.2, 0.9),
+        ("What gas do plants absorb for photosynthesis?", ["Oxygen", "Nitrogen", "Carbon dioxide", "Hydrogen"], "Carbon dioxide", -1.4, 1.3),
+        ("What is the pH of a neutral solution at 25°C?", ["0", "7", "10", "14"], "7", -0.9, 1.1),
+        ("What is the chemical symbol for sodium?", ["S", "So", "Na", "Sd"], "Na", -0.6, 1.2),
+        ("Sound travels faster in a vacuum than in air.", ["True", "False"], "False", -0.5, 1.0),
+        ("Which of Newton's laws is written as F = ma?", ["First law", "Second law", "Third law", "Law of gravitation"], "Second law", -0.3, 1.4),
+        ("Which particle has no electric charge?", ["Proton", "Electron", "Neutron", "Ion"], "Neutron", -0.2, 1.2),
+        ("Which base pairs with adenine in DNA?", ["Cytosine", "Guanine", "Thymine", "Uracil"], "Thymine", 0.0, 1.3),
+        ("What is the SI unit of electrical resistance?", ["Volt", "Ampere", "Ohm", "Watt"], "Ohm", 0.3, 1.1),
+        ("A 2 kg object accelerates at 3 m/s². What net force acts on it?", ["1.5 N", "5 N", "6 N", "9 N"], "6 N", 0.5, 1.5),
+        ("During which phase of mitosis do sister chromatids separate?", ["Prophase", "Metaphase", "Anaphase", "Telophase"], "Anaphase", 0.7, 1.3),
+        ("What is the approximate speed of light in a vacuum?", ["3 × 10⁵ m/s", "3 × 10⁸ m/s", "3 × 10¹⁰ m/s", "340 m/s"], "3 × 10⁸ m/s", 1.0, 1.0),
+        ("How many moles are in 36 g of water (H₂O)?", ["0.5", "1", "2", "18"], "2", 1.2, 1.4),
+        ("In 2H₂ + O₂ → 2H₂O, how many moles of O₂ react with 4 moles of H₂?", ["1", "2", "4", "8"], "2", 1.6, 1.3),
+        ("Which law relates the pressure and volume of a gas at constant temperature?", ["Charles's law", "Boyle's law", "Avogadro's law", "Hooke's law"], "Boyle's law", 1.9, 1.2),
+    ],
+    "language_arts": [
+        ("What is the plural of 'child'?", ["childs", "children", "childes", "child's"], "children", -2.2, 1.0),
+        ("Which word is a noun in the sentence 'The quick fox jumped'?", ["quick", "fox", "jumped", "The"], "fox", -2.0, 1.1),
+        ("A simile compares two things using 'like' or 'as'.", ["True", "False"], "True", -1.6, 0.9),
+        ("Which sentence uses 'their' correctly?", ["Their going to the park.", "Put it over their.", "They left their books at school.", "Their is no time."], "They left their books at school.", -0.9, 1.3),
+        ("Which literary device is used in 'The wind whispered through the trees'?", ["Simile", "Personification", "Alliteration", "Hyperbole"], "Personification", -0.6, 1.4),
+        ("What is the main purpose of a thesis statement?", ["To summarize the conclusion", "To state the central argument", "To list the sources", "To introduce the author"], "To state the central argument", -0.5, 1.2),
+        ("Which is an example of alliteration?", ["Peter Piper picked peppers", "As brave as a lion", "The sun smiled down", "I've told you a million times"], "Peter Piper picked peppers", -0.2, 1.2),
+        ("What is the term for a story's turning point?", ["Exposition", "Climax", "Denouement", "Rising action"], "Climax", 0.0, 1.1),
+        ("What is the antonym of 'benevolent'?", ["Kind", "Generous", "Malevolent", "Charitable"], "Malevolent", 0.1, 1.3),
+        ("An unreliable narrator is always the antagonist of the story.", ["True", "False"], "False", 0.4, 1.0),
+        ("What is iambic pentameter?", ["Five unstressed-stressed syllable pairs per line", "Five stressed syllables per stanza", "A fourteen-line poem", "An ABAB rhyme scheme"], "Five unstressed-stressed syllable pairs per line", 1.0, 1.3),
+        ("Which sentence contains a dangling modifier?", ["Walking to school, the rain soaked my shoes.", "While I walked to school, the rain soaked my shoes.", "The rain soaked my shoes as I walked.", "My shoes were soaked by the rain."], "Walking to school, the rain soaked my shoes.", 1.3, 1.4),
+        ("What is a character who contrasts with another to highlight their traits called?", ["Foil", "Archetype", "Protagonist", "Narrator"], "Foil", 1.5, 1.2),
+        ("In 'The pen is mightier than the sword', 'pen' is an example of:", ["Metonymy", "Onomatopoeia", "Oxymoron", "Irony"], "Metonymy", 1.9, 1.1),
+    ],
+    "history": [
+        ("Who was the first President of the United States?", ["Thomas Jefferson", "George Washington", "John Adams", "Abraham Lincoln"], "George Washington", -2.0, 1.0),
+        ("Which ancient civilization built the pyramids at Giza?", ["Romans", "Greeks", "Egyptians", "Persians"], "Egyptians", -1.8, 1.1),
+        ("The Great Wall of China was built mainly to keep out northern invaders.", ["True", "False"], "True", -1.5, 0.9),
+        ("In which year did World War II end?", ["1918", "1939", "1945", "1950"], "1945", -1.0, 1.3),
+        ("Which document begins with 'We the People'?", ["Declaration of Independence", "U.S. Constitution", "Bill of Rights", "Articles of Confederation"], "U.S. Constitution", -0.7, 1.2),
+        ("In which country was the Magna Carta sealed?", ["France", "England", "Spain", "Germany"], "England", -0.4, 1.1),
+        ("Which invention is most closely tied to the start of the Industrial Revolution?", ["Printing press", "Steam engine", "Telephone", "Light bulb"], "Steam engine", -0.2, 1.3),
+        ("The Berlin Wall fell in 1989.", ["True", "False"], "True", 0.0, 1.0),
+        ("Which treaty ended World War I?", ["Treaty of Paris", "Treaty of Versailles", "Treaty of Westphalia", "Treaty of Ghent"], "Treaty of Versailles", 0.2, 1.4),
+        ("The Congress of Vienna reorganized Europe after the defeat of whom?", ["Louis XIV", "Napoleon", "Bismarck", "Charlemagne"], "Napoleon", 0.5, 1.2),
+        ("Who co-wrote the Communist Manifesto with Karl Marx?", ["Friedrich Engels", "Vladimir Lenin", "Adam Smith", "Leon Trotsky"], "Friedrich Engels", 0.8, 1.3),
+        ("The Meiji Restoration modernized which country?", ["China", "Korea", "Japan", "Thailand"], "Japan", 0.9, 1.2),
+        ("Which empire was ruled by Suleiman the Magnificent?", ["Mughal", "Ottoman", "Byzantine", "Safavid"], "Ottoman", 1.1, 1.3),
+        ("The Peace of Westphalia (1648) ended which conflict?", ["Hundred Years' War", "Thirty Years' War", "Seven Years' War", "Wars of the Roses"], "Thirty Years' War", 1.7, 1.2),
+    ],
+}
+
+ITEM_COLUMNS = ["id", "subject", "type", "text", "options", "correct_answer",
+                "discrimination", "difficulty", "guessing", "calibrated_at"]
+SUBJECT_ITEMS_QUERY = f"SELECT {', '.join(ITEM_COLUMNS)} FROM items WHERE subject = ? ORDER BY id"
+ALL_ITEMS_QUERY = f"SELECT {', '.join(ITEM_COLUMNS)} FROM items ORDER BY subject, id"
+UPSERT_ITEM = f"""
+    INSERT OR REPLACE INTO items ({', '.join(ITEM_COLUMNS)})
+    VALUES ({', '.join('?' for _ in ITEM_COLUMNS)})
+"""
+INSERT_RESPONSE = """
+    INSERT INTO item_responses (item_id, student_id, correct, theta, answered_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+RESPONSES_QUERY = """
+    SELECT r.item_id, r.student_id, r.correct, i.subject, i.guessing
+    FROM item_responses r JOIN items i ON i.id = r.item_id ORDER BY r.id
+"""
+INSERT_RUN = "INSERT INTO calibration_runs (created_at, items, responses, seconds) VALUES (?, ?, ?, ?)"
+INSERT_PARAMETERS = """
+    INSERT INTO item_parameters (version, item_id, subject, discrimination, difficulty, guessing, responses, p_correct)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+UPDATE_ITEM_PARAMETERS = "UPDATE items SET discrimination = ?, difficulty = ?, calibrated_at = ? WHERE id = ?"
+LATEST_VERSION_QUERY = "SELECT MAX(version) FROM calibration_runs"
+PARAMETERS_QUERY = """
+    SELECT item_id, subject, discrimination, difficulty, guessing, responses, p_correct
+    FROM item_parameters WHERE version = ?
+"""
+
+# Rows fetched per round trip when streaming responses
+DEFAULT_BATCH_SIZE = 5000
+
+# Assessment questions are calibrated as items named "<assessment id>:q<index>"
+QUESTION_SEPARATOR = ":q"
+
+def question_item_id(assessment_id, index):
+    """
+    Get the item ID of an assessment question in the parameter tables.
+
+    Args:
+        assessment_id: The ID of the assessment
+        index: Position of the question in the assessment
+
+    Returns:
+        str: The item ID
+    """
+    return f"{assessment_id}{QUESTION_SEPARATOR}{index}"
+
+def default_guessing(options):
+    """
+    Initial guessing parameter of a choice item.
+
+    Args:
+        options: The item's answer options
+
+    Returns:
+        float: A little below the chance of a blind guess (0 without options)
+    """
+    return round(0.8 / len(options), 2) if options else 0.0
+
+def _choice_item(item_id, subject, text, options, answer, difficulty, discrimination):
+    """Build a multiple choice or true/false item dictionary."""
+    return {
+        "id": item_id,
+        "subject": subject,
+        "type": "true_false" if options == ["True", "False"] else "multiple_choice",
+        "text": text,
+        "options": options,
+        "correct_answer": answer,
+        "discrimination": discrimination,
+        "difficulty": difficulty,
+        "guessing": default_guessing(options),
+        "calibrated_at": None
+    }
+
+def _math_items():
+    """Generated math items, from arithmetic (easy) to quadratics (hard)."""
+    rng = random.Random(2024)
+    items = []
+
+    def add(text, answer, distractors, difficulty):
+        options = [str(answer)]
+        for distractor in map(str, distractors):
+            if distractor not in options and len(options) < 4:
+                options.append(distractor)
+        rng.shuffle(options)
+        item_id = f"math_{len(items) + 1:03d}"
+        items.append(_choice_item(item_id, "math", text, options, str(answer), round(difficulty, 2),
+                                  round(rng.uniform(1.0, 1.6), 2)))
+
+    for _ in range(8):
+        x, y = rng.randint(11, 89), rng.randint(11, 89)
+        add(f"What is {x} + {y}?", x + y, [x + y + 10, x + y - 1, x + y + 1, x + y - 10], rng.uniform(-2.4, -1.6))
+    for _ in range(8):
+        x, y = rng.randint(3, 9), rng.randint(12, 49)
+        add(f"What is {x} × {y}?", x * y, [x * y + x, x * y - y, (x + 1) * y, x * y + 10], rng.uniform(-1.5, -0.9))
+    for _ in range(8):
+        a, x = rng.randint(2, 9), rng.randint(2, 12)
+        b = rng.randint(1, 20)
+        add(f"Solve for x: {a}x + {b} = {a * x + b}", f"x = {x}",
+            [f"x = {x + 1}", f"x = {x - 1}", f"x = {a * x + b - a}", f"x = {x + b}"], rng.uniform(-0.8, -0.2))
+    for _ in range(8):
+        percent, whole = rng.choice([10, 15, 20, 25, 30, 40, 75]), rng.randint(2, 30) * 20
+        answer = percent * whole // 100
+        add(f"What is {percent}% of {whole}?", answer, [answer * 2, answer + percent, whole - answer, answer // 2 + 1, answer + 10],
+            rng.uniform(-0.4, 0.3))
+    for _ in range(8):
+        a, x = rng.randint(2, 7), rng.randint(-9, -2)
+        b, c = rng.randint(-15, 15), rng.randint(2, 5)
+        left = f"{a}(x {'+' if b >= 0 else '-'} {abs(b)})"
+        add(f"Solve for x: {left} + {c} = {a * (x + b) + c}", f"x = {x}",
+            [f"x = {-x}", f"x = {x + b}", f"x = {x - 1}", f"x = {x + 2}", f"x = {x - 2}"], rng.uniform(0.4, 1.1))
+    for _ in range(8):
+        p, q = rng.randint(2, 6), rng.randint(2, 5)
+        add(f"Simplify (x^{p})^{q} · x^{q}", f"x^{p * q + q}",
+            [f"x^{p + q + q}", f"x^{p * q}", f"x^{p * q * q}", f"x^{p + q}", f"x^{p * q + 1}"], rng.uniform(0.9, 1.5))
+    for _ in range(8):
+        r1, r2 = rng.randint(-8, 8), rng.randint(-8, 8)
+        if r1 == r2:
+            r2 += 3
+        s, p = r1 + r2, r1 * r2
+        lo, hi = sorted((r1, r2))
+        equation = f"x² {'-' if s >= 0 else '+'} {abs(s)}x {'+' if p >= 0 else '-'} {abs(p)} = 0"
+        add(f"What are the solutions of {equation}?", f"x = {lo} or x = {hi}",
+            [f"x = {-hi} or x = {-lo}", f"x = {lo} or x = {-hi}", f"x = {s} or x = {p}", f"x = {lo + 1} or x = {hi - 1}", f"x = {lo - 1} or x = {hi + 1}"],
+            rng.uniform(1.5, 2.4))
+    return items
+
+def _seed_items():
+    """The demo item bank: generated math items plus the written items."""
+    items = _math_items()
+    for subject, rows in _WRITTEN_ITEMS.items():
+        for i, (text, options, answer, difficulty, discrimination) in enumerate(rows, start=1):
+            items.append(_choice_item(f"{subject}_{i:03d}", subject, text, options, answer, difficulty, discrimination))
+    return items
+
+def _item_row(item):
+    """Convert an item dictionary into a row for UPSERT_ITEM."""
+    return (
+        item["id"], item["subject"], item["type"], item["text"], json.dumps(item.get("options", [])),
+        item["correct_answer"], float(item.get("discrimination", 1.0)), float(item.get("difficulty", 0.0)),
+        float(item.get("guessing", 0.0)), item.get("calibrated_at")
+    )
+
+def _connection():
+    """Get the worker's connection, seeding the item bank if it is empty."""
+    conn = get_connection()
+    if is_empty(conn, "items"):
+        with conn:
+            conn.executemany(UPSERT_ITEM, [_item_row(item) for item in _seed_items()])
+    return conn
+
+def get_items(subject=None):
+    """
+    Get the items of the adaptive testing bank.
+
+    Args:
+        subject: Optional subject key (e.g. "math"); all subjects if None
+
+    Returns:
+        List of item dictionaries with id, subject, type, text, options,
+        correct_answer, discrimination, difficulty, guessing and
+        calibrated_at (None until calibrated against responses)
+    """
+    conn = _connection()
+    rows = conn.execute(SUBJECT_ITEMS_QUERY, (subject,)) if subject else conn.execute(ALL_ITEMS_QUERY)
+    items = []
+    for row in rows:
+        item = dict(row)
+        item["options"] = json.loads(item["options"])
+        items.append(item)
+    return items
+
+def save_items(items):
+    """
+    Add or replace items in the bank.
+
+    Args:
+        items: Iterable of item dictionaries (see get_items)
+    """
+    conn = _connection()
+    with conn:
+        bump_data_version(conn, "items")
+        conn.executemany(UPSERT_ITEM, [_item_row(item) for item in items])
+
+def get_bank_version():
+    """
+    Get a value that changes whenever the bank's parameters may have changed.
+
+    Items and calibration runs are often saved by another process, so
+    both versions are read from the database.
+
+    Returns:
+        Tuple of (item bank version, latest calibration version)
+    """
+    return get_data_version("items"), get_calibration_version()
+
+def record_responses(student_id, responses):
+    """
+    Store a student's scored responses to bank items.
+
+    Args:
+        student_id: The ID of the student
+        responses: Iterable of (item_id, correct, theta) tuples, where theta
+            is the ability estimate before the item was answered
+    """
+    now = time.time()
+    conn = _connection()
+    with conn:
+        conn.executemany(INSERT_RESPONSE, [
+            (item_id, student_id, int(bool(correct)), theta, now)
+            for item_id, correct, theta in responses
+        ])
+
+def iter_responses(batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream every recorded response to a bank item.
+
+    Args:
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Lists of (item_id, student_id, correct, subject, guessing) tuples,
+        oldest first
+    """
+    cursor = _connection().execute(RESPONSES_QUERY)
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield [tuple(row) for row in rows]
+
+def save_calibration(parameters, responses, seconds=None):
+    """
+    Store the results of a calibration run as a new parameter version.
+
+    Bank items take their new parameters directly; parameters of assessment
+    questions are read from the version table.
+
+    Args:
+        parameters: List of dicts with item_id, subject, discrimination,
+            difficulty, guessing, responses and p_correct
+        responses: Number of responses the run was fitted on
+        seconds: Optional duration of the run
+
+    Returns:
+        int: The new calibration version
+    """
+    now = time.time()
+    conn = _connection()
+    with conn:
+        version = conn.execute(INSERT_RUN, (now, len(parameters), responses, seconds)).lastrowid
+        conn.executemany(INSERT_PARAMETERS, [
+            (version, p["item_id"], p["subject"], p["discrimination"], p["difficulty"], p["guessing"],
+             p["responses"], p["p_correct"])
+            for p in parameters
+        ])
+        # Rows for assessment questions match no item and are ignored
+        conn.executemany(UPDATE_ITEM_PARAMETERS, [
+            (p["discrimination"], p["difficulty"], now, p["item_id"]) for p in parameters
+        ])
+    return version
+
+def get_calibration_version():
+    """
+    Get the version of the latest calibration run.
+
+    Returns:
+        int: The version, or 0 if nothing has been calibrated
+    """
+    return get_connection().execute(LATEST_VERSION_QUERY).fetchone()[0] or 0
+
+def get_item_parameters(version=None):
+    """
+    Get calibrated item parameters.
+
+    Args:
+        version: Calibration version (defaults to the latest)
+
+    Returns:
+        Dict of {item_id: parameter dict} (empty before the first run)
+    """
+    version = version or get_calibration_version()
+    return {row["item_id"]: dict(row) for row in get_connection().execute(PARAMETERS_QUERY, (version,))}
+
+def get_question_parameters(version=None):
+    """
+    Get the calibrated parameters of assessment questions.
+
+    Args:
+        version: Calibration version (defaults to the latest)
+
+    Returns:
+        Dict of {assessment_id: {question index: parameter dict}}
+    """
+    questions = {}
+    for item_id, parameters in get_item_parameters(version).items():
+        assessment_id, separator, index = item_id.rpartition(QUESTION_SEPARATOR)
+        if separator and index.isdigit():
+            questions.setdefault(assessment_id, {})[int(index)] = parameters
+    return questions
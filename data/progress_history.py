@@ -0,0 +1,205 @@
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from data.database import SUBJECTS, get_connection, is_empty
+
+# Students whose history is kept in memory at once
+DEFAULT_MAX_STUDENTS = 1024
+
+SECONDS_PER_MONTH = 30 * 24 * 3600
+
+# Demo history (oldest first) seeded before each student's current score
+_SAMPLE_HISTORY = {
+    "math": [65, 68, 72, 75],
+    "science": [70, 72, 75, 78],
+    "language_arts": [80, 82, 80, 83],
+    "history": [75, 77, 80, 78]
+}
+
+INSERT_EVENT = """
+    INSERT INTO progress_events (student_id, subject, recorded_at, score, source)
+    VALUES (?, ?, ?, ?, ?)
+"""
+STUDENT_EVENTS_QUERY = """
+    SELECT id, subject, recorded_at, score FROM progress_events
+    WHERE student_id = ? AND id > ? ORDER BY id
+"""
+
+class ProgressStore:
+    """
+    Columnar in-memory view of the append-only progress_events table.
+
+    Each student's history is held as one pair of NumPy arrays (timestamps
+    and scores, sorted by time) per subject. Because events are only ever
+    appended, a student's arrays are brought up to date by reading the rows
+    with an ID above the last one seen.
+    """
+
+    def __init__(self, max_students=DEFAULT_MAX_STUDENTS):
+        """
+        Initialize the store.
+
+        Args:
+            max_students: Maximum number of students kept in memory
+        """
+        self.max_students = max_students
+        self._students = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _refresh(self, student_id):
+        """Load a student's new events and return their subject arrays."""
+        with self._lock:
+            last_id, series = self._students.get(student_id, (0, {}))
+
+        rows = _connection().execute(STUDENT_EVENTS_QUERY, (student_id, last_id)).fetchall()
+        if rows:
+            series = dict(series)
+            _, row_subjects, row_times, row_scores = zip(*rows)
+            row_subjects = np.array(row_subjects)
+            row_times = np.array(row_times, dtype=np.float64)
+            row_scores = np.array(row_scores, dtype=np.float64)
+            for subject in np.unique(row_subjects):
+                mask = row_subjects == subject
+                times, scores = series.get(str(subject), (np.empty(0), np.empty(0)))
+                times = np.concatenate([times, row_times[mask]])
+                scores = np.concatenate([scores, row_scores[mask]])
+                if len(times) > 1 and np.any(np.diff(times) < 0):
+                    # Back-dated events arrive out of order; keep the arrays sorted by time
+                    order = np.argsort(times, kind="stable")
+                    times, scores = times[order], scores[order]
+                series[str(subject)] = (times, scores)
+            last_id = rows[-1]["id"]
+
+        with self._lock:
+            current = self._students.get(student_id)
+            if current is not None and current[0] >= last_id:
+                # Another thread refreshed this student at least as far meanwhile
+                last_id, series = current
+            self._students[student_id] = (last_id, series)
+            self._students.move_to_end(student_id)
+            while len(self._students) > self.max_students:
+                self._students.popitem(last=False)
+        return series
+
+    def series(self, student_id, subject, start=None, end=None):
+        """
+        Get a student's scores in one subject over a time range.
+
+        Args:
+            student_id: The ID of the student
+            subject: Subject key (e.g. "math")
+            start: Optional earliest Unix timestamp (inclusive)
+            end: Optional latest Unix timestamp (inclusive)
+
+        Returns:
+            Tuple of (timestamps, scores) arrays sorted by time (read-only)
+        """
+        times, scores = self._refresh(student_id).get(subject, (np.empty(0), np.empty(0)))
+        low = 0 if start is None else np.searchsorted(times, start, side="left")
+        high = len(times) if end is None else np.searchsorted(times, end, side="right")
+        return times[low:high], scores[low:high]
+
+    def record(self, student_id, subject, score, recorded_at=None, source=None):
+        """
+        Append one assessment result to a student's history.
+
+        Args:
+            student_id: The ID of the student
+            subject: Subject key (e.g. "math")
+            score: Score between 0 and 100
+            recorded_at: Optional Unix timestamp (defaults to now)
+            source: Optional ID of the assessment the score came from
+        """
+        self.record_many([(student_id, subject, score, recorded_at, source)])
+
+    def record_many(self, events):
+        """
+        Append several results in one transaction.
+
+        Args:
+            events: Iterable of (student_id, subject, score, recorded_at, source)
+                tuples; recorded_at and source may be None
+        """
+        now = time.time()
+        conn = _connection()
+        with conn:
+            conn.executemany(INSERT_EVENT, [
+                (student_id, subject, recorded_at if recorded_at is not None else now, float(score), source)
+                for student_id, subject, score, recorded_at, source in events
+            ])
+
+def _seed_events(students, now):
+    """Demo history for the given students: one score a month, ending at the current score."""
+    events = []
+    for student in students:
+        for subject in SUBJECTS:
+            history = _SAMPLE_HISTORY[subject] + [student["performance"].get(subject, 0)]
+            for i, score in enumerate(history):
+                recorded_at = now - (len(history) - 1 - i) * SECONDS_PER_MONTH
+                events.append((student["id"], subject, recorded_at, score, "seed"))
+    return events
+
+# Whether this process has already checked the table for the demo seed
+_seed_checked = False
+_seed_lock = threading.Lock()
+
+def _connection():
+    """Get the worker's connection, seeding the demo roster's history on first use if the table is empty."""
+    global _seed_checked
+    conn = get_connection()
+    if not _seed_checked:
+        with _seed_lock:
+            if not _seed_checked:
+                if is_empty(conn, "progress_events"):
+                    # Imported here: student_data is only needed for the one-time seed
+                    from data.student_data import DEMO_STUDENT_IDS, get_student_data
+                    demo_students = [student for student in map(get_student_data, DEMO_STUDENT_IDS) if student]
+                    with conn:
+                        conn.executemany(INSERT_EVENT, _seed_events(demo_students, time.time()))
+                _seed_checked = True
+    return conn
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_progress_store():
+    """
+    Get the progress store shared by all sessions.
+
+    Returns:
+        The process-wide ProgressStore instance
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProgressStore()
+    return _store
+
+def record_progress(student_id, subject, score, recorded_at=None, source=None):
+    """
+    Record an assessment result in a student's progress history.
+
+    Args:
+        student_id: The ID of the student
+        subject: Subject key (e.g. "math")
+        score: Score between 0 and 100
+        recorded_at: Optional Unix timestamp (defaults to now)
+        source: Optional ID of the assessment the score came from
+    """
+    get_progress_store().record(student_id, subject, score, recorded_at, source)
+
+def save_progress_events(events):
+    """
+    Append many results to the progress history in one transaction.
+
+    Unlike record_progress() this never seeds the demo history, so bulk
+    loaders can fill an empty table with their own.
+
+    Args:
+        events: Iterable of (student_id, subject, recorded_at, score, source) tuples
+    """
+    conn = get_connection()
+    with conn:
+        conn.executemany(INSERT_EVENT, events)
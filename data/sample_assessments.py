@@ -0,0 +1,293 @@
+import json
+import uuid
+from data.database import get_connection, is_empty
+from utils.metrics import timed
+
+# Demo assessments seeded into an empty database on first use.
+_SAMPLE_ASSESSMENTS = [
+    {
+        "id": "math_quiz_1",
+        "title": "Algebra Fundamentals Quiz",
+        "subject": "Math",
+        "type": "Quiz",
+        "description": "A quiz covering basic algebraic concepts including equations, inequalities, and functions.",
+        "due_date": "2023-06-15",
+        "estimated_time": 30,
+        "questions": [
+            {
+                "id": "q1",
+                "type": "multiple_choice",
+                "text": "Solve for x: 2x + 5 = 13",
+                "options": ["x = 4", "x = 9", "x = 3", "x = 6"],
+                "correct_answer": "x = 4"
+            },
+            {
+                "id": "q2",
+                "type": "multiple_choice",
+                "text": "Which of the following is a linear function?",
+                "options": ["y = x²", "y = 3x + 2", "y = 1/x", "y = 2^x"],
+                "correct_answer": "y = 3x + 2"
+            },
+            {
+                "id": "q3",
+                "type": "true_false",
+                "text": "The solution to the inequality x > 5 includes the value x = 5.",
+                "correct_answer": "False"
+            },
+            {
+                "id": "q4",
+                "type": "short_answer",
+                "text": "Explain the difference between an expression and an equation.",
+                "sample_answer": "An expression is a mathematical phrase with numbers, variables, and operators, but does not contain an equals sign. An equation contains an equals sign and states that two expressions are equal."
+            }
+        ]
+    },
+    {
+        "id": "science_lab_1",
+        "title": "Scientific Method Lab Report",
+        "subject": "Science",
+        "type": "Lab",
+        "description": "Complete a lab report for your experiment on photosynthesis. Include your hypothesis, methodology, results, and conclusions.",
+        "due_date": "2023-06-20",
+        "estimated_time": 60,
+        "instructions": "Write a complete lab report following the scientific method. Include your initial hypothesis, detailed methodology, observed results, and conclusions drawn from the experiment.",
+        "deliverables": "A comprehensive lab report document including any charts, graphs, or images documenting your experiment."
+    },
+    {
+        "id": "history_essay_1",
+        "title": "Industrial Revolution Impact Essay",
+        "subject": "History",
+        "type": "Essay",
+        "description": "Write an analytical essay on the social and economic impacts of the Industrial Revolution on European society.",
+        "due_date": "2023-06-25",
+        "estimated_time": 90,
+        "prompt": "Analyze the social and economic impacts of the Industrial Revolution on European society during the 18th and 19th centuries. Consider factors such as urbanization, working conditions, class structure, and economic growth.",
+        "word_count_min": 750,
+        "word_count_max": 1200,
+        "criteria": "Thesis (25%)\nHistorical Evidence (30%)\nAnalysis (25%)\nOrganization (10%)\nGrammar and Style (10%)"
+    },
+    {
+        "id": "language_arts_project_1",
+        "title": "Literary Analysis Project",
+        "subject": "Language Arts",
+        "type": "Project",
+        "description": "Create a multimedia presentation analyzing themes, characters, and literary devices in the novel we read this quarter.",
+        "due_date": "2023-06-30",
+        "estimated_time": 120,
+        "instructions": "Develop a presentation that analyzes the major themes, character development, and literary devices in the assigned novel. Your analysis should be supported by specific examples from the text.",
+        "deliverables": "A digital presentation (slides or video) and a written analysis document of at least 500 words."
+    },
+    {
+        "id": "math_test_1",
+        "title": "Geometry Concepts Test",
+        "subject": "Math",
+        "type": "Test",
+        "description": "A comprehensive test covering geometric concepts including angles, triangles, circles, and area/volume calculations.",
+        "due_date": "2023-07-05",
+        "estimated_time": 45
+    }
+]
+# Columns stored directly on the assessments table; everything else is kept
+# in the JSON "details" column (questions, prompts, rubrics, ...)
+BASE_COLUMNS = ["id", "title", "subject", "type", "description", "due_date", "estimated_time"]
+
+ASSESSMENT_DETAIL_COLUMNS = ", ".join(BASE_COLUMNS + ["details"])
+ASSESSMENT_SUMMARY_COLUMNS = ", ".join(BASE_COLUMNS)
+
+ALL_ASSESSMENTS_QUERY = f"SELECT {ASSESSMENT_DETAIL_COLUMNS} FROM assessments ORDER BY due_date, rowid"
+ASSESSMENT_SUMMARIES_QUERY = f"SELECT {ASSESSMENT_SUMMARY_COLUMNS} FROM assessments ORDER BY due_date, rowid"
+ASSESSMENT_BY_ID_QUERY = f"SELECT {ASSESSMENT_DETAIL_COLUMNS} FROM assessments WHERE id = ?"
+INSERT_ASSESSMENT = f"""
+    INSERT OR REPLACE INTO assessments ({ASSESSMENT_DETAIL_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+INSERT_SUBMISSION = """
+    INSERT INTO submissions (assessment_id, student_id, score, content, result)
+    VALUES (?, ?, ?, ?, ?)
+"""
+INSERT_SUBMISSION_AT = """
+    INSERT INTO submissions (assessment_id, student_id, submitted_at, score, content, result)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+COMPLETION_STATS_QUERY = """
+    SELECT assessment_id, COUNT(DISTINCT student_id) AS completed, AVG(score) AS avg_score
+    FROM submissions GROUP BY assessment_id
+"""
+STUDENT_SUBMISSIONS_QUERY = """
+    SELECT id, assessment_id, submitted_at, score, result
+    FROM submissions WHERE student_id = ?
+    ORDER BY submitted_at DESC, id DESC LIMIT ?
+"""
+SUBMISSION_CONTENTS_QUERY = """
+    SELECT s.assessment_id, s.student_id, s.content
+    FROM submissions s JOIN assessments a ON a.id = s.assessment_id
+    WHERE a.type IN ({placeholders}) ORDER BY s.id
+"""
+
+# Rows fetched per round trip when streaming submissions
+DEFAULT_BATCH_SIZE = 5000
+
+def _assessment_row(assessment):
+    """Split an assessment dictionary into a row for INSERT_ASSESSMENT."""
+    details = {key: value for key, value in assessment.items() if key not in BASE_COLUMNS}
+    return tuple(assessment.get(column) for column in BASE_COLUMNS) + (json.dumps(details),)
+
+def _row_to_assessment(row):
+    """Merge a stored row and its JSON details back into one dictionary."""
+    assessment = {column: row[column] for column in BASE_COLUMNS}
+    if "details" in row.keys():
+        assessment.update(json.loads(row["details"] or "{}"))
+    return assessment
+
+def _connection():
+    """Get the worker's connection, seeding the demo assessments if needed."""
+    conn = get_connection()
+    if is_empty(conn, "assessments"):
+        with conn:
+            conn.executemany(INSERT_ASSESSMENT, [_assessment_row(a) for a in _SAMPLE_ASSESSMENTS])
+    return conn
+
+@timed("data.get_available_assessments")
+def get_available_assessments():
+    """
+    Get a list of available assessments.
+    
+    Returns:
+        List of assessment dictionaries
+    """
+    return [_row_to_assessment(row) for row in _connection().execute(ALL_ASSESSMENTS_QUERY)]
+
+@timed("data.get_assessment_summaries")
+def get_assessment_summaries():
+    """
+    Get the listing columns of every assessment, without questions or rubrics.
+
+    Returns:
+        List of assessment dictionaries with id, title, subject, type,
+        description, due_date and estimated_time
+    """
+    return [_row_to_assessment(row) for row in _connection().execute(ASSESSMENT_SUMMARIES_QUERY)]
+
+def get_assessment_by_id(assessment_id):
+    """
+    Get a specific assessment by ID.
+    
+    Args:
+        assessment_id: The ID of the assessment to retrieve
+        
+    Returns:
+        Assessment dictionary or None if not found
+    """
+    row = _connection().execute(ASSESSMENT_BY_ID_QUERY, (assessment_id,)).fetchone()
+    return _row_to_assessment(row) if row else None
+
+def create_assessment(assessment):
+    """
+    Save a new assessment.
+
+    Args:
+        assessment: Assessment dictionary; an "id" is generated if missing
+
+    Returns:
+        The ID of the saved assessment
+    """
+    assessment = dict(assessment)
+    if not assessment.get("id"):
+        prefix = f"{assessment['subject']}_{assessment['type']}".lower().replace(" ", "_")
+        assessment["id"] = f"{prefix}_{uuid.uuid4().hex[:8]}"
+    
+    conn = _connection()
+    with conn:
+        conn.execute(INSERT_ASSESSMENT, _assessment_row(assessment))
+    
+    return assessment["id"]
+
+def record_submission(assessment_id, student_id, score=None, content=None, result=None):
+    """
+    Store a student's submission for an assessment.
+
+    Args:
+        assessment_id: The ID of the assessment
+        student_id: The ID of the submitting student
+        score: Optional overall score (0-100)
+        content: Optional submitted text
+        result: Optional grading result dictionary
+
+    Returns:
+        The ID of the new submission
+    """
+    conn = _connection()
+    with conn:
+        cursor = conn.execute(
+            INSERT_SUBMISSION,
+            (assessment_id, student_id, score, content, json.dumps(result or {}))
+        )
+    return cursor.lastrowid
+
+def record_submissions(submissions):
+    """
+    Store many submissions in one transaction.
+
+    Args:
+        submissions: Iterable of (assessment_id, student_id, submitted_at,
+            score, content, result_json) tuples; submitted_at is a
+            "YYYY-MM-DD HH:MM:SS" UTC string and result_json a JSON object
+
+    Returns:
+        int: Number of submissions stored
+    """
+    conn = _connection()
+    with conn:
+        return conn.executemany(INSERT_SUBMISSION_AT, submissions).rowcount
+
+@timed("data.get_assessment_completion_stats")
+def get_assessment_completion_stats():
+    """
+    Get completion counts and average scores for every assessment.
+
+    Returns:
+        Dict of {assessment_id: {"completed": int, "avg_score": float or None}}
+    """
+    return {
+        row["assessment_id"]: {"completed": row["completed"], "avg_score": row["avg_score"]}
+        for row in _connection().execute(COMPLETION_STATS_QUERY)
+    }
+
+@timed("data.get_student_submissions")
+def get_student_submissions(student_id, limit=20):
+    """
+    Get a student's most recent submissions.
+
+    Args:
+        student_id: The ID of the student
+        limit: Maximum number of submissions to return
+
+    Returns:
+        List of submission dictionaries, newest first
+    """
+    submissions = []
+    for row in _connection().execute(STUDENT_SUBMISSIONS_QUERY, (student_id, limit)):
+        submission = dict(row)
+        submission["result"] = json.loads(submission["result"] or "{}")
+        submissions.append(submission)
+    return submissions
+
+def iter_submission_contents(types=("Quiz", "Test"), batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the submitted answers of every assessment of the given types.
+
+    Args:
+        types: Assessment types to include
+        batch_size: Rows fetched per round trip
+
+    Yields:
+        Lists of (assessment_id, student_id, content) tuples, oldest first
+    """
+    placeholders = ", ".join("?" for _ in types)
+    cursor = _connection().execute(SUBMISSION_CONTENTS_QUERY.format(placeholders=placeholders), tuple(types))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield [tuple(row) for row in rows]
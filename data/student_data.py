@@ -0,0 +1,494 @@
+import threading
+from data.database import SUBJECTS, get_connection, is_empty, bump_data_version, get_data_version
+from utils.metrics import timed
+
+# Demo roster seeded into an empty database on first use.
+_SAMPLE_STUDENTS = [
+    {
+        "id": "S1001",
+        "first_name": "Emma",
+        "last_name": "Johnson",
+        "grade_level": 10,
+        "learning_style": "Visual",
+        "completed_assessments": 12,
+        "performance": {
+            "math": 85,
+            "science": 92,
+            "language_arts": 88,
+            "history": 78
+        },
+        "engagement": {
+            "math": 7,
+            "science": 9,
+            "language_arts": 8,
+            "history": 6
+        }
+    },
+    {
+        "id": "S1002",
+        "first_name": "Michael",
+        "last_name": "Smith",
+        "grade_level": 10,
+        "learning_style": "Kinesthetic",
+        "completed_assessments": 10,
+        "performance": {
+            "math": 72,
+            "science": 68,
+            "language_arts": 85,
+            "history": 80
+        },
+        "engagement": {
+            "math": 5,
+            "science": 6,
+            "language_arts": 8,
+            "history": 7
+        }
+    },
+    {
+        "id": "S1003",
+        "first_name": "Sophia",
+        "last_name": "Garcia",
+        "grade_level": 10,
+        "learning_style": "Auditory",
+        "completed_assessments": 14,
+        "performance": {
+            "math": 95,
+            "science": 90,
+            "language_arts": 92,
+            "history": 94
+        },
+        "engagement": {
+            "math": 9,
+            "science": 8,
+            "language_arts": 9,
+            "history": 9
+        }
+    },
+    {
+        "id": "S1004",
+        "first_name": "Jacob",
+        "last_name": "Wilson",
+        "grade_level": 10,
+        "learning_style": "Reading/Writing",
+        "completed_assessments": 8,
+        "performance": {
+            "math": 65,
+            "science": 72,
+            "language_arts": 80,
+            "history": 68
+        },
+        "engagement": {
+            "math": 4,
+            "science": 6,
+            "language_arts": 7,
+            "history": 5
+        }
+    },
+    {
+        "id": "S1005",
+        "first_name": "Olivia",
+        "last_name": "Martinez",
+        "grade_level": 10,
+        "learning_style": "Visual",
+        "completed_assessments": 11,
+        "performance": {
+            "math": 78,
+            "science": 85,
+            "language_arts": 90,
+            "history": 82
+        },
+        "engagement": {
+            "math": 6,
+            "science": 8,
+            "language_arts": 9,
+            "history": 7
+        }
+    },
+    {
+        "id": "S1006",
+        "first_name": "Ethan",
+        "last_name": "Brown",
+        "grade_level": 10,
+        "learning_style": "Kinesthetic",
+        "completed_assessments": 9,
+        "performance": {
+            "math": 88,
+            "science": 75,
+            "language_arts": 70,
+            "history": 73
+        },
+        "engagement": {
+            "math": 8,
+            "science": 6,
+            "language_arts": 5,
+            "history": 6
+        }
+    },
+    {
+        "id": "S1007",
+        "first_name": "Ava",
+        "last_name": "Taylor",
+        "grade_level": 10,
+        "learning_style": "Auditory",
+        "completed_assessments": 13,
+        "performance": {
+            "math": 82,
+            "science": 88,
+            "language_arts": 93,
+            "history": 85
+        },
+        "engagement": {
+            "math": 7,
+            "science": 8,
+            "language_arts": 9,
+            "history": 7
+        }
+    }
+]
+
+# IDs of the demo roster, whose history other modules may seed alongside it
+DEMO_STUDENT_IDS = tuple(student["id"] for student in _SAMPLE_STUDENTS)
+
+class StudentRepository:
+    """
+    Process-wide, indexed store for student records.
+
+    The roster is loaded once and shared by every Streamlit session in the
+    process. Lookups by ID and by display name are served from hash indexes,
+    and any write invalidates the cached roster so the next read reloads it.
+    Writes made by other processes are noticed through a shared version
+    checked on every read.
+    """
+
+    def __init__(self, loader, writer, version=None):
+        """
+        Initialize the repository.
+
+        Args:
+            loader: Callable returning the full list of student dictionaries
+            writer: Callable that creates or replaces one student record
+            version: Optional callable returning the roster's shared version
+        """
+        self._loader = loader
+        self._writer = writer
+        self._version = version
+        self._loaded_version = None
+        self._lock = threading.RLock()
+        self._students = None
+        self._by_id = {}
+        self._id_by_name = {}
+        self._names = []
+        self._listeners = []
+
+    @staticmethod
+    def display_name(student):
+        """Return the name shown for a student in selectboxes."""
+        return f"{student['first_name']} {student['last_name']}"
+
+    def _ensure_loaded(self):
+        """Load the roster and build the indexes if the cache is empty or stale."""
+        students = self._students
+        if students is not None and self._version is not None and self._version() != self._loaded_version:
+            # Another process changed the roster
+            self.invalidate()
+            students = None
+        if students is None:
+            with self._lock:
+                if self._students is None:
+                    # Read the version first, so a write during the load triggers another reload
+                    version = self._version() if self._version is not None else None
+                    self._build_indexes(self._loader())
+                    self._loaded_version = version
+                students = self._students
+        return students
+
+    def _build_indexes(self, students):
+        """Rebuild the ID and name indexes for the given roster."""
+        by_id = {}
+        id_by_name = {}
+        names = []
+
+        for student in students:
+            by_id[student["id"]] = student
+            name = self.display_name(student)
+            names.append(name)
+            # Keep the first student for duplicate names so lookups stay stable
+            id_by_name.setdefault(name, student["id"])
+
+        self._by_id = by_id
+        self._id_by_name = id_by_name
+        self._names = names
+        self._students = students
+
+    def all(self):
+        """
+        Get every student in roster order.
+
+        Returns:
+            List of student dictionaries (shared, treat as read-only)
+        """
+        return self._ensure_loaded()
+
+    def get(self, student_id):
+        """
+        Get a student by ID.
+
+        Args:
+            student_id: The ID of the student to retrieve
+
+        Returns:
+            Student dictionary or None if not found
+        """
+        self._ensure_loaded()
+        return self._by_id.get(student_id)
+
+    def names(self):
+        """
+        Get the display names of all students in roster order.
+
+        Returns:
+            List of "First Last" strings
+        """
+        self._ensure_loaded()
+        return self._names
+
+    def get_id_by_name(self, name):
+        """
+        Resolve a display name to a student ID.
+
+        Args:
+            name: A "First Last" display name
+
+        Returns:
+            Student ID or None if no student has that name
+        """
+        self._ensure_loaded()
+        return self._id_by_name.get(name)
+
+    def subscribe(self, listener):
+        """
+        Register a callback for roster changes.
+
+        Args:
+            listener: Callable receiving the saved student dictionary, or
+                None when the whole roster was invalidated
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, student):
+        """Call every registered listener with a changed record."""
+        for listener in self._listeners:
+            listener(student)
+
+    def _clear(self):
+        """Drop the cached roster and indexes."""
+        with self._lock:
+            self._students = None
+            self._by_id = {}
+            self._id_by_name = {}
+            self._names = []
+
+    def invalidate(self):
+        """Drop the cached roster so the next read reloads it."""
+        self._clear()
+        self._notify(None)
+
+    def save(self, student):
+        """
+        Persist a student record and invalidate the cache.
+
+        Args:
+            student: Student dictionary to create or replace
+        """
+        with self._lock:
+            self._writer(student)
+            self._clear()
+        self._notify(student)
+
+STUDENT_COLUMNS_QUERY = """
+    SELECT id, first_name, last_name, grade_level, learning_style, completed_assessments
+    FROM students ORDER BY rowid
+"""
+PERFORMANCE_QUERY = "SELECT student_id, subject, score FROM performance"
+ENGAGEMENT_QUERY = "SELECT student_id, subject, level FROM engagement"
+
+UPSERT_STUDENT = """
+    INSERT INTO students (id, first_name, last_name, grade_level, learning_style, completed_assessments)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        first_name = excluded.first_name,
+        last_name = excluded.last_name,
+        grade_level = excluded.grade_level,
+        learning_style = excluded.learning_style,
+        completed_assessments = excluded.completed_assessments
+"""
+UPSERT_PERFORMANCE = "INSERT OR REPLACE INTO performance (student_id, subject, score) VALUES (?, ?, ?)"
+UPSERT_ENGAGEMENT = "INSERT OR REPLACE INTO engagement (student_id, subject, level) VALUES (?, ?, ?)"
+
+def _score(value):
+    """Return whole-number scores as ints so pages render them unchanged."""
+    return int(value) if float(value).is_integer() else value
+
+def _in_subject_order(values):
+    """Order a subject dict the way the pages list subjects."""
+    ordered = {subject: values[subject] for subject in SUBJECTS if subject in values}
+    ordered.update(values)
+    return ordered
+
+def _write_students(conn, students):
+    """Insert or replace student rows with their performance and engagement."""
+    conn.executemany(UPSERT_STUDENT, [
+        (s["id"], s["first_name"], s["last_name"], s.get("grade_level"),
+         s.get("learning_style"), s.get("completed_assessments", 0))
+        for s in students
+    ])
+    conn.executemany(UPSERT_PERFORMANCE, [
+        (s["id"], subject, score)
+        for s in students for subject, score in s.get("performance", {}).items()
+    ])
+    conn.executemany(UPSERT_ENGAGEMENT, [
+        (s["id"], subject, level)
+        for s in students for subject, level in s.get("engagement", {}).items()
+    ])
+
+def _load_students():
+    """Read the full roster from the database, seeding the demo data if empty."""
+    conn = get_connection()
+    if is_empty(conn, "students"):
+        with conn:
+            _write_students(conn, _SAMPLE_STUDENTS)
+    
+    students = []
+    by_id = {}
+    for row in conn.execute(STUDENT_COLUMNS_QUERY):
+        student = dict(row)
+        student["performance"] = {}
+        student["engagement"] = {}
+        students.append(student)
+        by_id[student["id"]] = student
+    
+    for student_id, subject, score in conn.execute(PERFORMANCE_QUERY):
+        if student_id in by_id:
+            by_id[student_id]["performance"][subject] = _score(score)
+    for student_id, subject, level in conn.execute(ENGAGEMENT_QUERY):
+        if student_id in by_id:
+            by_id[student_id]["engagement"][subject] = level
+    
+    for student in students:
+        student["performance"] = _in_subject_order(student["performance"])
+        student["engagement"] = _in_subject_order(student["engagement"])
+    
+    return students
+
+def _write_student(student):
+    """Create or replace one student record in the database."""
+    conn = get_connection()
+    with conn:
+        bump_data_version(conn, "students")
+        _write_students(conn, [student])
+
+_repository = StudentRepository(_load_students, _write_student, lambda: get_data_version("students"))
+
+def get_student_repository():
+    """
+    Get the shared student repository.
+
+    Returns:
+        The process-wide StudentRepository instance
+    """
+    return _repository
+
+@timed("data.get_all_students")
+def get_all_students():
+    """
+    Get a list of all student data.
+    
+    Returns:
+        List of student dictionaries
+    """
+    return _repository.all()
+
+@timed("data.get_student_data")
+def get_student_data(student_id):
+    """
+    Get data for a specific student.
+    
+    Args:
+        student_id: The ID of the student to retrieve
+        
+    Returns:
+        Student dictionary or None if not found
+    """
+    return _repository.get(student_id)
+
+@timed("data.get_student_names")
+def get_student_names():
+    """
+    Get the display names of all students in roster order.
+
+    Returns:
+        List of "First Last" strings
+    """
+    return _repository.names()
+
+@timed("data.get_student_id_by_name")
+def get_student_id_by_name(name):
+    """
+    Get the ID of the student with the given display name.
+
+    Args:
+        name: A "First Last" display name
+
+    Returns:
+        Student ID or None if not found
+    """
+    return _repository.get_id_by_name(name)
+
+def save_student(student):
+    """
+    Create or update a student record.
+
+    Args:
+        student: Student dictionary including an "id" key
+    """
+    _repository.save(student)
+
+def save_students(students):
+    """
+    Create or update many student records in one transaction.
+
+    Args:
+        students: Iterable of student dictionaries including an "id" key
+    """
+    conn = get_connection()
+    with conn:
+        bump_data_version(conn, "students")
+        _write_students(conn, list(students))
+    _repository.invalidate()
+
+def save_student_columns(columns):
+    """
+    Create or update many student records given as columns.
+
+    Bulk loaders use this to write a generated roster without building a
+    dictionary per student.
+
+    Args:
+        columns: Dict with equal-length "id", "first_name", "last_name",
+            "grade_level", "learning_style" and "completed_assessments"
+            sequences, and "performance" and "engagement" dicts of
+            {subject: sequence}
+    """
+    ids = list(columns["id"])
+    conn = get_connection()
+    with conn:
+        bump_data_version(conn, "students")
+        conn.executemany(UPSERT_STUDENT, zip(
+            ids, columns["first_name"], columns["last_name"], columns["grade_level"],
+            columns["learning_style"], columns["completed_assessments"]
+        ))
+        for subject, scores in columns["performance"].items():
+            conn.executemany(UPSERT_PERFORMANCE, zip(ids, [subject] * len(ids), scores))
+        for subject, levels in columns["engagement"].items():
+            conn.executemany(UPSERT_ENGAGEMENT, zip(ids, [subject] * len(ids), levels))
+    _repository.invalidate()
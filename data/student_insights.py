@@ -0,0 +1,197 @@
+import json
+import time
+from data.database import get_connection
+
+INSERT_JOB = "INSERT INTO insight_jobs (status, created_at) VALUES ('queued', ?)"
+CLAIMABLE_JOB_QUERY = """
+    SELECT id FROM insight_jobs
+    WHERE status = 'queued' OR (status = 'running' AND heartbeat_at < ?)
+    ORDER BY id LIMIT 1
+"""
+CLAIM_JOB = """
+    UPDATE insight_jobs SET status = 'running', owner = ?, heartbeat_at = ?,
+        started_at = COALESCE(started_at, ?)
+    WHERE id = ? AND (status = 'queued' OR (status = 'running' AND heartbeat_at < ?))
+"""
+JOB_QUERY = "SELECT * FROM insight_jobs WHERE id = ?"
+RECENT_JOBS_QUERY = "SELECT * FROM insight_jobs ORDER BY id DESC LIMIT ?"
+LATEST_JOB_SINCE_QUERY = "SELECT 1 FROM insight_jobs WHERE created_at >= ? LIMIT 1"
+UPDATE_JOB_PROGRESS = """
+    UPDATE insight_jobs SET cursor = ?, processed = ?, total = ?, heartbeat_at = ?
+    WHERE id = ? AND owner = ?
+"""
+HEARTBEAT_JOB = "UPDATE insight_jobs SET heartbeat_at = ? WHERE id = ? AND owner = ? AND status = 'running'"
+FINISH_JOB = "UPDATE insight_jobs SET status = ?, finished_at = ?, error = ? WHERE id = ? AND owner = ?"
+UPSERT_INSIGHT = """
+    INSERT OR REPLACE INTO student_insights
+        (student_id, job_id, version, inputs, computed_at, intervention, intervention_subject, recommendations, summary)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+INSIGHT_QUERY = "SELECT * FROM student_insights WHERE student_id = ?"
+INSIGHT_COUNT_QUERY = "SELECT COUNT(*) FROM student_insights"
+INSIGHT_INPUTS_QUERY = "SELECT student_id, inputs FROM student_insights"
+
+def create_insight_job():
+    """
+    Queue a precomputation job over every student.
+
+    Returns:
+        int: The job ID
+    """
+    conn = get_connection()
+    with conn:
+        return conn.execute(INSERT_JOB, (time.time(),)).lastrowid
+
+def claim_insight_job(owner, stale_seconds):
+    """
+    Take the oldest queued job, or a running one whose worker stopped.
+
+    Only one worker can claim a job, so every process may poll safely.
+
+    Args:
+        owner: Unique name of the claiming worker
+        stale_seconds: Heartbeat age after which a running job is taken over
+
+    Returns:
+        Job dictionary, or None if there is nothing to run
+    """
+    conn = get_connection()
+    now = time.time()
+    row = conn.execute(CLAIMABLE_JOB_QUERY, (now - stale_seconds,)).fetchone()
+    if row is None:
+        return None
+    with conn:
+        claimed = conn.execute(CLAIM_JOB, (owner, now, now, row["id"], now - stale_seconds)).rowcount
+    return get_insight_job(row["id"]) if claimed else None
+
+def get_insight_job(job_id):
+    """
+    Get a job's stored state.
+
+    Args:
+        job_id: The job ID
+
+    Returns:
+        Job dictionary or None if not found
+    """
+    row = get_connection().execute(JOB_QUERY, (job_id,)).fetchone()
+    return dict(row) if row else None
+
+def get_recent_insight_jobs(limit=10):
+    """
+    Get the most recent jobs.
+
+    Args:
+        limit: Maximum number of jobs
+
+    Returns:
+        List of job dictionaries, newest first
+    """
+    return [dict(row) for row in get_connection().execute(RECENT_JOBS_QUERY, (limit,))]
+
+def insight_job_created_since(timestamp):
+    """
+    Check whether any job was queued at or after a time.
+
+    Args:
+        timestamp: Unix time
+
+    Returns:
+        True if a job exists from that time on
+    """
+    return get_connection().execute(LATEST_JOB_SINCE_QUERY, (timestamp,)).fetchone() is not None
+
+def save_insight_batch(job_id, owner, insights, cursor, processed, total):
+    """
+    Store a batch of insights and the job's progress in one transaction.
+
+    A job resumed after a crash restarts from the last stored cursor.
+
+    Args:
+        job_id: The job ID
+        owner: Worker that claimed the job
+        insights: List of insight dictionaries with the student_insights columns
+        cursor: ID of the last student in the batch
+        processed: Students processed so far
+        total: Students in the job
+
+    Returns:
+        True if the job is still owned by this worker
+    """
+    conn = get_connection()
+    with conn:
+        owned = conn.execute(UPDATE_JOB_PROGRESS, (cursor, processed, total, time.time(), job_id, owner)).rowcount
+        if owned:
+            conn.executemany(UPSERT_INSIGHT, [
+                (insight["student_id"], job_id, insight["version"], insight["inputs"], insight["computed_at"],
+                 insight["intervention"], insight["intervention_subject"], json.dumps(insight["recommendations"]),
+                 json.dumps(insight["summary"]) if insight["summary"] is not None else None)
+                for insight in insights
+            ])
+    return bool(owned)
+
+def heartbeat_insight_job(job_id, owner):
+    """
+    Record that a job's worker is still busy, so it is not taken over as stale.
+
+    Args:
+        job_id: The job ID
+        owner: Worker that claimed the job
+
+    Returns:
+        True if the job is still running under this worker
+    """
+    conn = get_connection()
+    with conn:
+        return bool(conn.execute(HEARTBEAT_JOB, (time.time(), job_id, owner)).rowcount)
+
+def finish_insight_job(job_id, owner, status="done", error=None):
+    """
+    Mark a job as finished.
+
+    Args:
+        job_id: The job ID
+        owner: Worker that claimed the job
+        status: "done" or "failed"
+        error: Optional error message
+    """
+    conn = get_connection()
+    with conn:
+        conn.execute(FINISH_JOB, (status, time.time(), error, job_id, owner))
+
+def get_student_insight(student_id):
+    """
+    Get a student's stored insights.
+
+    Args:
+        student_id: The ID of the student
+
+    Returns:
+        Insight dictionary with decoded recommendations and summary, or
+        None if none were computed
+    """
+    row = get_connection().execute(INSIGHT_QUERY, (student_id,)).fetchone()
+    if row is None:
+        return None
+    insight = dict(row)
+    insight["recommendations"] = json.loads(insight["recommendations"])
+    insight["summary"] = json.loads(insight["summary"]) if insight["summary"] else None
+    return insight
+
+def get_insight_inputs():
+    """
+    Get the input stamp of every student's stored insights.
+
+    Returns:
+        Dict of {student_id: inputs}
+    """
+    return dict(get_connection().execute(INSIGHT_INPUTS_QUERY).fetchall())
+
+def count_student_insights():
+    """
+    Count the students with stored insights.
+
+    Returns:
+        int: Number of students
+    """
+    return get_connection().execute(INSIGHT_COUNT_QUERY).fetchone()[0]
@@ -0,0 +1,86 @@
+import streamlit as st
+from utils.adaptive_testing import get_adaptive_engine
+from utils.progress_series import SUBJECT_LABELS
+from data.item_bank import record_responses
+from data.student_data import get_student_data
+from data.progress_history import record_progress
+
+def _start_test(subject, student_data):
+    """Start a test seeded with the student's current score in the subject."""
+    score = student_data["performance"].get(subject) if student_data else None
+    st.session_state.adaptive_test = get_adaptive_engine().start(subject, score)
+    st.session_state.adaptive_test_subject = subject
+    st.session_state.adaptive_recorded = False
+
+def _record_result(test, subject):
+    """Store the item responses and the final score once per test."""
+    if st.session_state.get("adaptive_recorded"):
+        return
+    student_id = st.session_state.current_user
+    record_responses(student_id, test.responses)
+    record_progress(student_id, subject, test.result()["score"], source=f"adaptive_{subject}")
+    st.session_state.adaptive_recorded = True
+
+def show_result(test, subject):
+    """Display the ability estimate of a finished test."""
+    result = test.result()
+    st.success("Mastery check complete")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Estimated Score", f"{result['score']:.0f}%")
+    with col2:
+        st.metric("Mastery Level", f"{result['mastery']} / 10")
+    with col3:
+        st.metric("Questions", f"{result['correct']} of {result['items']} correct")
+
+    st.caption(f"Ability estimate {result['theta']:+.2f} (standard error {result['se']:.2f})")
+
+    if st.button("Take Another Check"):
+        _start_test(subject, get_student_data(st.session_state.current_user))
+        st.rerun()
+
+def app():
+    """Adaptive mastery check: one question at a time, chosen by the student's answers."""
+
+    # Check if user is authenticated and is a student
+    if not st.session_state.get('authenticated', False) or st.session_state.get('user_type') != 'student':
+        st.warning("Please log in as a student to access assessments.")
+        return
+
+    subject = st.session_state.get('adaptive_subject')
+    engine = get_adaptive_engine()
+    if subject not in engine.indexes:
+        st.info("No subject selected. Please choose one under Available Assessments.")
+        return
+
+    st.title(f"{SUBJECT_LABELS[subject]} Mastery Check")
+    st.write("Each question is chosen from your previous answers. "
+             "The check ends as soon as your level is measured precisely.")
+
+    # A running test keeps the item bank it started with, even if the bank is rebuilt meanwhile
+    test = st.session_state.get('adaptive_test')
+    if test is None or st.session_state.get('adaptive_test_subject') != subject:
+        _start_test(subject, get_student_data(st.session_state.current_user))
+        test = st.session_state.adaptive_test
+
+    if test.finished or test.current_item is None:
+        _record_result(test, subject)
+        show_result(test, subject)
+        return
+
+    item = test.current_item
+    number = len(test.administered) + 1
+    st.progress(len(test.administered) / test.max_items, text=f"Question {number} (at most {test.max_items})")
+    st.subheader(f"Question {number}")
+    st.write(item["text"])
+
+    response = st.radio("Select your answer:", item["options"], index=None, key=f"adaptive_{item['id']}")
+    if st.button("Submit Answer", type="primary", disabled=response is None):
+        grade = test.answer(response)
+        st.session_state.adaptive_feedback = grade["feedback"]
+        st.rerun()
+
+    feedback = st.session_state.pop('adaptive_feedback', None)
+    if feedback and number > 1:
+        st.caption(f"Previous question: {feedback}")
@@ -0,0 +1,592 @@
+import streamlit as st
+import random
+from utils.ai_assessment import get_assessment_engine
+from utils.styles import apply_stylesheet
+from data.sample_assessments import get_assessment_by_id
+from data.student_data import get_student_data
+from data.progress_history import record_progress
+from utils.assessment_sessions import get_session_manager
+
+# Widget keys of the single answer of essays, projects and labs
+ANSWER_KEYS = {"Essay": "essay_content", "Project": "project_content", "Lab": "project_content"}
+
+def app():
+    """Assessment page for students to take assessments and view feedback."""
+    
+    # Page styles are emitted on every run; Streamlit drops them otherwise
+    apply_stylesheet("assessment")
+    
+    # Check if user is authenticated and is a student
+    if not st.session_state.get('authenticated', False) or st.session_state.get('user_type') != 'student':
+        st.warning("Please log in as a student to access assessments.")
+        return
+    
+    # Get current assessment ID from session state or query parameters
+    assessment_id = st.session_state.get('current_assessment')
+    
+    if not assessment_id:
+        st.info("No assessment selected. Please select an assessment from the dashboard.")
+        if st.button("Return to Dashboard"):
+            st.session_state.page = "dashboard"
+            st.rerun()
+        return
+    
+    # Get assessment data
+    assessment = get_assessment_by_id(assessment_id)
+    
+    if not assessment:
+        st.error("Assessment not found.")
+        if st.button("Return to Dashboard"):
+            st.session_state.page = "dashboard"
+            st.rerun()
+        return
+    
+    # Get student data
+    student_id = st.session_state.current_user
+    student_data = get_student_data(student_id)
+    
+    # Modern page header
+    subject_color = "#4285F4" if assessment['subject'] == "Math" else "#34A853" if assessment['subject'] == "Science" else "#FBBC05" if assessment['subject'] == "Language Arts" else "#EA4335"
+    
+    st.markdown(f"""
+    <div class="assessment-header">
+        <h1>{assessment['title']}</h1>
+        <p>{assessment['description']}</p>
+        
+        <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 1.5rem; flex-wrap: wrap; gap: 1rem;">
+            <div style="background: rgba(255,255,255,0.2); padding: 0.5rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
+                <div style="font-size: 0.8rem; opacity: 0.8;">Subject</div>
+                <div style="font-size: 1.1rem; font-weight: 500;">{assessment['subject']}</div>
+            </div>
+            <div style="background: rgba(255,255,255,0.2); padding: 0.5rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
+                <div style="font-size: 0.8rem; opacity: 0.8;">Estimated Time</div>
+                <div style="font-size: 1.1rem; font-weight: 500;">{assessment['estimated_time']} minutes</div>
+            </div>
+            <div style="background: rgba(255,255,255,0.2); padding: 0.5rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
+                <div style="font-size: 0.8rem; opacity: 0.8;">Due Date</div>
+                <div style="font-size: 1.1rem; font-weight: 500;">{assessment['due_date']}</div>
+            </div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Check if assessment is already submitted
+    if st.session_state.get(f"submitted_{assessment_id}", False):
+        show_feedback(assessment, student_data)
+        return
+    
+    # Resume the student's unfinished attempt, or start a new one
+    session = get_session_manager().open(assessment, student_id, get_assessment_engine())
+    
+    # Assessment submission state
+    if st.session_state.get(f"submitting_{assessment_id}", False):
+        show_submission_progress(assessment, student_data, session)
+        return
+    
+    # Answering reruns only the input fragment; changes are autosaved
+    _assessment_inputs(assessment, session)
+    
+    # Modern submit section with progress reminders
+    st.markdown("""
+    <div style="margin: 2rem 0 1rem 0;">
+        <div style="font-weight: 500; font-size: 1.05rem; color: #333; margin-bottom: 0.5rem;">
+            Ready to Submit?
+        </div>
+        <div style="font-size: 0.9rem; color: #666; margin-bottom: 1rem;">
+            Please review all your answers carefully before submitting. Once submitted, you cannot make changes.
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Submit button with modern styling
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        # Cancel button (secondary style)
+        if st.button("Cancel and Return to Dashboard", type="secondary", use_container_width=True):
+            st.session_state.page = "dashboard"
+            st.rerun()
+    
+    with col2:
+        # Submit button (primary style)
+        submit_button = st.button("Submit Assessment", type="primary", use_container_width=True)
+    
+    if submit_button:
+        # Widgets still at their default value never fired a change callback
+        _sync_answers(session)
+        st.session_state[f"submitting_{assessment_id}"] = True
+        st.rerun()
+
+def _answer_keys(assessment):
+    """Widget keys of an assessment's answers, in question order."""
+    if assessment['type'] in ["Quiz", "Test"]:
+        return [f"q{i}" for i in range(len(assessment.get('questions', [])))]
+    return [ANSWER_KEYS.get(assessment['type'], "project_content")]
+
+def _restore_answer(key, saved, options=None):
+    """Put a resumed answer back into its widget before the widget is drawn."""
+    if key not in st.session_state and saved is not None and (options is None or saved in options):
+        st.session_state[key] = saved
+
+def _save_answer(session, index, key):
+    """Widget callback: record a changed answer in the assessment session."""
+    session.set_answer(index, st.session_state[key])
+
+def _sync_answers(session):
+    """Record every widget's current value; unchanged answers are skipped."""
+    for index, key in enumerate(_answer_keys(session.assessment)):
+        if key in st.session_state:
+            session.set_answer(index, st.session_state[key])
+
+@st.fragment
+def _assessment_inputs(assessment, session):
+    """Draw the questions or the submission field of an assessment."""
+    
+    if assessment['type'] in ["Quiz", "Test"]:
+        # Modern section header for questions
+        st.markdown("""
+        <h2 style="display: flex; align-items: center; margin: 1.5rem 0 1.2rem 0;">
+            <span style="background-color: #4B8BF4; color: white; height: 32px; width: 32px; 
+                border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; 
+                margin-right: 0.5rem; font-size: 1rem;">❓</span>
+            Assessment Questions
+        </h2>
+        """, unsafe_allow_html=True)
+        
+        # Display quiz/test questions with enhanced styling
+        questions = assessment.get('questions', [])
+        
+        for i, question in enumerate(questions):
+            # Modern question card
+            st.markdown(f"""
+            <div class="question-card">
+                <div class="question-number">Question {i+1}</div>
+                <div style="font-size: 1rem; margin-bottom: 1rem; color: #333;">{question['text']}</div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if question['type'] == "multiple_choice":
+                options = question['options']
+                _restore_answer(f"q{i}", session.answer(i), options)
+                st.radio(
+                    "Select your answer:",
+                    options,
+                    key=f"q{i}",
+                    on_change=_save_answer,
+                    args=(session, i, f"q{i}")
+                )
+            elif question['type'] == "true_false":
+                _restore_answer(f"q{i}", session.answer(i), ["True", "False"])
+                st.radio(
+                    "Select your answer:",
+                    ["True", "False"],
+                    key=f"q{i}",
+                    on_change=_save_answer,
+                    args=(session, i, f"q{i}")
+                )
+            elif question['type'] == "short_answer":
+                _restore_answer(f"q{i}", session.answer(i))
+                st.text_area(
+                    "Your answer:",
+                    height=120,
+                    key=f"q{i}",
+                    help="Write a concise answer focused on the key points.",
+                    on_change=_save_answer,
+                    args=(session, i, f"q{i}")
+                )
+    
+    elif assessment['type'] == "Essay":
+        # Modern essay section header
+        st.markdown("""
+        <h2 style="display: flex; align-items: center; margin: 1.5rem 0 1.2rem 0;">
+            <span style="background-color: #4B8BF4; color: white; height: 32px; width: 32px; 
+                border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; 
+                margin-right: 0.5rem; font-size: 1rem;">📝</span>
+            Essay Assignment
+        </h2>
+        """, unsafe_allow_html=True)
+        
+        # Essay prompt in a card
+        prompt = assessment.get('prompt', 'Write your essay below.')
+        word_min = assessment.get('word_count_min', 500)
+        word_max = assessment.get('word_count_max', 1000)
+        
+        st.markdown(f"""
+        <div class="question-card">
+            <div style="font-weight: 600; font-size: 1.05rem; margin-bottom: 0.8rem; color: #333;">Essay Prompt</div>
+            <div style="font-size: 1rem; margin-bottom: 1rem; color: #333;">{prompt}</div>
+            <div style="background-color: #f8f9fa; border-radius: 0.5rem; padding: 0.8rem; font-size: 0.9rem; color: #555;">
+                <div style="display: flex; align-items: center;">
+                    <span style="color: #4B8BF4; margin-right: 0.5rem;">ℹ️</span> 
+                    <span>Word count requirement: <strong>{word_min}-{word_max} words</strong></span>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Essay text area
+        _restore_answer("essay_content", session.answer())
+        essay_text = st.text_area(
+            "Your essay:",
+            height=300,
+            key="essay_content",
+            help="Write a well-structured essay that addresses all aspects of the prompt.",
+            on_change=_save_answer,
+            args=(session, 0, "essay_content")
+        )
+        
+        # Word count display with modern styling
+        if essay_text:
+            word_count = len(essay_text.split())
+            
+            # Color based on whether count is within range
+            count_color = "#34A853" if word_min <= word_count <= word_max else "#FBBC05" if word_count < word_min else "#EA4335"
+            
+            # Visualize progress toward word count
+            progress_pct = min(100, int((word_count / word_min) * 100)) if word_count < word_min else 100
+            
+            st.markdown(f"""
+            <div style="margin: 1rem 0;">
+                <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+                    <div style="font-size: 0.9rem; color: #555;">Word Count:</div>
+                    <div style="font-weight: 600; color: {count_color};">{word_count}/{word_min}-{word_max}</div>
+                </div>
+                <div class="timer-bar">
+                    <div class="timer-progress" style="width: {progress_pct}%; background-color: {count_color};"></div>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            
+            if word_count < word_min:
+                st.warning(f"Your essay is {word_min - word_count} words below the minimum requirement.")
+            elif word_count > word_max:
+                st.warning(f"Your essay is {word_count - word_max} words above the maximum limit.")
+            else:
+                st.success(f"Your word count is within the required range.")
+    
+    elif assessment['type'] in ["Project", "Lab"]:
+        # Modern project/lab section header
+        st.markdown("""
+        <h2 style="display: flex; align-items: center; margin: 1.5rem 0 1.2rem 0;">
+            <span style="background-color: #4B8BF4; color: white; height: 32px; width: 32px; 
+                border-radius: 50%; display: inline-flex; align-items: center; justify-content: center; 
+                margin-right: 0.5rem; font-size: 1rem;">🔬</span>
+            Project Submission
+        </h2>
+        """, unsafe_allow_html=True)
+        
+        # Project instructions in a card
+        instructions = assessment.get('instructions', 'Complete the project according to the requirements.')
+        deliverables = assessment.get('deliverables', 'Submit your completed work below.')
+        
+        st.markdown(f"""
+        <div class="question-card">
+            <div style="font-weight: 600; font-size: 1.05rem; margin-bottom: 0.8rem; color: #333;">Project Instructions</div>
+            <div style="font-size: 1rem; margin-bottom: 1.2rem; color: #333;">{instructions}</div>
+            
+            <div style="font-weight: 600; font-size: 1.05rem; margin-bottom: 0.8rem; color: #333;">Deliverables</div>
+            <div style="font-size: 1rem; margin-bottom: 1rem; color: #333;">{deliverables}</div>
+            
+            <div style="background-color: #e8f0fe; border-radius: 0.5rem; padding: 0.8rem; font-size: 0.9rem; color: #555; border-left: 3px solid #4285F4;">
+                <div style="display: flex; align-items: center;">
+                    <span style="color: #4285F4; margin-right: 0.5rem;">💡</span> 
+                    <span>Your submission should demonstrate your understanding of key concepts and your ability to apply them to solve real-world problems.</span>
+                </div>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Section for project description/report
+        st.markdown("""
+        <div style="margin: 1.5rem 0 1rem 0;">
+            <div style="font-weight: 500; font-size: 1.05rem; color: #333;">Project Report</div>
+            <div style="font-size: 0.9rem; color: #666; margin-bottom: 0.5rem;">
+                Describe your approach, methodology, and key findings.
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Text submission with improved styling
+        _restore_answer("project_content", session.answer())
+        st.text_area(
+            "Project Description / Lab Report:",
+            height=250,
+            key="project_content",
+            help="Include your methodology, findings, and conclusions. Be specific about how you approached the problem.",
+            on_change=_save_answer,
+            args=(session, 0, "project_content")
+        )
+        
+        # File upload section with modern styling
+        st.markdown("""
+        <div style="margin: 1.5rem 0 1rem 0;">
+            <div style="font-weight: 500; font-size: 1.05rem; color: #333;">Project Files</div>
+            <div style="font-size: 0.9rem; color: #666; margin-bottom: 0.5rem;">
+                Upload any relevant files, such as code, data, or presentations.
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # File upload (in a real app - here we'll just simulate)
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            upload_file = st.file_uploader(
+                "Upload your project files (simulation only)",
+                type=["pdf", "docx", "txt", "zip", "py", "ipynb", "csv"],
+                key="project_file"
+            )
+        
+        # Show uploaded file with better styling
+        if upload_file:
+            st.markdown(f"""
+            <div style="background-color: #f8f9fa; border-radius: 0.5rem; padding: 0.8rem; 
+                margin-top: 0.5rem; font-size: 0.9rem; border-left: 3px solid #34A853;">
+                <div style="display: flex; align-items: center;">
+                    <span style="color: #34A853; margin-right: 0.5rem;">✅</span> 
+                    <span>File <strong>{upload_file.name}</strong> uploaded successfully</span>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    if session.questions:
+        st.caption(f"{session.answered_count} of {len(session.questions)} questions answered. Your answers are saved automatically.")
+    else:
+        st.caption("Your work is saved automatically.")
+
+def show_submission_progress(assessment, student_data, session):
+    """Grade a submitted attempt, showing each stage as it completes."""
+    
+    # Create a visually appealing submission process
+    st.markdown(f"""
+    <div class="assessment-header">
+        <h1>Processing Your Assessment</h1>
+        <p>Our AI is analyzing your submission and preparing personalized feedback</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Modern progress card
+    st.markdown("""
+    <div class="assessment-card">
+        <div style="font-weight: 600; margin-bottom: 1rem; font-size: 1.1rem; color: #333;">
+            Assessment Evaluation in Progress
+        </div>
+    """, unsafe_allow_html=True)
+    
+    # Show progress bar with modern styling
+    progress_bar = st.progress(0)
+    
+    def complete_stage(percent, message, icon):
+        """Advance the progress bar and show a stage completion message."""
+        progress_bar.progress(percent)
+        st.markdown(f"""
+        <div style="display: flex; align-items: center; margin: 0.8rem 0;">
+            <div style="background-color: #4B8BF4; color: white; height: 32px; width: 32px; 
+                border-radius: 50%; display: flex; align-items: center; justify-content: center; 
+                margin-right: 0.8rem; font-size: 1.2rem;">{icon}</div>
+            <div style="color: #333;">{message}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # The stages follow the actual work; quiz answers were graded as they
+    # arrived, so only what is left is graded here
+    assessment_id = assessment['id']
+    session.flush()
+    complete_stage(30, "Validating your submission", "🔍")
+    
+    ai_engine = get_assessment_engine()
+    
+    if assessment['type'] in ["Quiz", "Test"]:
+        # Objective items are graded locally; only uncertain short answers reach the LLM
+        result = session.evaluate()
+    
+    elif assessment['type'] == "Essay":
+        essay_text = session.answer() or ""
+        prompt = assessment.get('prompt', '')
+        criteria = assessment.get('criteria', 'Content (30%)\nOrganization (25%)\nLanguage (25%)\nCritical Thinking (20%)')
+        
+        result = ai_engine.evaluate_essay(
+            essay_text, prompt, criteria,
+            word_min=assessment.get('word_count_min'),
+            word_max=assessment.get('word_count_max'),
+            student_id=st.session_state.get('current_user')
+        )
+    
+    elif assessment['type'] in ["Project", "Lab"]:
+        # For projects/labs, simulate a more general evaluation
+        # Generate a simple score between 70-95
+        score = random.randint(70, 95)
+        
+        # Store a simplified result
+        result = {
+            "score": score,
+            "feedback": "Your project demonstrates good understanding of the core concepts. The implementation is functional and meets most of the requirements. Consider adding more detail to your documentation and explanation of your approach."
+        }
+    
+    else:
+        result = {"score": 0}
+    
+    st.session_state[f"result_{assessment_id}"] = result
+    complete_stage(60, "Running AI assessment", "🧠")
+    
+    # Essay results report "overall_score"; other assessment types report "score"
+    score = result.get("score", result.get("overall_score", 0))
+    
+    # Generate personalized recommendations
+    assessment_results = {
+        assessment_id: {
+            "score": score,
+            "subject": assessment['subject']
+        }
+    }
+    
+    st.session_state[f"recommendations_{assessment_id}"] = ai_engine.generate_personalized_feedback(
+        assessment_results, student_data
+    )
+    complete_stage(90, "Generating personalized feedback", "📊")
+    
+    # Store the submission and add the result to the student's progress history
+    get_session_manager().submit(session, score, result)
+    if st.session_state.get('current_user'):
+        record_progress(
+            st.session_state.current_user,
+            assessment['subject'].lower().replace(" ", "_"),
+            score,
+            source=assessment_id
+        )
+    complete_stage(100, "Finalizing results", "✅")
+    
+    # Close the assessment card div
+    st.markdown("""
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Mark as submitted
+    st.session_state[f"submitted_{assessment_id}"] = True
+    
+    st.success("Assessment submitted successfully!")
+    st.rerun()
+
+def show_feedback(assessment, student_data):
+    """Display feedback for a submitted assessment."""
+    
+    assessment_id = assessment['id']
+    result = st.session_state.get(f"result_{assessment_id}", {})
+    recommendations = st.session_state.get(f"recommendations_{assessment_id}", {})
+    
+    st.success("Assessment Submitted")
+    
+    # Display score
+    # Essay results report "overall_score"; other assessment types report "score"
+    score = result.get("score", result.get("overall_score", 0))
+    st.subheader("Your Result")
+    
+    col1, col2 = st.columns([1, 2])
+    
+    with col1:
+        # Display score as a gauge
+        import plotly.graph_objects as go
+        
+        fig = go.Figure(go.Indicator(
+            mode="gauge+number",
+            value=score,
+            domain={'x': [0, 1], 'y': [0, 1]},
+            title={'text': "Score"},
+            gauge={
+                'axis': {'range': [0, 100]},
+                'bar': {'color': "#4B8BF4"},
+                'steps': [
+                    {'range': [0, 60], 'color': "#FF6B6B"},
+                    {'range': [60, 80], 'color': "#FFD166"},
+                    {'range': [80, 100], 'color': "#06D6A0"}
+                ],
+                'threshold': {
+                    'line': {'color': "red", 'width': 4},
+                    'thickness': 0.75,
+                    'value': 70
+                }
+            }
+        ))
+        
+        fig.update_layout(
+            height=300,
+            margin=dict(l=20, r=20, t=50, b=20),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)'
+        )
+        
+        st.plotly_chart(fig)
+    
+    with col2:
+        # Show detailed feedback based on assessment type
+        st.subheader("Feedback")
+        
+        if assessment['type'] in ["Quiz", "Test"]:
+            st.write(f"**Score:** {score}%")
+            st.write(f"**Correct Answers:** {result.get('correct_count', 0)}/{result.get('total_questions', 0)}")
+            
+            # Display feedback for each question
+            feedback = result.get("feedback", {})
+            for question_id, question_feedback in feedback.items():
+                with st.expander(f"Question {question_id[1:]}"):
+                    st.write(question_feedback)
+        
+        elif assessment['type'] == "Essay":
+            st.write(f"**Overall Score:** {score}%")
+            
+            # Display criteria scores
+            criteria_scores = result.get("criteria_scores", {})
+            for criterion, criterion_score in criteria_scores.items():
+                st.write(f"**{criterion}:** {criterion_score}%")
+            
+            # Display detailed feedback
+            st.subheader("Detailed Feedback")
+            st.write(result.get("detailed_feedback", "No detailed feedback available."))
+        
+        elif assessment['type'] in ["Project", "Lab"]:
+            st.write(f"**Score:** {score}%")
+            st.write(result.get("feedback", "No feedback available."))
+    
+    # Personalized recommendations section
+    st.subheader("Personalized Recommendations")
+    
+    # Strengths
+    if recommendations.get("strengths"):
+        st.write("**Strengths:**")
+        for strength in recommendations["strengths"]:
+            st.success(strength)
+    
+    # Areas for improvement
+    if recommendations.get("areas_for_improvement"):
+        st.write("**Areas for Improvement:**")
+        for area in recommendations["areas_for_improvement"]:
+            st.info(area)
+    
+    # Recommendations
+    if recommendations.get("recommendations"):
+        st.write("**Recommended Next Steps:**")
+        for recommendation in recommendations["recommendations"]:
+            st.write(f"- {recommendation}")
+    
+    # Option to retake or return to dashboard
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("Retake Assessment"):
+            # Reset assessment state
+            del st.session_state[f"submitted_{assessment_id}"]
+            del st.session_state[f"submitting_{assessment_id}"]
+            if f"result_{assessment_id}" in st.session_state:
+                del st.session_state[f"result_{assessment_id}"]
+            if f"recommendations_{assessment_id}" in st.session_state:
+                del st.session_state[f"recommendations_{assessment_id}"]
+            # The next visit starts a new attempt, so clear the old answers
+            for key in _answer_keys(assessment):
+                st.session_state.pop(key, None)
+            st.rerun()
+    
+    with col2:
+        if st.button("Return to Dashboard"):
+            st.session_state.page = "dashboard"
+            st.rerun()
+
+if __name__ == "__main__":
+    app()
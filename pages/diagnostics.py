@@ -0,0 +1,61 @@
+import streamlit as st
+from utils.metrics import get_metrics_registry, export_metrics
+from utils.resources import check_health
+
+# Span name prefixes shown as separate sections, in page order
+SPAN_AREAS = [
+    ("render", "Page Renders"),
+    ("data", "Data Access"),
+    ("grading", "Grading"),
+    ("llm", "LLM Calls"),
+    ("chart", "Chart Building"),
+]
+
+def _span_rows(snapshot, prefix):
+    """Table rows of the spans under a prefix, slowest p95 first."""
+    rows = [
+        {
+            "Span": name[len(prefix) + 1:],
+            "Calls": summary["count"],
+            "Mean (ms)": summary.get("mean_ms"),
+            "p50 (ms)": summary.get("p50_ms"),
+            "p95 (ms)": summary.get("p95_ms"),
+            "Max (ms)": summary.get("max_ms"),
+            "Total (s)": round(summary["sum_seconds"], 3)
+        }
+        for name, summary in snapshot.items() if name.startswith(f"{prefix}.")
+    ]
+    return sorted(rows, key=lambda row: row["p95 (ms)"] or 0, reverse=True)
+
+def app():
+    """Display the timing spans and resource health of this worker process."""
+    st.title("Diagnostics")
+    registry = get_metrics_registry()
+    snapshot = registry.snapshot()
+    st.caption("Timings of this worker process. Percentiles cover each span's most recent "
+               f"{registry.window} calls; call counts and totals cover the whole process lifetime.")
+
+    if not snapshot:
+        st.info("No spans recorded yet. Open a few pages and come back.")
+    for prefix, title in SPAN_AREAS:
+        rows = _span_rows(snapshot, prefix)
+        if rows:
+            st.subheader(title)
+            st.dataframe(rows, hide_index=True, use_container_width=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("Download Prometheus Metrics", registry.to_prometheus(), file_name="edututor_metrics.prom",
+                           mime="text/plain", use_container_width=True)
+    with col2:
+        st.download_button("Download JSON Metrics", registry.to_json(), file_name="edututor_metrics.json",
+                           mime="application/json", use_container_width=True)
+    with col3:
+        if st.button("Reset Timings", use_container_width=True):
+            registry.reset()
+            st.rerun()
+    if export_metrics(force=True):
+        st.caption("Metrics file updated.")
+
+    with st.expander("Shared Resources"):
+        st.json(check_health())
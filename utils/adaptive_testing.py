@@ -0,0 +1,261 @@
+import os
+import math
+import threading
+import numpy as np
+from data.item_bank import get_items, get_bank_version
+from utils.offline_grading import grade_objective
+from utils.resources import register_resource
+
+# Ability values the posterior is evaluated on; abilities are reported on
+# the same logistic scale as the item difficulties
+THETA_GRID = np.linspace(-4.0, 4.0, 81)
+
+# Scaling constant that makes the logistic curve match the normal ogive
+SCALE = 1.7
+
+DEFAULT_TARGET_SE = 0.3
+DEFAULT_MAX_ITEMS = 20
+DEFAULT_MIN_ITEMS = 5
+PRIOR_SD = 1.0
+
+def score_to_theta(score):
+    """
+    Map a 0-100 score onto the ability scale.
+
+    Args:
+        score: Score between 0 and 100
+
+    Returns:
+        float: Ability estimate, clipped to the grid
+    """
+    share = min(max(float(score), 1.0), 99.0) / 100
+    return float(np.clip(math.log(share / (1 - share)) / SCALE, THETA_GRID[0], THETA_GRID[-1]))
+
+def theta_to_score(theta):
+    """
+    Map an ability estimate onto a 0-100 score (inverse of score_to_theta).
+
+    Args:
+        theta: Ability estimate
+
+    Returns:
+        float: Score between 0 and 100
+    """
+    return 100 / (1 + math.exp(-SCALE * theta))
+
+class ItemBankIndex:
+    """
+    Precomputed three-parameter logistic model of one subject's items.
+
+    The response log-likelihoods and Fisher information of every item are
+    evaluated once on THETA_GRID, and the items are ordered by information
+    at each grid point, so updating an ability estimate is one vector add
+    and picking the next item is a walk down a precomputed list.
+    """
+
+    def __init__(self, items):
+        """
+        Build the index.
+
+        Args:
+            items: List of item dictionaries from get_items()
+        """
+        self.items = items
+        a = np.array([item["discrimination"] for item in items], dtype=float)
+        b = np.array([item["difficulty"] for item in items], dtype=float)
+        c = np.array([item["guessing"] for item in items], dtype=float)
+
+        # Grid points are rows, items are columns
+        logistic = 1 / (1 + np.exp(-SCALE * a * (THETA_GRID[:, None] - b)))
+        p = np.clip(c + (1 - c) * logistic, 1e-9, 1 - 1e-9)
+        self.log_p = np.log(p)
+        self.log_q = np.log1p(-p)
+        self.information = (SCALE * a) ** 2 * ((p - c) / (1 - c)) ** 2 * (1 - p) / p
+        self.order = np.argsort(-self.information, axis=1, kind="stable")
+
+    def __len__(self):
+        return len(self.items)
+
+    def next_item(self, theta, administered):
+        """
+        Pick the most informative item not given yet.
+
+        Args:
+            theta: Current ability estimate
+            administered: Set of item positions already given
+
+        Returns:
+            Item position, or None when every item has been given
+        """
+        point = int(np.abs(THETA_GRID - theta).argmin())
+        for position in self.order[point]:
+            if position not in administered:
+                return int(position)
+        return None
+
+class AdaptiveTest:
+    """
+    One student's adaptive test in a subject.
+
+    The ability posterior is kept as log values on THETA_GRID and updated
+    with each scored response; the estimate is its mean (EAP) and the
+    standard error its standard deviation. The test ends once the
+    standard error reaches the target, or after the maximum number of items.
+    """
+
+    def __init__(self, index, prior_theta=0.0, target_se=DEFAULT_TARGET_SE,
+                 max_items=DEFAULT_MAX_ITEMS, min_items=DEFAULT_MIN_ITEMS):
+        """
+        Start the test.
+
+        Args:
+            index: ItemBankIndex of the subject
+            prior_theta: Starting ability estimate (e.g. from past scores)
+            target_se: Standard error at which the estimate is precise enough
+            max_items: Most items given
+            min_items: Fewest items given before stopping on precision
+        """
+        self.index = index
+        self.target_se = target_se
+        self.max_items = min(max_items, len(index))
+        self.min_items = min_items
+        self.log_posterior = -0.5 * ((THETA_GRID - prior_theta) / PRIOR_SD) ** 2
+        self.administered = []
+        self.responses = []
+        self._given = set()
+        self._estimate()
+        self.current = None if self.finished else self.index.next_item(self.theta, self._given)
+
+    def _estimate(self):
+        """Recompute the EAP estimate and its standard error."""
+        weights = np.exp(self.log_posterior - self.log_posterior.max())
+        weights /= weights.sum()
+        self.theta = float(weights @ THETA_GRID)
+        self.se = float(np.sqrt(weights @ (THETA_GRID - self.theta) ** 2))
+
+    @property
+    def current_item(self):
+        """The item to answer next, or None when the test is finished."""
+        return None if self.current is None else self.index.items[self.current]
+
+    @property
+    def finished(self):
+        """True once the estimate is precise enough or no items are left."""
+        count = len(self.administered)
+        if count >= self.max_items:
+            return True
+        return count >= self.min_items and self.se <= self.target_se
+
+    def answer(self, response):
+        """
+        Score the answer to the current item and update the estimate.
+
+        Args:
+            response: The student's answer
+
+        Returns:
+            Grading dict from grade_objective()
+        """
+        position = self.current
+        grade = grade_objective(self.index.items[position], response)
+        correct = grade["correct"]
+
+        self.responses.append((self.index.items[position]["id"], correct, self.theta))
+        self.administered.append(position)
+        self._given.add(position)
+        self.log_posterior = self.log_posterior + (self.index.log_p[:, position] if correct
+                                                   else self.index.log_q[:, position])
+        self._estimate()
+
+        self.current = None if self.finished else self.index.next_item(self.theta, self._given)
+        return grade
+
+    def result(self):
+        """
+        Summarize the test.
+
+        Returns:
+            Dict with theta, se, score (0-100), mastery (0-10), items
+            (number given) and correct (number right)
+        """
+        score = theta_to_score(self.theta)
+        return {
+            "theta": self.theta,
+            "se": self.se,
+            "score": score,
+            "mastery": min(int(score // 10), 10),
+            "items": len(self.administered),
+            "correct": sum(correct for _, correct, _ in self.responses)
+        }
+
+class AdaptiveTestingEngine:
+    """Starts adaptive tests from per-subject item bank indexes."""
+
+    def __init__(self, items, target_se=DEFAULT_TARGET_SE, max_items=DEFAULT_MAX_ITEMS):
+        """
+        Build the indexes.
+
+        Args:
+            items: List of item dictionaries from get_items()
+            target_se: Standard error at which tests stop
+            max_items: Most items given per test
+        """
+        self.target_se = target_se
+        self.max_items = max_items
+        by_subject = {}
+        for item in items:
+            by_subject.setdefault(item["subject"], []).append(item)
+        self.indexes = {subject: ItemBankIndex(rows) for subject, rows in by_subject.items()}
+
+    @property
+    def subjects(self):
+        """Subject keys that have items."""
+        return list(self.indexes)
+
+    def start(self, subject, score=None):
+        """
+        Start an adaptive test.
+
+        Args:
+            subject: Subject key (e.g. "math")
+            score: Optional current score (0-100) in the subject, used as
+                the starting estimate
+
+        Returns:
+            AdaptiveTest instance
+        """
+        prior = score_to_theta(score) if score is not None else 0.0
+        return AdaptiveTest(self.indexes[subject], prior, self.target_se, self.max_items)
+
+_engine = None
+_engine_version = None
+_engine_lock = threading.Lock()
+
+def get_adaptive_engine():
+    """
+    Get the adaptive testing engine shared by all sessions.
+
+    The engine is rebuilt when the item bank changes. The stopping rule is
+    read from EDUTUTOR_CAT_TARGET_SE and EDUTUTOR_CAT_MAX_ITEMS.
+
+    Returns:
+        AdaptiveTestingEngine instance
+    """
+    global _engine, _engine_version
+    version = get_bank_version()
+    if _engine is None or _engine_version != version:
+        with _engine_lock:
+            if _engine is None or _engine_version != version:
+                _engine = AdaptiveTestingEngine(
+                    get_items(),
+                    target_se=float(os.environ.get("EDUTUTOR_CAT_TARGET_SE", DEFAULT_TARGET_SE)),
+                    max_items=int(os.environ.get("EDUTUTOR_CAT_MAX_ITEMS", DEFAULT_MAX_ITEMS))
+                )
+                _engine_version = version
+    return _engine
+
+register_resource(
+    "adaptive_engine",
+    get_adaptive_engine,
+    health=lambda engine: {subject: len(index) for subject, index in engine.indexes.items()}
+)
@@ -0,0 +1,263 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from data.assessment_attempts import SUBMITTED, find_open_attempt, start_attempt, save_answers, close_attempt
+from data.sample_assessments import record_submission
+from utils.resources import register_resource
+
+# Assessment types answered question by question; the others have one text answer
+QUESTION_TYPES = ("Quiz", "Test")
+
+DEFAULT_AUTOSAVE_SECONDS = 2.0
+DEFAULT_MAX_SESSIONS = 1024
+
+class AssessmentSession:
+    """
+    One student's attempt at an assessment.
+
+    Answers are held in a list indexed by question; essays and projects use
+    a single slot for their text. Quiz answers are graded locally as they
+    arrive, so submitting only has to grade short answers that need the
+    LLM, whatever the length of the test. Changed answers are batched and
+    written to the database at most once per autosave interval, and an
+    unfinished attempt is resumed from there after a reconnect.
+    """
+
+    def __init__(self, attempt_id, assessment, student_id, engine, answers=None,
+                 autosave_seconds=DEFAULT_AUTOSAVE_SECONDS):
+        """
+        Initialize the session.
+
+        Args:
+            attempt_id: ID of the stored attempt
+            assessment: Assessment dictionary
+            student_id: The ID of the student
+            engine: AIAssessmentEngine used for grading
+            answers: Optional dict of {question index: answer} to resume from
+            autosave_seconds: Longest time a changed answer waits to be saved
+        """
+        self.attempt_id = attempt_id
+        self.assessment = assessment
+        self.student_id = student_id
+        self.engine = engine
+        self.autosave_seconds = autosave_seconds
+        self.questions = assessment.get("questions", []) if assessment["type"] in QUESTION_TYPES else []
+
+        size = max(1, len(self.questions))
+        self.answers = [None] * size
+        self._grades = [None] * size
+        self._pending = {}
+        self._timer = None
+        self._lock = threading.Lock()
+        # Serializes writes so an older batch can never land after a newer one
+        self._save_lock = threading.Lock()
+
+        for index, answer in (answers or {}).items():
+            if 0 <= index < size:
+                self.answers[index] = answer
+                self._grade(index)
+
+    def _grade(self, index):
+        """Grade a quiz answer locally; answers the LLM must grade stay None."""
+        if self.questions:
+            answer = self.answers[index]
+            self._grades[index] = self.engine.grade_locally(self.questions[index], answer if answer is not None else "")
+
+    def set_answer(self, index, answer):
+        """
+        Record an answer.
+
+        Args:
+            index: Question index (0 for essays and projects)
+            answer: The answer text or selected option
+
+        Returns:
+            True if the answer changed
+        """
+        with self._lock:
+            if self.answers[index] == answer:
+                return False
+            self.answers[index] = answer
+            self._pending[index] = answer
+            self._grade(index)
+            if self._timer is None:
+                self._timer = threading.Timer(self.autosave_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return True
+
+    def answer(self, index=0):
+        """
+        Get a recorded answer.
+
+        Args:
+            index: Question index (0 for essays and projects)
+
+        Returns:
+            The answer, or None if the question has not been answered
+        """
+        return self.answers[index]
+
+    @property
+    def answered_count(self):
+        """Number of questions with an answer."""
+        return sum(answer is not None for answer in self.answers)
+
+    def flush(self):
+        """Write the answers changed since the last save to the database."""
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                pending, self._pending = self._pending, {}
+            try:
+                save_answers(self.attempt_id, pending)
+            except Exception:
+                # Keep the unsaved answers for the next save, unless they changed again
+                with self._lock:
+                    for index, answer in pending.items():
+                        self._pending.setdefault(index, answer)
+                raise
+
+    def evaluate(self):
+        """
+        Grade a quiz or test attempt.
+
+        Questions graded as their answers arrived are not graded again.
+
+        Returns:
+            Dict from AIAssessmentEngine.evaluate_questions()
+        """
+        with self._lock:
+            answers = {f"q{i}": answer if answer is not None else "" for i, answer in enumerate(self.answers)}
+            graded = {i: grade for i, grade in enumerate(self._grades) if grade is not None}
+        return self.engine.evaluate_questions(self.questions, answers, graded)
+
+    def submit(self, score, result):
+        """
+        Save the final answers and the graded result, closing the attempt.
+
+        Args:
+            score: Overall score (0-100)
+            result: Grading result dictionary
+
+        Returns:
+            The ID of the stored submission
+        """
+        self.flush()
+        content = json.dumps(self.answers) if self.questions else self.answers[0]
+        submission_id = record_submission(self.assessment["id"], self.student_id, score, content, result)
+        close_attempt(self.attempt_id, SUBMITTED, submission_id)
+        return submission_id
+
+class SessionManager:
+    """
+    Open assessment sessions shared by all Streamlit sessions.
+
+    A session is found by (student, assessment), so a reconnecting browser
+    gets the attempt it left, with no dependence on st.session_state.
+    """
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, autosave_seconds=DEFAULT_AUTOSAVE_SECONDS):
+        """
+        Initialize the manager.
+
+        Args:
+            max_sessions: Maximum number of sessions kept in memory
+            autosave_seconds: Autosave interval of new sessions
+        """
+        self.max_sessions = max_sessions
+        self.autosave_seconds = autosave_seconds
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, assessment, student_id, engine):
+        """
+        Get a student's session for an assessment, resuming or starting one.
+
+        Args:
+            assessment: Assessment dictionary
+            student_id: The ID of the student
+            engine: AIAssessmentEngine used for grading
+
+        Returns:
+            AssessmentSession instance
+        """
+        key = (student_id, assessment["id"])
+        evicted = []
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                found = find_open_attempt(assessment["id"], student_id)
+                if found:
+                    attempt_id, answers = found
+                else:
+                    attempt_id, answers = start_attempt(assessment["id"], student_id), {}
+                session = AssessmentSession(attempt_id, assessment, student_id, engine, answers,
+                                            self.autosave_seconds)
+                self._sessions[key] = session
+                while len(self._sessions) > self.max_sessions:
+                    evicted.append(self._sessions.popitem(last=False)[1])
+            self._sessions.move_to_end(key)
+        # Evicted sessions are saved and can be resumed from the database
+        for old in evicted:
+            old.flush()
+        return session
+
+    def submit(self, session, score, result):
+        """
+        Submit a session and forget it.
+
+        Args:
+            session: AssessmentSession to submit
+            score: Overall score (0-100)
+            result: Grading result dictionary
+
+        Returns:
+            The ID of the stored submission
+        """
+        submission_id = session.submit(score, result)
+        with self._lock:
+            key = (session.student_id, session.assessment["id"])
+            if self._sessions.get(key) is session:
+                del self._sessions[key]
+        return submission_id
+
+    def flush_all(self):
+        """Save the pending answers of every open session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            session.flush()
+
+    def __len__(self):
+        return len(self._sessions)
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_session_manager():
+    """
+    Get the assessment session manager shared by all sessions.
+
+    The autosave interval is read from EDUTUTOR_AUTOSAVE_SECONDS.
+
+    Returns:
+        SessionManager instance
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = SessionManager(
+                    autosave_seconds=float(os.environ.get("EDUTUTOR_AUTOSAVE_SECONDS", DEFAULT_AUTOSAVE_SECONDS))
+                )
+    return _manager
+
+register_resource(
+    "assessment_sessions",
+    get_session_manager,
+    health=lambda manager: {"open_sessions": len(manager)}
+)
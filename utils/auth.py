@@ -0,0 +1,302 @@
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import secrets
+import threading
+from collections import OrderedDict
+from data.credentials import (get_password_hash, set_password_hash, count_users, revoke_token,
+                              is_token_revoked, get_or_create_secret)
+from utils.resources import register_resource
+
+# scrypt cost: memory and time grow with N (a power of two); r and p as recommended
+DEFAULT_SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+DEFAULT_TOKEN_TTL_SECONDS = 12 * 3600
+# Cached tokens are checked against revocations from other workers this often
+DEFAULT_RECHECK_SECONDS = 60
+DEFAULT_CACHE_SIZE = 4096
+
+# Demo logins shown on the login screen; set EDUTUTOR_DEMO_LOGINS=0 to disable
+DEMO_PASSWORDS = {"student": "password", "teacher": "teacher"}
+DEMO_TEACHER_IDS = ["T1001"]
+
+def _b64encode(data):
+    """Unpadded URL-safe base64 of bytes."""
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+def _b64decode(text):
+    """Bytes of unpadded URL-safe base64 text."""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+def _scrypt(password, salt, n):
+    """Derive the scrypt key of a password."""
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=SCRYPT_R, p=SCRYPT_P,
+                          maxmem=256 * SCRYPT_R * (n + 2), dklen=KEY_BYTES)
+
+def scrypt_cost():
+    """
+    Get the scrypt cost for new hashes.
+
+    Returns:
+        int: N from EDUTUTOR_SCRYPT_N (default 2**14)
+    """
+    return int(os.environ.get("EDUTUTOR_SCRYPT_N", DEFAULT_SCRYPT_N))
+
+def hash_password(password, n=None):
+    """
+    Hash a password with a random salt.
+
+    Args:
+        password: The password
+        n: Optional scrypt cost (defaults to scrypt_cost())
+
+    Returns:
+        str: Encoded hash "scrypt$N$r$p$salt$key"
+    """
+    n = n or scrypt_cost()
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"scrypt${n}${SCRYPT_R}${SCRYPT_P}${_b64encode(salt)}${_b64encode(_scrypt(password, salt, n))}"
+
+def verify_password(password, encoded):
+    """
+    Check a password against an encoded hash in constant time.
+
+    Args:
+        password: The password to check
+        encoded: Hash from hash_password()
+
+    Returns:
+        True if the password matches
+    """
+    try:
+        scheme, n, r, p, salt, key = encoded.split("$")
+        if scheme != "scrypt" or int(r) != SCRYPT_R or int(p) != SCRYPT_P:
+            return False
+        return hmac.compare_digest(_scrypt(password, _b64decode(salt), int(n)), _b64decode(key))
+    except ValueError:
+        return False
+
+def needs_rehash(encoded):
+    """
+    Check whether a hash was made with a different cost than the current one.
+
+    Args:
+        encoded: Hash from hash_password()
+
+    Returns:
+        True if the hash should be replaced at the next successful login
+    """
+    return encoded.split("$")[1] != str(scrypt_cost())
+
+class Authenticator:
+    """
+    Password logins and signed session tokens.
+
+    The scrypt hash runs only at login, at most max_concurrent_hashes at a
+    time, so a login storm queues instead of starving the page renders.
+    Logins return an HMAC-signed token; verifying one on each rerun is a
+    dictionary lookup in the verified-token cache, falling back to an HMAC
+    check and a revocation lookup when the entry is new or due a recheck.
+    """
+
+    def __init__(self, secret, token_ttl=DEFAULT_TOKEN_TTL_SECONDS, recheck_seconds=DEFAULT_RECHECK_SECONDS,
+                 cache_size=DEFAULT_CACHE_SIZE, max_concurrent_hashes=None, demo_logins=True):
+        """
+        Initialize the authenticator.
+
+        Args:
+            secret: Bytes used to sign tokens; shared by every worker
+            token_ttl: Lifetime of a token in seconds
+            recheck_seconds: Age after which a cached token is verified again
+            cache_size: Most verified tokens kept in memory
+            max_concurrent_hashes: Most password hashes computed at once
+                (defaults to the CPU count minus one)
+            demo_logins: Accept the demo passwords for users without credentials
+        """
+        self.secret = secret
+        self.token_ttl = token_ttl
+        self.recheck_seconds = recheck_seconds
+        self.cache_size = cache_size
+        self.demo_logins = demo_logins
+        self._hash_slots = threading.BoundedSemaphore(max_concurrent_hashes or max(1, (os.cpu_count() or 2) - 1))
+        self._demo_hashes = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"logins": 0, "failed_logins": 0, "cache_hits": 0, "cache_misses": 0}
+
+    def _demo_hash(self, user_type):
+        """Hash of a demo password, computed once per process."""
+        encoded = self._demo_hashes.get(user_type)
+        if encoded is None:
+            encoded = self._demo_hashes[user_type] = hash_password(DEMO_PASSWORDS[user_type])
+        return encoded
+
+    def seed_demo_accounts(self):
+        """Give the demo teachers credentials if no teacher has any."""
+        if self.demo_logins and count_users("teacher") == 0:
+            for teacher_id in DEMO_TEACHER_IDS:
+                set_password_hash("teacher", teacher_id, hash_password(DEMO_PASSWORDS["teacher"]))
+
+    def login(self, user_type, user_id, password):
+        """
+        Check a user's password and issue a session token.
+
+        Args:
+            user_type: "student" or "teacher"
+            user_id: The user's ID
+            password: The password entered
+
+        Returns:
+            str: Session token, or None if the credentials are wrong
+        """
+        encoded = get_password_hash(user_type, user_id) if user_id else None
+        with self._hash_slots:
+            if encoded is not None:
+                valid = verify_password(password, encoded)
+            elif user_type == "student" and self.demo_logins and user_id:
+                valid = verify_password(password, self._demo_hash(user_type))
+            else:
+                # Spend the same time on unknown users so they cannot be told apart
+                verify_password(password, self._demo_hash("teacher"))
+                valid = False
+            if valid and encoded is not None and needs_rehash(encoded):
+                set_password_hash(user_type, user_id, hash_password(password))
+
+        with self._lock:
+            self._stats["logins" if valid else "failed_logins"] += 1
+        return self.issue_token(user_type, user_id) if valid else None
+
+    def issue_token(self, user_type, user_id):
+        """
+        Sign a session token for a user.
+
+        Args:
+            user_type: "student" or "teacher"
+            user_id: The user's ID
+
+        Returns:
+            str: The token
+        """
+        claims = {"t": user_type, "u": user_id, "e": int(time.time() + self.token_ttl), "j": secrets.token_hex(8)}
+        payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+        token = f"{payload}.{self._sign(payload)}"
+        self._remember(token, claims)
+        return token
+
+    def _remember(self, token, claims):
+        """Add a verified token to the cache."""
+        claims["user"] = {"user_type": claims["t"], "user_id": claims["u"]}
+        with self._lock:
+            self._cache[token] = (claims, time.time())
+            self._cache.move_to_end(token)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _sign(self, payload):
+        """HMAC signature of a token payload."""
+        return _b64encode(hmac.new(self.secret, payload.encode("ascii"), hashlib.sha256).digest())
+
+    def _decode(self, token):
+        """Claims of a correctly signed token, or None."""
+        payload, _, signature = token.partition(".")
+        try:
+            if not signature or not hmac.compare_digest(signature, self._sign(payload)):
+                return None
+            return json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+
+    def verify(self, token):
+        """
+        Get the user a session token belongs to.
+
+        Args:
+            token: Token from login()
+
+        Returns:
+            Dict with user_type and user_id, or None if the token is
+            invalid, expired or revoked
+        """
+        if not token:
+            return None
+        now = time.time()
+        with self._lock:
+            cached = self._cache.get(token)
+            if cached is not None and now - cached[1] < self.recheck_seconds and now < cached[0]["e"]:
+                self._cache.move_to_end(token)
+                self._stats["cache_hits"] += 1
+                return cached[0]["user"]
+            self._stats["cache_misses"] += 1
+
+        claims = self._decode(token)
+        if claims is None or claims["e"] <= now or is_token_revoked(claims["j"]):
+            with self._lock:
+                self._cache.pop(token, None)
+            return None
+
+        self._remember(token, claims)
+        return claims["user"]
+
+    def logout(self, token):
+        """
+        Revoke a session token in every worker.
+
+        Args:
+            token: Token from login()
+        """
+        claims = self._decode(token) if token else None
+        with self._lock:
+            self._cache.pop(token, None)
+        if claims is not None:
+            revoke_token(claims["j"], claims["e"])
+
+    def stats(self):
+        """Login and token cache counters."""
+        with self._lock:
+            return dict(self._stats, cached_tokens=len(self._cache))
+
+_authenticator = None
+_authenticator_lock = threading.Lock()
+
+def get_authenticator():
+    """
+    Get the authenticator shared by all sessions.
+
+    Tokens are signed with EDUTUTOR_AUTH_SECRET, or with a random secret
+    stored in the database on first use so every worker shares it. Token
+    lifetime comes from EDUTUTOR_TOKEN_TTL_SECONDS, and concurrent hashing
+    is capped by EDUTUTOR_AUTH_HASH_CONCURRENCY.
+
+    Returns:
+        Authenticator instance
+    """
+    global _authenticator
+    if _authenticator is None:
+        with _authenticator_lock:
+            if _authenticator is None:
+                secret = os.environ.get("EDUTUTOR_AUTH_SECRET") or get_or_create_secret(
+                    "auth_token_key", lambda: secrets.token_hex(32)
+                )
+                concurrency = os.environ.get("EDUTUTOR_AUTH_HASH_CONCURRENCY")
+                authenticator = Authenticator(
+                    secret.encode("utf-8"),
+                    token_ttl=float(os.environ.get("EDUTUTOR_TOKEN_TTL_SECONDS", DEFAULT_TOKEN_TTL_SECONDS)),
+                    max_concurrent_hashes=int(concurrency) if concurrency else None,
+                    demo_logins=os.environ.get("EDUTUTOR_DEMO_LOGINS", "1") != "0"
+                )
+                authenticator.seed_demo_accounts()
+                _authenticator = authenticator
+    return _authenticator
+
+register_resource(
+    "authenticator",
+    get_authenticator,
+    health=lambda authenticator: authenticator.stats()
+)
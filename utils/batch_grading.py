@@ -0,0 +1,334 @@
+"""
+Batch essay grading for end-of-term workloads.
+
+Grades a directory of essay files or a JSONL file of essays through
+AIAssessmentEngine with bounded concurrency, retries and rate-limit
+backoff. Results are appended to a JSONL file as each essay finishes, so
+an interrupted run can be resumed with the same command.
+
+Usage:
+    python -m utils.batch_grading essays/ --output results.jsonl --concurrency 8
+    python -m utils.batch_grading essays.jsonl --prompt "..." --criteria "Thesis (40%); Evidence (60%)"
+    python -m utils.batch_grading essays/ --word-min 500 --word-max 1000
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from utils.ai_assessment import get_assessment_engine
+from utils.llm_cache import get_response_cache
+
+DEFAULT_PROMPT = "Analyze the impact of artificial intelligence on education in the 21st century."
+DEFAULT_CRITERIA = {
+    "Content & Analysis": 40,
+    "Organization & Structure": 25,
+    "Language & Style": 20,
+    "Citations & Research": 15
+}
+ESSAY_EXTENSIONS = (".txt", ".md")
+
+def load_essays(source):
+    """
+    Load essays from a directory of text files or a JSONL file.
+
+    Directory entries use the file name (without extension) as the essay ID.
+    JSONL records need an "essay" (or "text") field and may carry "id",
+    "student_id", "prompt", "criteria", "word_min" and "word_max"; records
+    without an "id" get
+    "<student_id>:<line number>", or the line number alone.
+
+    Args:
+        source: Path to a directory or a .jsonl file
+
+    Returns:
+        List of essay dictionaries with at least "id" and "essay"
+    """
+    essays = []
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(ESSAY_EXTENSIONS):
+                with open(os.path.join(source, name), encoding="utf-8") as f:
+                    essays.append({"id": os.path.splitext(name)[0], "essay": f.read()})
+    else:
+        with open(source, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                # A student may have several essays in one file, so the line number keeps IDs unique
+                if "id" not in record:
+                    student_id = record.get("student_id")
+                    record["id"] = f"{student_id}:{line_number}" if student_id else str(line_number)
+                record["id"] = str(record["id"])
+                record["essay"] = record.get("essay", record.get("text", ""))
+                essays.append(record)
+    return essays
+
+def load_completed_ids(output_path):
+    """
+    Get the IDs of essays already graded successfully in an output file.
+
+    Args:
+        output_path: JSONL results file from a previous run
+
+    Returns:
+        Set of essay IDs to skip
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a truncated last line; grade that essay again
+                continue
+            if record.get("status") == "ok":
+                completed.add(str(record["id"]))
+    return completed
+
+def _retry_after(error):
+    """Return the server's requested delay in seconds for a rate-limit error, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+def _is_rate_limit(error):
+    """Check whether an error is an HTTP 429 from the model provider."""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+def _is_retryable(error):
+    """Client errors such as bad requests or auth failures will not succeed on retry."""
+    status = getattr(error, "status_code", None)
+    return status is None or status == 429 or status >= 500
+
+class BatchGrader:
+    """
+    Asyncio pipeline that grades essays with bounded concurrency.
+
+    Grading calls are blocking, so each one runs in a worker thread while a
+    semaphore caps how many are in flight. A rate-limit response pauses all
+    workers until the provider's retry-after window has passed.
+    """
+
+    def __init__(self, engine=None, concurrency=4, max_retries=3, base_delay=1.0,
+                 max_delay=60.0, requests_per_minute=None):
+        """
+        Initialize the grader.
+
+        Args:
+            engine: AIAssessmentEngine to grade with (the shared engine if None)
+            concurrency: Maximum number of essays graded at once
+            max_retries: Retries per essay after the first attempt
+            base_delay: Initial backoff delay in seconds
+            max_delay: Upper bound for a single backoff delay
+            requests_per_minute: Optional client-side cap on request rate
+        """
+        self.engine = engine or get_assessment_engine()
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+
+        self._paused_until = 0.0
+        self._next_slot = 0.0
+
+    async def _wait_for_slot(self):
+        """Honor any shared rate-limit pause and the request-rate cap."""
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            if self.min_interval:
+                slot = max(now, self._next_slot)
+                self._next_slot = slot + self.min_interval
+                if slot > now:
+                    await asyncio.sleep(slot - now)
+            return
+
+    async def _grade_one(self, record, prompt, criteria, word_min=None, word_max=None):
+        """Grade one essay with retries, returning the output record."""
+        loop = asyncio.get_running_loop()
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            await self._wait_for_slot()
+            try:
+                result = await asyncio.to_thread(
+                    self.engine.evaluate_essay,
+                    record["essay"],
+                    record.get("prompt", prompt),
+                    record.get("criteria", criteria),
+                    raise_errors=True,
+                    word_min=record.get("word_min", word_min),
+                    word_max=record.get("word_max", word_max),
+                    student_id=record.get("student_id")
+                )
+                return {
+                    "id": record["id"],
+                    "student_id": record.get("student_id"),
+                    "status": "ok",
+                    "attempts": attempt + 1,
+                    "latency": round(time.perf_counter() - started, 3),
+                    "result": result
+                }
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    return {
+                        "id": record["id"],
+                        "student_id": record.get("student_id"),
+                        "status": "error",
+                        "attempts": attempt + 1,
+                        "error": f"{type(e).__name__}: {e}"
+                    }
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                if _is_rate_limit(e):
+                    delay = max(delay, _retry_after(e) or 0.0)
+                    # Every worker backs off, not only the one that was throttled
+                    self._paused_until = max(self._paused_until, loop.time() + delay)
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def run(self, essays, output_path, prompt=DEFAULT_PROMPT, criteria=None, progress=None,
+                  word_min=None, word_max=None):
+        """
+        Grade essays and append each result to output_path as it finishes.
+
+        Args:
+            essays: List of essay dictionaries from load_essays()
+            output_path: JSONL file to append results to
+            prompt: Default essay prompt
+            criteria: Default grading criteria (dict or criteria string)
+            progress: Optional callback(done, total, record)
+            word_min: Default minimum word count (None leaves length out of the grade)
+            word_max: Default maximum word count
+
+        Returns:
+            Dictionary summarizing the run
+        """
+        criteria = criteria or DEFAULT_CRITERIA
+        completed = load_completed_ids(output_path)
+        pending = [record for record in essays if str(record["id"]) not in completed]
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        counts = {"ok": 0, "error": 0}
+        cache = get_response_cache()
+        cache_hits = cache.hits
+        started = time.perf_counter()
+
+        async def worker(record):
+            async with semaphore:
+                return await self._grade_one(record, prompt, criteria, word_min, word_max)
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, "a+", encoding="utf-8") as out:
+            if out.tell() > 0:
+                out.seek(out.tell() - 1)
+                if out.read(1) != "\n":
+                    # Terminate a line left truncated by an interrupted run
+                    out.write("\n")
+            tasks = [asyncio.create_task(worker(record)) for record in pending]
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                record = await task
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                counts[record["status"]] += 1
+                if progress:
+                    progress(done, len(pending), record)
+
+        elapsed = time.perf_counter() - started
+        return {
+            "total": len(essays),
+            "skipped": len(essays) - len(pending),
+            "graded": counts["ok"],
+            "failed": counts["error"],
+            "cache_hits": cache.hits - cache_hits,
+            "elapsed_seconds": round(elapsed, 3),
+            "essays_per_second": round(len(pending) / elapsed, 3) if elapsed > 0 else 0.0
+        }
+
+def grade_batch(essays, output_path, prompt=DEFAULT_PROMPT, criteria=None, concurrency=4,
+                max_retries=3, requests_per_minute=None, engine=None, progress=None, word_min=None, word_max=None):
+    """
+    Grade a list of essays from synchronous code.
+
+    Args:
+        essays: List of essay dictionaries from load_essays()
+        output_path: JSONL file to append results to
+        prompt: Default essay prompt
+        criteria: Default grading criteria (dict or criteria string)
+        concurrency: Maximum number of essays graded at once
+        max_retries: Retries per essay after the first attempt
+        requests_per_minute: Optional client-side cap on request rate
+        engine: Optional AIAssessmentEngine to reuse
+        progress: Optional callback(done, total, record)
+        word_min: Default minimum word count (None leaves length out of the grade)
+        word_max: Default maximum word count
+
+    Returns:
+        Dictionary summarizing the run
+    """
+    grader = BatchGrader(
+        engine=engine,
+        concurrency=concurrency,
+        max_retries=max_retries,
+        requests_per_minute=requests_per_minute
+    )
+    return asyncio.run(grader.run(essays, output_path, prompt, criteria, progress, word_min, word_max))
+
+def _parse_criteria(value):
+    """Accept criteria as JSON ({"Thesis": 40, ...}) or "Thesis (40%); Evidence (60%)"."""
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except ValueError:
+        return "\n".join(part.strip() for part in value.split(";") if part.strip())
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Grade a batch of essays with the EduTutor AI engine.")
+    parser.add_argument("source", help="Directory of .txt/.md essays or a .jsonl file")
+    parser.add_argument("--output", "-o", default="grading_results.jsonl", help="JSONL file for results")
+    parser.add_argument("--prompt", default=DEFAULT_PROMPT, help="Essay prompt used when a record has none")
+    parser.add_argument("--criteria", help='Criteria as JSON or "Name (40%%); Other (60%%)"')
+    parser.add_argument("--word-min", type=int, help="Minimum word count used when a record has none")
+    parser.add_argument("--word-max", type=int, help="Maximum word count used when a record has none")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Essays graded at once")
+    parser.add_argument("--max-retries", type=int, default=3, help="Retries per essay")
+    parser.add_argument("--rpm", type=float, help="Maximum requests per minute")
+    args = parser.parse_args(argv)
+
+    essays = load_essays(args.source)
+
+    def progress(done, total, record):
+        print(f"[{done}/{total}] {record['id']}: {record['status']}", file=sys.stderr)
+
+    report = grade_batch(
+        essays,
+        args.output,
+        prompt=args.prompt,
+        criteria=_parse_criteria(args.criteria),
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        requests_per_minute=args.rpm,
+        progress=progress,
+        word_min=args.word_min,
+        word_max=args.word_max
+    )
+    print(json.dumps(report, indent=2))
+    return 0 if report["failed"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import threading
+from functools import wraps
+from collections import OrderedDict
+import plotly.io as pio
+import plotly.graph_objects as go
+from utils.resources import register_resource
+from utils.metrics import span
+
+DEFAULT_MAX_FIGURES = 256
+
+# Styling shared by every chart. Built once from plotly's default template so
+# figures look the same as before, instead of restyling every figure.
+CHART_TEMPLATE = go.layout.Template(pio.templates["plotly"])
+CHART_TEMPLATE.layout.update(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    margin=dict(l=20, r=20, t=40, b=20)
+)
+pio.templates["edututor"] = CHART_TEMPLATE
+
+def _jsonable(value):
+    """Fallback encoder so numpy arrays and pandas objects fingerprint by content."""
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return str(value)
+
+def fingerprint(name, *args, **kwargs):
+    """
+    Build a content-addressed key for a chart's inputs.
+
+    Args:
+        name: Name of the chart builder
+        *args: Positional inputs of the builder
+        **kwargs: Keyword inputs of the builder
+
+    Returns:
+        Hex SHA-1 digest identifying the chart
+    """
+    payload = json.dumps([name, args, kwargs], sort_keys=True, default=_jsonable)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class FigureCache:
+    """
+    Bounded LRU of serialized Plotly figures shared by all sessions.
+
+    Figures are stored as JSON so a cached chart can never be changed by a
+    caller that mutates the figure it was given.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_FIGURES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of figures kept
+        """
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Look up a cached figure.
+
+        Args:
+            key: Key from fingerprint()
+
+        Returns:
+            A new Figure built from the cached JSON, or None on a miss
+        """
+        with self._lock:
+            spec = self._figures.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._figures.move_to_end(key)
+            self.hits += 1
+        # The spec was produced by plotly itself, so skip re-validating it
+        return go.Figure(json.loads(spec), _validate=False)
+
+    def put(self, key, fig):
+        """
+        Store a figure, evicting the least recently used one.
+
+        Args:
+            key: Key from fingerprint()
+            fig: Plotly figure to cache
+        """
+        spec = fig.to_json()
+        with self._lock:
+            self._figures[key] = spec
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached figure."""
+        with self._lock:
+            self._figures.clear()
+
+    def __len__(self):
+        return len(self._figures)
+
+_figure_cache = None
+_figure_cache_lock = threading.Lock()
+
+def get_figure_cache():
+    """
+    Get the process-wide figure cache.
+
+    The size is read from EDUTUTOR_CHART_CACHE_SIZE.
+
+    Returns:
+        The shared FigureCache instance
+    """
+    global _figure_cache
+    if _figure_cache is None:
+        with _figure_cache_lock:
+            if _figure_cache is None:
+                _figure_cache = FigureCache(int(os.environ.get("EDUTUTOR_CHART_CACHE_SIZE", DEFAULT_MAX_FIGURES)))
+    return _figure_cache
+
+register_resource(
+    "figure_cache",
+    get_figure_cache,
+    health=lambda cache: {"figures": len(cache), "hits": cache.hits, "misses": cache.misses}
+)
+
+def cached_figure(builder):
+    """
+    Decorator that serves a chart builder's figures from the figure cache.
+
+    The builder's arguments must be plain data (dicts, lists, numbers and
+    strings, or numpy/pandas values); they are fingerprinted to find the
+    cached figure.
+
+    Args:
+        builder: Function returning a Plotly figure
+
+    Returns:
+        The wrapped builder
+    """
+    name = f"{builder.__module__}.{builder.__qualname__}"
+    span_name = f"chart.{builder.__name__.lstrip('_')}"
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        with span(span_name):
+            cache = get_figure_cache()
+            key = fingerprint(name, *args, **kwargs)
+            fig = cache.get(key)
+            if fig is None:
+                fig = builder(*args, **kwargs)
+                cache.put(key, fig)
+            return fig
+
+    return wrapper
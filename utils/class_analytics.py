@@ -0,0 +1,280 @@
+import threading
+import numpy as np
+import pandas as pd
+from data.database import SUBJECTS
+from data.student_data import get_all_students, get_student_repository
+from utils.resources import register_resource
+
+SUBJECT_LABELS = ["Math", "Science", "Language Arts", "History"]
+
+AT_RISK_THRESHOLD = 70
+EXCELLENT_THRESHOLD = 90
+PERCENTILES = [10, 25, 50, 75, 90]
+
+RISK_BANDS = np.array(["⚠️ At Risk", "✓ On Track", "⭐ Excellent"])
+RISK_BAND_NAMES = ["At Risk", "On Track", "Excellent"]
+
+# Columns the student table can be sorted by
+SORT_KEYS = ["score", "name", "completed"]
+
+class ClassAnalytics:
+    """
+    Columnar class performance model for the teacher dashboards.
+
+    Subject scores are held in an (n_students x n_subjects) array with one
+    contiguous column per subject, so class-wide aggregates are computed in
+    a single vectorized pass. Running sums and counts are updated in place
+    when one student's record changes.
+    """
+
+    def __init__(self, students):
+        """
+        Build the performance matrix for a roster.
+
+        Args:
+            students: List of student dictionaries
+        """
+        self._lock = threading.RLock()
+        self.student_ids = np.array([s["id"] for s in students], dtype=object)
+        self.names = np.array([f"{s['first_name']} {s['last_name']}" for s in students], dtype=object)
+        self._row_by_id = {student_id: i for i, student_id in enumerate(self.student_ids)}
+
+        # Column-major so each subject's scores are contiguous
+        self.scores = np.asfortranarray(
+            np.array([[s["performance"].get(subject, 0) for subject in SUBJECTS] for s in students],
+                     dtype=np.float64).reshape(len(students), len(SUBJECTS))
+        )
+        self.completed = np.array([s.get("completed_assessments", 0) for s in students], dtype=np.int64)
+        self._recompute()
+
+    def _recompute(self):
+        """Recompute every aggregate from the full matrix."""
+        self.averages = self.scores.mean(axis=1) if len(self.scores) else np.zeros(0)
+        self._subject_sums = self.scores.sum(axis=0)
+        self._completed_total = int(self.completed.sum())
+        self._at_risk_count = int(np.count_nonzero(self.averages < AT_RISK_THRESHOLD))
+        self._excellent_count = int(np.count_nonzero(self.averages > EXCELLENT_THRESHOLD))
+        self._percentiles = None
+        self._sort_orders = {}
+
+    @property
+    def student_count(self):
+        """Number of students in the class."""
+        return len(self.student_ids)
+
+    def _values(self, subject=None):
+        """Return the average column, or one subject's score column."""
+        return self.averages if subject is None else self.scores[:, SUBJECTS.index(subject)]
+
+    def risk_band_codes(self, subject=None):
+        """
+        Get the risk band of every student.
+
+        Args:
+            subject: Optional subject to band by instead of the overall average
+
+        Returns:
+            Integer array: 0 = at risk, 1 = on track, 2 = excellent
+        """
+        values = self._values(subject)
+        return (values >= AT_RISK_THRESHOLD).astype(np.int8) + (values > EXCELLENT_THRESHOLD)
+
+    def sort_order(self, sort_by="score", subject=None):
+        """
+        Get the ascending row order for a sort key, computed once per key.
+
+        Args:
+            sort_by: One of SORT_KEYS
+            subject: Subject whose score is used for "score" (None = average)
+
+        Returns:
+            Integer array of row indices
+        """
+        key = (sort_by, subject if sort_by == "score" else None)
+        with self._lock:
+            order = self._sort_orders.get(key)
+            if order is None:
+                if sort_by == "name":
+                    order = np.argsort(self.names.astype(str), kind="stable")
+                elif sort_by == "completed":
+                    order = np.argsort(self.completed, kind="stable")
+                else:
+                    order = np.argsort(self._values(subject), kind="stable")
+                self._sort_orders[key] = order
+            return order
+
+    def query(self, band=None, subject=None, min_completed=0, sort_by="score",
+              descending=True, page=0, page_size=25):
+        """
+        Filter, sort and page the student table.
+
+        Only the rows on the requested page are materialized, so the cost of
+        rendering a page does not depend on the size of the class.
+
+        Args:
+            band: Optional risk band code (0, 1 or 2) to keep
+            subject: Optional subject to score and band by instead of the average
+            min_completed: Minimum number of completed assessments
+            sort_by: One of SORT_KEYS
+            descending: Sort from highest to lowest
+            page: Zero-based page number
+            page_size: Number of rows per page
+
+        Returns:
+            Tuple of (DataFrame for the page, total number of matching students)
+        """
+        with self._lock:
+            order = self.sort_order(sort_by, subject)
+            if descending:
+                order = order[::-1]
+
+            codes = self.risk_band_codes(subject)
+            mask = self.completed >= min_completed
+            if band is not None:
+                mask &= codes == band
+            matches = order[mask[order]]
+
+            rows = matches[page * page_size:(page + 1) * page_size]
+            frame = pd.DataFrame({
+                "ID": self.student_ids[rows],
+                "Student": self.names[rows],
+                "Score" if subject else "Average": self._values(subject)[rows].round(1),
+                "Completed": self.completed[rows],
+                "Status": RISK_BANDS[codes[rows]]
+            })
+            for label, column in zip(SUBJECT_LABELS, self.scores[rows].T):
+                frame[label] = column
+            return frame, len(matches)
+
+    def percentiles(self):
+        """
+        Get percentiles of the overall and per-subject scores.
+
+        Returns:
+            Dict of {"average" or subject: {percentile: value}}
+        """
+        with self._lock:
+            if self._percentiles is None:
+                if self.student_count:
+                    # One call covers the averages column and all subject columns
+                    matrix = np.column_stack([self.averages, self.scores])
+                    values = np.percentile(matrix, PERCENTILES, axis=0)
+                else:
+                    values = np.zeros((len(PERCENTILES), len(SUBJECTS) + 1))
+                self._percentiles = {
+                    column: dict(zip(PERCENTILES, values[:, j].tolist()))
+                    for j, column in enumerate(["average"] + SUBJECTS)
+                }
+            return self._percentiles
+
+    def summary(self):
+        """
+        Get the class-wide statistics shown on Class Overview.
+
+        Returns:
+            Dictionary with class average, counts and per-subject averages
+        """
+        with self._lock:
+            count = self.student_count
+            subject_averages = {
+                subject: (float(self._subject_sums[j]) / count if count else 0)
+                for j, subject in enumerate(SUBJECTS)
+            }
+            return {
+                'class_average': sum(subject_averages.values()) / len(SUBJECTS) if count else 0,
+                'subject_averages': subject_averages,
+                'student_count': count,
+                'completed_assessments': self._completed_total,
+                'at_risk_count': self._at_risk_count,
+                'excellent_count': self._excellent_count,
+                'at_risk_percentage': (self._at_risk_count / count) * 100 if count else 0,
+                'percentiles': self.percentiles()
+            }
+
+    def update_student(self, student):
+        """
+        Apply one student's new record to the matrix and aggregates.
+
+        Args:
+            student: Updated student dictionary
+
+        Returns:
+            True if the update was applied incrementally, False if the
+            student is not part of this class
+        """
+        with self._lock:
+            row = self._row_by_id.get(student["id"])
+            if row is None:
+                return False
+
+            new_scores = np.array([student["performance"].get(subject, 0) for subject in SUBJECTS],
+                                  dtype=np.float64)
+            old_average = self.averages[row]
+            new_average = new_scores.mean()
+
+            self._subject_sums += new_scores - self.scores[row]
+            self.scores[row] = new_scores
+            self.averages[row] = new_average
+
+            new_completed = student.get("completed_assessments", 0)
+            self._completed_total += int(new_completed - self.completed[row])
+            self.completed[row] = new_completed
+
+            self._at_risk_count += int(new_average < AT_RISK_THRESHOLD) - int(old_average < AT_RISK_THRESHOLD)
+            self._excellent_count += int(new_average > EXCELLENT_THRESHOLD) - int(old_average > EXCELLENT_THRESHOLD)
+            self.names[row] = f"{student['first_name']} {student['last_name']}"
+            self._percentiles = None
+            self._sort_orders = {}
+            return True
+
+    def to_frame(self):
+        """
+        Get the class as a DataFrame, one row per student.
+
+        Returns:
+            pandas DataFrame with ID, name, subject scores, average,
+            completed assessments and risk band
+        """
+        frame = pd.DataFrame(self.scores, columns=SUBJECT_LABELS)
+        frame.insert(0, "Student", self.names)
+        frame.insert(0, "ID", self.student_ids)
+        frame["Average"] = self.averages
+        frame["Completed"] = self.completed
+        frame["Status"] = RISK_BANDS[self.risk_band_codes()]
+        return frame
+
+_analytics = None
+# Reentrant: a build that reads a stale roster notifies the listener on the same thread
+_analytics_lock = threading.RLock()
+
+def _on_student_saved(student):
+    """Keep the shared analytics in sync with writes to the repository."""
+    global _analytics
+    with _analytics_lock:
+        if _analytics is not None and (student is None or not _analytics.update_student(student)):
+            # Roster changed shape (new student or full reload); rebuild lazily
+            _analytics = None
+
+get_student_repository().subscribe(_on_student_saved)
+
+def get_class_analytics():
+    """
+    Get the class analytics shared by all sessions.
+
+    Returns:
+        ClassAnalytics for the current roster
+    """
+    global _analytics
+    analytics = _analytics
+    if analytics is None:
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = ClassAnalytics(get_all_students())
+            analytics = _analytics
+    return analytics
+
+register_resource(
+    "class_analytics",
+    get_class_analytics,
+    health=lambda analytics: {"students": len(analytics.student_ids)}
+)
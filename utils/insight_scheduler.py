@@ -0,0 +1,389 @@
+"""
+Background precomputation of per-student insights.
+
+A job walks the roster in student ID order and, for every student, works
+out the intervention flag, weak areas and recommended modules, plus an
+AI-written summary from AIAssessmentEngine.generate_personalized_feedback.
+The results go to the student_insights table in batches, each with the
+job's progress, so a job interrupted by a restart resumes where it left
+off in whichever worker claims it next. Students whose stored input stamp
+still matches are skipped, and a running job's heartbeat is refreshed on
+a timer so slow batches are not mistaken for a dead worker. Pages read the stored row when its
+input stamp still matches the student and fall back to computing inline
+otherwise.
+
+Each worker process runs one scheduler thread. Outside the off-peak
+window (EDUTUTOR_INSIGHTS_HOURS, local time, default "1-5") it only
+resumes unfinished jobs; inside it, it queues one full job per night.
+Set EDUTUTOR_INSIGHTS_SCHEDULER=0 to keep the thread from starting.
+
+Usage:
+    python -m utils.insight_scheduler --run-now      # queue a job and run it in the foreground
+    python -m utils.insight_scheduler --status
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import datetime
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from data.database import SUBJECTS
+from data.student_data import get_all_students
+from data.student_insights import (create_insight_job, claim_insight_job, save_insight_batch, finish_insight_job,
+                                   heartbeat_insight_job, get_recent_insight_jobs, insight_job_created_since,
+                                   get_student_insight, get_insight_inputs, count_student_insights)
+from utils.recommendations import get_recommendation_engine, WEAK_AREA_THRESHOLD
+from utils.resources import register_resource
+
+# Bump when the stored insight format or its rules change, so old rows are recomputed
+INSIGHTS_VERSION = 1
+
+DEFAULT_WORKERS = 4
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_HOURS = "1-5"
+DEFAULT_POLL_SECONDS = 60
+# A running job whose worker has not reported for this long is taken over
+STALE_JOB_SECONDS = 600
+# How often a running job's heartbeat is refreshed, well inside STALE_JOB_SECONDS
+HEARTBEAT_SECONDS = 60
+
+# Students with fewer completed assessments than this are flagged for monitoring
+MONITOR_COMPLETED_BELOW = 5
+
+def intervention_flag(student):
+    """
+    Decide whether a student needs an intervention.
+
+    Args:
+        student: Student dictionary
+
+    Returns:
+        Tuple of ("intervention", weakest subject) when the weakest subject
+        is below the weak-area threshold, ("monitor", None) when the student
+        has completed few assessments, and ("on_track", None) otherwise
+    """
+    performance = student.get("performance") or {}
+    if performance:
+        subject, score = min(performance.items(), key=lambda item: item[1])
+        if score < WEAK_AREA_THRESHOLD:
+            return "intervention", subject
+    if student.get("completed_assessments", 0) < MONITOR_COMPLETED_BELOW:
+        return "monitor", None
+    return "on_track", None
+
+def insight_inputs(student, engine=None):
+    """
+    Build the stamp of everything a student's insights are computed from.
+
+    Args:
+        student: Student dictionary
+        engine: Optional RecommendationEngine (defaults to the shared one)
+
+    Returns:
+        str: Stamp that changes when the insights would
+    """
+    performance = student.get("performance") or {}
+    return json.dumps([
+        INSIGHTS_VERSION, (engine or get_recommendation_engine()).catalog_stamp,
+        [performance.get(subject) for subject in SUBJECTS],
+        student.get("learning_style"), student.get("completed_assessments")
+    ], separators=(",", ":"))
+
+def get_fresh_insight(student):
+    """
+    Get a student's precomputed insights if they are still current.
+
+    Args:
+        student: Student dictionary
+
+    Returns:
+        Insight dictionary whose "recommendations" has the shape of
+        get_recommendations() (with module dictionaries), or None if no
+        current insights are stored
+    """
+    if not student:
+        return None
+    insight = get_student_insight(student["id"])
+    engine = get_recommendation_engine()
+    if insight is None or insight["inputs"] != insight_inputs(student, engine):
+        return None
+    stored = insight["recommendations"]
+    insight["recommendations"] = dict(stored, modules={
+        subject: engine.modules_by_id(module_ids) for subject, module_ids in stored["modules"].items()
+    })
+    return insight
+
+def _window_start(now, hours):
+    """Unix time the off-peak window containing now began, or None outside the window."""
+    start_hour, end_hour = (int(part) for part in hours.split("-"))
+    local = datetime.datetime.fromtimestamp(now)
+    start = local.replace(hour=start_hour, minute=0, second=0, microsecond=0)
+    if start_hour <= end_hour:
+        inside = start_hour <= local.hour < end_hour
+    else:
+        # The window wraps past midnight (e.g. "22-4")
+        inside = local.hour >= start_hour or local.hour < end_hour
+        if local.hour < end_hour:
+            start -= datetime.timedelta(days=1)
+    return start.timestamp() if inside else None
+
+class InsightScheduler:
+    """Runs insight jobs on a thread pool and queues one per night."""
+
+    def __init__(self, workers=DEFAULT_WORKERS, batch_size=DEFAULT_BATCH_SIZE, hours=DEFAULT_HOURS,
+                 poll_seconds=DEFAULT_POLL_SECONDS, summaries=True):
+        """
+        Initialize the scheduler.
+
+        Args:
+            workers: Threads computing insights; summaries wait on the model,
+                so threads overlap those calls
+            batch_size: Students stored per transaction
+            hours: Off-peak window "start-end" in local hours
+            poll_seconds: Time between checks for due and unfinished jobs
+            summaries: Write AI summaries (False stores the rule-based parts only)
+        """
+        self.workers = workers
+        self.batch_size = batch_size
+        self.hours = hours
+        self.poll_seconds = poll_seconds
+        self.summaries = summaries
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {"jobs_run": 0, "students": 0, "skipped": 0, "running_job": None}
+
+    def compute(self, student, engine):
+        """
+        Work out one student's insights.
+
+        Args:
+            student: Student dictionary
+            engine: RecommendationEngine to rank modules with
+
+        Returns:
+            Insight dictionary with the student_insights columns
+        """
+        flag, subject = intervention_flag(student)
+        recommendations = engine.recommend(student, memoize=False)
+        summary = None
+        if self.summaries:
+            # Imported here: the assessment engine loads langchain
+            from utils.ai_assessment import get_assessment_engine
+            summary = get_assessment_engine().generate_personalized_feedback({}, student)
+        return {
+            "student_id": student["id"],
+            "version": INSIGHTS_VERSION,
+            "inputs": insight_inputs(student, engine),
+            "computed_at": time.time(),
+            "intervention": flag,
+            "intervention_subject": subject,
+            "recommendations": dict(recommendations, modules={
+                subject: [module["id"] for module in modules]
+                for subject, modules in recommendations["modules"].items()
+            }),
+            "summary": summary
+        }
+
+    def _heartbeat(self, job_id, done):
+        """Heartbeat thread: keep a running job's claim fresh until done is set."""
+        while not done.wait(HEARTBEAT_SECONDS):
+            try:
+                if not heartbeat_insight_job(job_id, self.owner):
+                    # The job finished or was taken over; the next batch save notices
+                    return
+            except sqlite3.Error:
+                # A locked database only delays this beat; the next one retries
+                pass
+
+    def run_job(self, job, progress=None):
+        """
+        Run a claimed job from its stored cursor to the end of the roster.
+
+        Students whose stored insights were computed from the same inputs
+        are skipped; the cursor still moves past them.
+
+        Args:
+            job: Job dictionary from claim_insight_job()
+            progress: Optional callable(processed, total) called after each batch
+
+        Returns:
+            int: Students processed by this call
+        """
+        students = sorted(get_all_students(), key=lambda student: student["id"])
+        remaining = [student for student in students if student["id"] > job["cursor"]]
+        processed = len(students) - len(remaining)
+        engine = get_recommendation_engine()
+        stored_inputs = get_insight_inputs()
+        with self._lock:
+            self._stats["running_job"] = job["id"]
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job["id"], done),
+                                     name="insight-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                for start in range(0, len(remaining), self.batch_size):
+                    if self._stop.is_set():
+                        # Leave the job running; its cursor lets the next claim resume it
+                        return start
+                    batch = remaining[start:start + self.batch_size]
+                    due = [student for student in batch
+                           if stored_inputs.get(student["id"]) != insight_inputs(student, engine)]
+                    insights = list(pool.map(lambda student: self.compute(student, engine), due))
+                    processed += len(batch)
+                    if not save_insight_batch(job["id"], self.owner, insights, batch[-1]["id"], processed,
+                                              len(students)):
+                        # Another worker took the job over after a stall
+                        return start
+                    with self._lock:
+                        self._stats["students"] += len(due)
+                        self._stats["skipped"] += len(batch) - len(due)
+                    if progress:
+                        progress(processed, len(students))
+            finish_insight_job(job["id"], self.owner)
+            with self._lock:
+                self._stats["jobs_run"] += 1
+            return len(remaining)
+        except Exception as e:
+            finish_insight_job(job["id"], self.owner, "failed", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            done.set()
+            with self._lock:
+                self._stats["running_job"] = None
+
+    def run_pending(self, progress=None):
+        """
+        Run every job that is queued or was abandoned by its worker.
+
+        Args:
+            progress: Optional callable(processed, total) called after each batch
+
+        Returns:
+            int: Number of jobs run
+        """
+        jobs = 0
+        while not self._stop.is_set():
+            job = claim_insight_job(self.owner, STALE_JOB_SECONDS)
+            if job is None:
+                break
+            self.run_job(job, progress)
+            jobs += 1
+        return jobs
+
+    def queue_if_due(self, now=None):
+        """
+        Queue tonight's job if the off-peak window is open and it was not queued yet.
+
+        Args:
+            now: Optional Unix time (defaults to now)
+
+        Returns:
+            The new job ID, or None if no job was due
+        """
+        window_start = _window_start(time.time() if now is None else now, self.hours)
+        if window_start is None or insight_job_created_since(window_start):
+            return None
+        return create_insight_job()
+
+    def _loop(self):
+        """Scheduler thread: queue due jobs and run whatever is pending."""
+        while not self._stop.is_set():
+            try:
+                self.queue_if_due()
+                self.run_pending()
+            except Exception:
+                # A failed job is recorded in its row; keep the thread alive for the next one
+                pass
+            self._stop.wait(self.poll_seconds)
+
+    def start(self):
+        """Start the scheduler thread if it is not running."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="insight-scheduler", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop the scheduler thread after its current batch.
+
+        Args:
+            timeout: Optional seconds to wait for the thread
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """Counters of this worker's scheduler."""
+        with self._lock:
+            return dict(self._stats, thread_alive=bool(self._thread and self._thread.is_alive()))
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_insight_scheduler():
+    """
+    Get the insight scheduler of this process.
+
+    Configured by EDUTUTOR_INSIGHTS_WORKERS, EDUTUTOR_INSIGHTS_BATCH_SIZE,
+    EDUTUTOR_INSIGHTS_HOURS and EDUTUTOR_INSIGHTS_SUMMARIES ("0" skips the
+    AI summaries).
+
+    Returns:
+        InsightScheduler instance
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = InsightScheduler(
+                    workers=int(os.environ.get("EDUTUTOR_INSIGHTS_WORKERS", DEFAULT_WORKERS)),
+                    batch_size=int(os.environ.get("EDUTUTOR_INSIGHTS_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+                    hours=os.environ.get("EDUTUTOR_INSIGHTS_HOURS", DEFAULT_HOURS),
+                    summaries=os.environ.get("EDUTUTOR_INSIGHTS_SUMMARIES", "1") != "0"
+                )
+    return _scheduler
+
+register_resource(
+    "insight_scheduler",
+    get_insight_scheduler,
+    health=lambda scheduler: dict(scheduler.stats(), stored=count_student_insights())
+)
+
+def start_insight_scheduler():
+    """Start this process's scheduler thread unless EDUTUTOR_INSIGHTS_SCHEDULER is "0"."""
+    if os.environ.get("EDUTUTOR_INSIGHTS_SCHEDULER", "1") != "0":
+        get_insight_scheduler().start()
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Precompute student insights.")
+    parser.add_argument("--run-now", action="store_true", help="Queue a job and run it in the foreground")
+    parser.add_argument("--status", action="store_true", help="Print the most recent jobs")
+    args = parser.parse_args(argv)
+
+    if args.run_now:
+        create_insight_job()
+        started = time.perf_counter()
+
+        def report(processed, total):
+            print(f"\r{processed:,}/{total:,} students", end="", file=sys.stderr, flush=True)
+
+        get_insight_scheduler().run_pending(report)
+        print(file=sys.stderr)
+        print(json.dumps(dict(get_insight_scheduler().stats(), seconds=round(time.perf_counter() - started, 2))))
+    if args.status or not args.run_now:
+        print(json.dumps(get_recent_insight_jobs(), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
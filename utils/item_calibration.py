@@ -0,0 +1,387 @@
+"""
+Offline item calibration over the recorded responses.
+
+Streams every scored response (adaptive test answers and the objective
+questions of submitted quizzes and tests), fits item discrimination and
+difficulty per subject by joint maximum likelihood, and stores the
+result as a new version of the item parameter table. Subjects are
+independent, so they are fitted in parallel worker processes.
+
+Usage:
+    python -m utils.item_calibration --workers 4
+    python -m utils.item_calibration --benchmark --responses 1000000
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from data.item_bank import default_guessing, iter_responses, question_item_id, save_calibration
+from data.sample_assessments import get_assessment_by_id, iter_submission_contents
+from utils.offline_grading import grade_objective, is_objective
+
+# Scaling constant shared with utils.adaptive_testing
+SCALE = 1.7
+
+# Items answered fewer times keep their current parameters
+DEFAULT_MIN_RESPONSES = 20
+DEFAULT_ITERATIONS = 40
+TOLERANCE = 1e-3
+
+TRUE_FALSE_OPTIONS = ["True", "False"]
+
+# Gaussian priors keep perfect and zero scores finite: (mean, sd)
+THETA_PRIOR = (0.0, 1.0)
+DIFFICULTY_PRIOR = (0.0, 2.0)
+DISCRIMINATION_PRIOR = (1.0, 0.75)
+
+class ResponseMatrix:
+    """
+    The responses of one subject as parallel arrays.
+
+    Students and items are coded as consecutive integers while rows are
+    appended, so a fit never handles strings.
+    """
+
+    def __init__(self, subject):
+        """
+        Initialize an empty matrix.
+
+        Args:
+            subject: Subject key (e.g. "math")
+        """
+        self.subject = subject
+        self.item_ids = []
+        self.guessing = []
+        self._students = {}
+        self._items = {}
+        self._chunks = []
+
+    def add(self, rows):
+        """
+        Append a batch of responses.
+
+        Args:
+            rows: Iterable of (item_id, student_id, correct, guessing) tuples
+        """
+        people, items, correct = [], [], []
+        for item_id, student_id, is_correct, guessing in rows:
+            item = self._items.get(item_id)
+            if item is None:
+                item = self._items[item_id] = len(self.item_ids)
+                self.item_ids.append(item_id)
+                self.guessing.append(guessing)
+            people.append(self._students.setdefault(student_id, len(self._students)))
+            items.append(item)
+            correct.append(is_correct)
+        if people:
+            self._chunks.append((np.array(people, dtype=np.int64), np.array(items, dtype=np.int64),
+                                 np.array(correct, dtype=float)))
+
+    def __len__(self):
+        return sum(len(chunk[0]) for chunk in self._chunks)
+
+    def arrays(self):
+        """
+        Get the responses as arrays ready for fit_items().
+
+        Returns:
+            Tuple of (person codes, item codes, correct flags, guessing per item)
+        """
+        if not self._chunks:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0), np.zeros(0)
+        people, items, correct = (np.concatenate(column) for column in zip(*self._chunks))
+        return people, items, correct, np.array(self.guessing, dtype=float)
+
+def _stream_question_responses(batch_size):
+    """Score the objective questions of submitted quizzes and tests."""
+    assessments = {}
+    for batch in iter_submission_contents(batch_size=batch_size):
+        rows = []
+        for assessment_id, student_id, content in batch:
+            if assessment_id not in assessments:
+                assessments[assessment_id] = get_assessment_by_id(assessment_id)
+            assessment = assessments[assessment_id]
+            try:
+                answers = json.loads(content or "[]")
+            except ValueError:
+                continue
+            if not assessment or not isinstance(answers, list):
+                continue
+            subject = assessment["subject"].lower().replace(" ", "_")
+            for index, (question, answer) in enumerate(zip(assessment.get("questions", []), answers)):
+                if answer is None or not is_objective(question):
+                    continue
+                # True/false questions are stored without their two options
+                options = question.get("options") or TRUE_FALSE_OPTIONS
+                rows.append((subject, question_item_id(assessment_id, index), student_id,
+                             grade_objective(question, answer)["correct"], default_guessing(options)))
+        yield rows
+
+def load_responses(batch_size=5000):
+    """
+    Stream all recorded responses into per-subject matrices.
+
+    Args:
+        batch_size: Rows fetched per database round trip
+
+    Returns:
+        Dict of {subject: ResponseMatrix}
+    """
+    matrices = {}
+
+    def add(subject, rows):
+        if subject not in matrices:
+            matrices[subject] = ResponseMatrix(subject)
+        matrices[subject].add(rows)
+
+    for batch in iter_responses(batch_size):
+        by_subject = {}
+        for item_id, student_id, correct, subject, guessing in batch:
+            by_subject.setdefault(subject, []).append((item_id, student_id, correct, guessing))
+        for subject, rows in by_subject.items():
+            add(subject, rows)
+    for batch in _stream_question_responses(batch_size):
+        by_subject = {}
+        for subject, item_id, student_id, correct, guessing in batch:
+            by_subject.setdefault(subject, []).append((item_id, student_id, correct, guessing))
+        for subject, rows in by_subject.items():
+            add(subject, rows)
+    return matrices
+
+def _newton_step(gradient, information, prior_mean, prior_sd, values, limit):
+    """One damped Fisher scoring step with a Gaussian prior."""
+    gradient = gradient - (values - prior_mean) / prior_sd ** 2
+    information = information + 1 / prior_sd ** 2
+    return values + np.clip(gradient / information, -limit, limit)
+
+def fit_items(people, items, correct, guessing, iterations=DEFAULT_ITERATIONS):
+    """
+    Fit item discrimination and difficulty by joint maximum likelihood.
+
+    Abilities and item parameters are updated in turn with Fisher scoring
+    steps, all of them sums over the response arrays (np.bincount), with
+    the guessing parameters held fixed.
+
+    Args:
+        people: Person code of each response (0..P-1)
+        items: Item code of each response (0..I-1)
+        correct: 1.0 for a correct response, else 0.0
+        guessing: Guessing parameter of each item
+        iterations: Most scoring rounds
+
+    Returns:
+        Dict with discrimination, difficulty, theta, responses (per item),
+        p_correct (per item) and iterations (rounds run)
+    """
+    n_people = int(people.max()) + 1 if len(people) else 0
+    n_items = len(guessing)
+    counts = np.bincount(items, minlength=n_items)
+    p_correct = np.bincount(items, correct, minlength=n_items) / np.maximum(counts, 1)
+
+    # Start difficulties from the share of correct answers above chance
+    above_chance = np.clip((p_correct - guessing) / (1 - guessing), 0.02, 0.98)
+    difficulty = np.clip(-np.log(above_chance / (1 - above_chance)) / SCALE, -4, 4)
+    discrimination = np.ones(n_items)
+    theta = np.zeros(n_people)
+    c = guessing[items]
+
+    def terms():
+        """Residual and information weights of every response."""
+        a = discrimination[items]
+        s = 1 / (1 + np.exp(-SCALE * a * (theta[people] - difficulty[items])))
+        p = np.clip(c + (1 - c) * s, 1e-9, 1 - 1e-9)
+        slope = (1 - c) * s * (1 - s)
+        return a, (correct - p) * slope / (p * (1 - p)), slope ** 2 / (p * (1 - p))
+
+    rounds = 0
+    for rounds in range(1, iterations + 1):
+        a, residual, weight = terms()
+        theta = _newton_step(np.bincount(people, SCALE * a * residual, n_people),
+                             np.bincount(people, (SCALE * a) ** 2 * weight, n_people),
+                             *THETA_PRIOR, theta, 1.0)
+        # Fixing the ability scale identifies the model and stops the
+        # discriminations inflating to make up for shrunken abilities
+        theta = (theta - theta.mean()) / max(theta.std(), 1e-6)
+
+        a, residual, weight = terms()
+        spread = theta[people] - difficulty[items]
+        previous = np.concatenate([difficulty, discrimination])
+        difficulty = _newton_step(np.bincount(items, -SCALE * a * residual, n_items),
+                                  np.bincount(items, (SCALE * a) ** 2 * weight, n_items),
+                                  *DIFFICULTY_PRIOR, difficulty, 1.0)
+        discrimination = np.clip(_newton_step(np.bincount(items, SCALE * spread * residual, n_items),
+                                              np.bincount(items, (SCALE * spread) ** 2 * weight, n_items),
+                                              *DISCRIMINATION_PRIOR, discrimination, 0.5), 0.2, 4.0)
+        if np.abs(np.concatenate([difficulty, discrimination]) - previous).max(initial=0) < TOLERANCE:
+            break
+
+    return {
+        "discrimination": discrimination,
+        "difficulty": difficulty,
+        "theta": theta,
+        "responses": counts,
+        "p_correct": p_correct,
+        "iterations": rounds
+    }
+
+def _fit_subject(job):
+    """Worker entry point: fit one subject's arrays."""
+    subject, arrays, iterations = job
+    return subject, fit_items(*arrays, iterations=iterations)
+
+def fit_subjects(matrices, workers=None, iterations=DEFAULT_ITERATIONS):
+    """
+    Fit every subject, in parallel processes when there are several.
+
+    Args:
+        matrices: Dict of {subject: ResponseMatrix}
+        workers: Number of worker processes (defaults to one per subject,
+            up to the CPU count); 1 fits in this process
+        iterations: Most scoring rounds per subject
+
+    Returns:
+        Dict of {subject: fit_items() result}
+    """
+    jobs = [(subject, matrix.arrays(), iterations) for subject, matrix in matrices.items() if len(matrix)]
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        return dict(map(_fit_subject, jobs))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(pool.map(_fit_subject, jobs))
+
+def calibrate(workers=None, min_responses=DEFAULT_MIN_RESPONSES, iterations=DEFAULT_ITERATIONS):
+    """
+    Calibrate every item with enough responses and save a new version.
+
+    Args:
+        workers: Number of worker processes (see fit_subjects)
+        min_responses: Fewest responses an item needs to be calibrated
+        iterations: Most scoring rounds per subject
+
+    Returns:
+        Dict with version (None if no item qualified), items, responses
+        and seconds
+    """
+    started = time.perf_counter()
+    matrices = load_responses()
+    fits = fit_subjects(matrices, workers, iterations)
+
+    parameters = []
+    for subject, fit in fits.items():
+        matrix = matrices[subject]
+        for index, item_id in enumerate(matrix.item_ids):
+            if fit["responses"][index] >= min_responses:
+                parameters.append({
+                    "item_id": item_id,
+                    "subject": subject,
+                    "discrimination": float(fit["discrimination"][index]),
+                    "difficulty": float(fit["difficulty"][index]),
+                    "guessing": float(matrix.guessing[index]),
+                    "responses": int(fit["responses"][index]),
+                    "p_correct": float(fit["p_correct"][index])
+                })
+
+    responses = sum(len(matrix) for matrix in matrices.values())
+    seconds = time.perf_counter() - started
+    version = save_calibration(parameters, responses, seconds) if parameters else None
+    return {"version": version, "items": len(parameters), "responses": responses, "seconds": round(seconds, 3)}
+
+def synthetic_responses(n_responses, subjects=4, items_per_subject=200, items_per_student=40, seed=0):
+    """
+    Simulate responses from known parameters for benchmarking.
+
+    Args:
+        n_responses: Total number of responses across subjects
+        subjects: Number of subjects
+        items_per_subject: Items in each subject's bank
+        items_per_student: Items each simulated student answers
+        seed: Random seed
+
+    Returns:
+        Dict of {subject: (arrays for fit_items(), true discrimination,
+        true difficulty)}
+    """
+    rng = np.random.default_rng(seed)
+    n_students = max(1, n_responses // (subjects * items_per_student))
+    data = {}
+    for number in range(subjects):
+        a = rng.lognormal(0.0, 0.3, items_per_subject)
+        b = rng.normal(0.0, 1.0, items_per_subject)
+        c = rng.choice([0.0, 0.2, 0.4], items_per_subject)
+        theta = rng.normal(0.0, 1.0, n_students)
+
+        # Each student answers a random subset of the bank
+        people = np.repeat(np.arange(n_students), items_per_student)
+        items = np.argsort(rng.random((n_students, items_per_subject)), axis=1)[:, :items_per_student].ravel()
+        p = c[items] + (1 - c[items]) / (1 + np.exp(-SCALE * a[items] * (theta[people] - b[items])))
+        correct = (rng.random(len(p)) < p).astype(float)
+        data[f"subject_{number}"] = ((people, items, correct, c), a, b)
+    return data
+
+def benchmark(n_responses=1_000_000, workers=None, iterations=DEFAULT_ITERATIONS, seed=0):
+    """
+    Time a calibration of synthetic responses and check parameter recovery.
+
+    Args:
+        n_responses: Total number of responses to simulate
+        workers: Number of worker processes (see fit_subjects)
+        iterations: Most scoring rounds per subject
+        seed: Random seed
+
+    Returns:
+        Dict with responses, seconds (serial and parallel) and the
+        difficulty and discrimination recovery (RMSE and correlation) per subject
+    """
+    data = synthetic_responses(n_responses, seed=seed)
+    jobs = [(subject, arrays, iterations) for subject, (arrays, _, _) in data.items()]
+
+    started = time.perf_counter()
+    serial = dict(map(_fit_subject, jobs))
+    serial_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, len(jobs))) as pool:
+        dict(pool.map(_fit_subject, jobs))
+    parallel_seconds = time.perf_counter() - started
+
+    recovery = {}
+    for subject, (_, a, b) in data.items():
+        fit = serial[subject]
+        recovery[subject] = {
+            "iterations": fit["iterations"],
+            "difficulty_rmse": round(float(np.sqrt(np.mean((fit["difficulty"] - b) ** 2))), 3),
+            "difficulty_corr": round(float(np.corrcoef(fit["difficulty"], b)[0, 1]), 3),
+            "discrimination_rmse": round(float(np.sqrt(np.mean((fit["discrimination"] - a) ** 2))), 3),
+            "discrimination_corr": round(float(np.corrcoef(fit["discrimination"], a)[0, 1]), 3)
+        }
+    return {
+        "responses": sum(len(arrays[0]) for arrays, _, _ in data.values()),
+        "serial_seconds": round(serial_seconds, 3),
+        "parallel_seconds": round(parallel_seconds, 3),
+        "recovery": recovery
+    }
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Calibrate EduTutor item parameters from recorded responses.")
+    parser.add_argument("--workers", "-w", type=int, help="Worker processes (default: one per subject)")
+    parser.add_argument("--min-responses", type=int, default=DEFAULT_MIN_RESPONSES,
+                        help="Fewest responses an item needs to be calibrated")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Most scoring rounds per subject")
+    parser.add_argument("--benchmark", action="store_true", help="Fit synthetic responses instead of the database")
+    parser.add_argument("--responses", type=int, default=1_000_000, help="Synthetic responses for --benchmark")
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        report = benchmark(args.responses, args.workers, args.iterations)
+    else:
+        report = calibrate(args.workers, args.min_responses, args.iterations)
+    print(json.dumps(report, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
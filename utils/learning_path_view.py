@@ -0,0 +1,313 @@
+from utils.templates import cached_fragment
+
+# Display settings for each subject on the Learning Path page. The session,
+# button and section settings keep the keys the page has always used.
+SUBJECT_VIEWS = {
+    "math": {
+        "label": "Math",
+        "title": "Mathematics",
+        "color": "#4285F4",
+        "tint": "#e8f0fe",
+        "session_key": "current_module",
+        "button_prefix": "math_module",
+        "section_name": "Lesson",
+        "sections": ["Introduction", "Core Concepts", "Practice Problems", "Advanced Applications"],
+        "section_note": "In a complete implementation, this would include interactive content, videos, and exercises.",
+        "continue_key": "continue_lesson",
+        "complete_key": "complete_module",
+        "complete_label": "Complete Module",
+        "complete_message": "Congratulations! You've completed this module.",
+        "objectives": [
+            "Understand key concepts related to {title}",
+            "Apply mathematical reasoning to solve problems",
+            "Develop critical thinking skills through practical examples"
+        ]
+    },
+    "science": {
+        "label": "Science",
+        "title": "Science",
+        "color": "#34A853",
+        "tint": "#e6f4ea",
+        "session_key": "current_science_module",
+        "button_prefix": "science_module",
+        "section_name": "Component",
+        "sections": ["Theoretical Concepts", "Lab Experiments", "Data Analysis", "Real-World Applications"],
+        "section_note": "In a complete implementation, this would include interactive simulations, video demonstrations, and laboratory guides.",
+        "section_info": {"Lab Experiments": "Virtual lab simulations would be available here in the full implementation."},
+        "continue_key": "continue_component",
+        "complete_key": "complete_science_module",
+        "complete_label": "Complete Science Module",
+        "complete_message": "Congratulations! You've completed this science module.",
+        "objectives": [
+            "Understand key principles of {title}",
+            "Apply scientific methodology to investigate concepts",
+            "Develop analytical skills through experiments and observation"
+        ]
+    },
+    "language_arts": {
+        "label": "Language Arts",
+        "title": "Language Arts",
+        "color": "#FBBC05",
+        "tint": "#fef7e0",
+        "session_key": "current_language_arts_module",
+        "button_prefix": "language_arts_module",
+        "section_name": "Unit",
+        "sections": ["Reading", "Discussion", "Writing Workshop", "Reflection"],
+        "section_note": "In a complete implementation, this would include annotated readings, writing prompts, and peer review.",
+        "continue_key": "continue_language_arts_unit",
+        "complete_key": "complete_language_arts_module",
+        "complete_label": "Complete Language Arts Module",
+        "complete_message": "Congratulations! You've completed this language arts module.",
+        "objectives": [
+            "Understand key ideas of {title}",
+            "Analyze texts closely and support claims with evidence",
+            "Express your ideas clearly in writing"
+        ]
+    },
+    "history": {
+        "label": "History",
+        "title": "History",
+        "color": "#EA4335",
+        "tint": "#fce8e6",
+        "session_key": "current_history_module",
+        "button_prefix": "history_module",
+        "section_name": "Chapter",
+        "sections": ["Context", "Primary Sources", "Interpretations", "Connections Today"],
+        "section_note": "In a complete implementation, this would include source documents, timelines, and maps.",
+        "continue_key": "continue_history_chapter",
+        "complete_key": "complete_history_module",
+        "complete_label": "Complete History Module",
+        "complete_message": "Congratulations! You've completed this history module.",
+        "objectives": [
+            "Understand the key events of {title}",
+            "Evaluate primary and secondary sources",
+            "Connect historical developments to the present"
+        ]
+    }
+}
+
+LEARNING_STYLE_VIEWS = {
+    "Visual": {
+        "icon": "👁️",
+        "color": "#4B8BF4",
+        "description": "You learn best through visual aids like charts, graphs, and images.",
+        "tips": [
+            "Use color-coding in your notes",
+            "Create mind maps for complex topics",
+            "Watch video tutorials when available",
+            "Transform text into diagrams"
+        ]
+    },
+    "Auditory": {
+        "icon": "👂",
+        "color": "#34A853",
+        "description": "You learn best through listening, discussions, and verbal explanations.",
+        "tips": [
+            "Record lessons to listen again later",
+            "Participate actively in study discussions",
+            "Explain concepts out loud to yourself",
+            "Use rhythm or music for memorization"
+        ]
+    },
+    "Reading/Writing": {
+        "icon": "✍️",
+        "color": "#FBBC05",
+        "description": "You learn best through text-based materials and writing.",
+        "tips": [
+            "Take detailed notes in your own words",
+            "Rewrite key concepts multiple times",
+            "Create written summaries of lessons",
+            "Use flashcards for key terms"
+        ]
+    },
+    "Kinesthetic": {
+        "icon": "🤸",
+        "color": "#EA4335",
+        "description": "You learn best through hands-on activities and physical experiences.",
+        "tips": [
+            "Use physical movement while studying",
+            "Create models or demonstrations",
+            "Take frequent, active breaks",
+            "Apply concepts to real-world scenarios"
+        ]
+    }
+}
+
+# The fragments below depend only on their arguments, so each distinct
+# card is rendered once per process and served from the fragment cache
+
+@cached_fragment
+def mastery_card_html(subject, level):
+    """
+    Render a subject's mastery card with one circle per level.
+
+    Args:
+        subject: Subject key
+        level: Mastery level between 0 and 10
+
+    Returns:
+        str: HTML for the card
+    """
+    view = SUBJECT_VIEWS[subject]
+    color = view["color"]
+    filled = f'<span style="display: inline-block; width: 15px; height: 15px; border-radius: 50%; background-color: {color}; margin-right: 4px;"></span>'
+    empty = f'<span style="display: inline-block; width: 15px; height: 15px; border-radius: 50%; border: 1px solid {color}; margin-right: 4px;"></span>'
+    progress_html = filled * level + empty * (10 - level)
+    return f"""
+    <div style="background-color: white; border-left: 4px solid {color}; padding: 1rem;
+        border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{view["label"]}</div>
+            <div style="font-size: 1rem; color: {color}; font-weight: 600;">Level {level}/10</div>
+        </div>
+        <div style="margin-top: 0.8rem;">
+            {progress_html}
+        </div>
+    </div>
+    """
+
+@cached_fragment
+def module_card_html(subject, icon, title, level, description, time):
+    """
+    Render a recommended module card.
+
+    Args:
+        subject: Subject key
+        icon: Module icon
+        title: Module title
+        level: Module level ("Beginner", "Intermediate" or "Advanced")
+        description: Module description
+        time: Estimated time
+
+    Returns:
+        str: HTML for the card
+    """
+    view = SUBJECT_VIEWS[subject]
+    return f"""
+    <div style="background-color: white; border-left: 4px solid {view["color"]}; padding: 1rem;
+        border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+        <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+            <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{icon} {title}</div>
+            <div style="background-color: {view["tint"]}; color: {view["color"]}; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem; font-weight: 500;">
+                {level}
+            </div>
+        </div>
+        <div style="color: #555; margin-bottom: 0.8rem; font-size: 0.95rem;">
+            {description}
+        </div>
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div style="color: #666; font-size: 0.9rem;">
+                <i>Estimated time: {time}</i>
+            </div>
+        </div>
+    </div>
+    """
+
+@cached_fragment
+def module_detail_html(subject, icon, title, difficulty, description):
+    """
+    Render the overview of the module a student has started.
+
+    Args:
+        subject: Subject key
+        icon: Module icon
+        title: Module title
+        difficulty: Module level shown as its difficulty
+        description: Module description
+
+    Returns:
+        str: HTML for the overview
+    """
+    view = SUBJECT_VIEWS[subject]
+    color, tint = view["color"], view["tint"]
+    objectives = "".join(f"<li>{objective.format(title=title.lower())}</li>" for objective in view["objectives"])
+    return f"""
+    <div style="background-color: #f8f9fa; padding: 1.5rem; border-radius: 0.8rem; margin: 1.5rem 0;
+        border-left: 4px solid {color};">
+        <h3 style="margin-top: 0; font-size: 1.4rem; color: {color}; display: flex; align-items: center;">
+            <span style="margin-right: 0.5rem;">{icon}</span> {title} Module
+        </h3>
+        <p style="color: #555; margin-bottom: 1rem;">
+            {description}
+        </p>
+        <div style="background-color: white; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;">
+            <h4 style="margin-top: 0; font-size: 1.1rem; color: #333;">Learning Objectives</h4>
+            <ul style="margin-bottom: 0; padding-left: 1.5rem; color: #555;">
+                {objectives}
+            </ul>
+        </div>
+        <div style="display: flex; justify-content: space-between; margin-top: 1.5rem;">
+            <div style="background-color: {tint}; color: {color}; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
+                <span style="font-weight: 500;">Difficulty:</span> {difficulty}
+            </div>
+            <div style="background-color: {tint}; color: {color}; padding: 0.5rem 1rem; border-radius: 4px; font-size: 0.9rem;">
+                <span style="font-weight: 500;">Subject:</span> {view["label"]}
+            </div>
+        </div>
+    </div>
+    """
+
+@cached_fragment
+def learning_style_html(learning_style):
+    """
+    Render the learning style card with study tips.
+
+    Args:
+        learning_style: The student's learning style
+
+    Returns:
+        str: HTML for the card
+    """
+    view = LEARNING_STYLE_VIEWS.get(learning_style, LEARNING_STYLE_VIEWS["Kinesthetic"])
+    tips = "".join(f'<li style="margin-bottom: 0.3rem;">{tip}</li>' for tip in view["tips"])
+    return f"""
+    <div style="background-color: white; border-left: 4px solid {view["color"]}; padding: 1.2rem;
+        border-radius: 0.5rem; margin-bottom: 1.5rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+        <div style="display: flex; align-items: center; margin-bottom: 0.8rem;">
+            <div style="background-color: {view["color"]}; color: white; height: 40px; width: 40px;
+                border-radius: 50%; display: flex; align-items: center; justify-content: center;
+                margin-right: 0.8rem; font-size: 1.5rem;">{view["icon"]}</div>
+            <div>
+                <div style="font-weight: 600; font-size: 1.2rem; color: #333;">{learning_style} Learner</div>
+                <div style="color: #666; font-size: 0.9rem;">Your primary learning style</div>
+            </div>
+        </div>
+        <div style="color: #555; margin-bottom: 1rem; font-size: 0.95rem; padding-left: 0.2rem;">
+            {view["description"]}
+        </div>
+        <div style="background-color: #f8f9fa; padding: 0.8rem; border-radius: 0.4rem;">
+            <div style="font-weight: 600; margin-bottom: 0.5rem; color: #333;">Study Tips for Your Style:</div>
+            <ul style="margin: 0; padding-left: 1.5rem; color: #555;">
+                {tips}
+            </ul>
+        </div>
+    </div>
+    """
+
+@cached_fragment
+def weak_areas_html(weak_areas):
+    """
+    Render the focus areas for the week.
+
+    Args:
+        weak_areas: Tuple of subject keys below the weak-area threshold
+
+    Returns:
+        str: HTML for the focus list
+    """
+    rows = "".join(f"""
+        <div style="display: flex; justify-content: space-between; align-items: center;
+            margin-bottom: 0.8rem; border-left: 3px solid {SUBJECT_VIEWS[subject]["color"]}; padding-left: 0.8rem;">
+            <div style="color: #333; font-weight: 500;">{SUBJECT_VIEWS[subject]["title"]}</div>
+            <div style="color: #666;">3 hours recommended</div>
+        </div>
+        """ for subject in weak_areas)
+    return f"""
+    <div style="background-color: white; padding: 1.2rem; border-radius: 0.5rem;
+        margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+        <div style="font-weight: 600; margin-bottom: 0.8rem; color: #333; font-size: 1.05rem;">
+            Focus areas this week:
+        </div>
+        {rows}
+    </div>
+    """
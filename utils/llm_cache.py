@@ -0,0 +1,333 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from utils.resources import register_resource
+
+# Default location of the on-disk cache tier; override with EDUTUTOR_LLM_CACHE_PATH
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "llm_cache.db"
+)
+
+DEFAULT_MEMORY_ENTRIES = 512
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_access ON llm_cache (last_access);
+"""
+
+def normalize_prompt(text):
+    """
+    Normalize prompt text so formatting-only differences share a cache entry.
+
+    Args:
+        text: Prompt or message text
+
+    Returns:
+        The text with runs of whitespace collapsed and ends stripped
+    """
+    return re.sub(r"\s+", " ", str(text)).strip()
+
+def make_cache_key(model, prompt, **params):
+    """
+    Build a content-addressed key for an LLM request.
+
+    Args:
+        model: Model name
+        prompt: Prompt string, or a list of chat messages
+        **params: Generation parameters that affect the output
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    if isinstance(prompt, list):
+        prompt = [{"role": m["role"], "content": normalize_prompt(m["content"])} for m in prompt]
+    else:
+        prompt = normalize_prompt(prompt)
+
+    payload = json.dumps({"model": model, "prompt": prompt, "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class _Flight:
+    """An in-progress computation that concurrent callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM responses with single-flight deduplication.
+
+    Responses live in an in-memory LRU and in a SQLite file shared by every
+    worker on the host. Entries expire after a TTL, and the disk tier is
+    trimmed by least-recent access once it exceeds its size budget. When
+    several sessions ask for the same uncached key at once, only the first
+    one calls the model and the others wait for its result.
+    """
+
+    def __init__(self, path=None, memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 disk_bytes=DEFAULT_DISK_BYTES, ttl=DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite file for the disk tier, or None to disable it
+            memory_entries: Maximum number of responses kept in memory
+            disk_bytes: Size budget of the disk tier in bytes
+            ttl: Seconds before an entry expires
+        """
+        self.path = path
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self.ttl = ttl
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._local = threading.local()
+        self._schema_ready = False
+
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self):
+        """Get this thread's connection to the disk tier."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(CACHE_SCHEMA)
+                self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    def _memory_get(self, key, now):
+        """Return a live value from the memory tier, or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+
+    def _memory_put(self, key, value, expires_at):
+        """Store a value in the memory tier, evicting the least recent entry."""
+        with self._lock:
+            self._memory[key] = (expires_at, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def _disk_get(self, key, now):
+        """Return (value, expires_at) from the disk tier, or None."""
+        if not self.path:
+            return None
+        try:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                with conn:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            with conn:
+                conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return json.loads(row[0]), row[1]
+        except sqlite3.Error:
+            # The disk tier is an optimization; never fail a grading request on it
+            return None
+
+    def _disk_put(self, key, value, expires_at, now):
+        """Store a value in the disk tier and enforce the size budget."""
+        if not self.path:
+            return
+        try:
+            encoded = json.dumps(value)
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, size, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, len(encoded), expires_at, now)
+                )
+                conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+                if total > self.disk_bytes:
+                    self._trim_disk(conn, total)
+        except (sqlite3.Error, TypeError, ValueError):
+            return
+
+    def _trim_disk(self, conn, total):
+        """Delete least recently used disk entries until under budget."""
+        excess = total - self.disk_bytes
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+
+    def get(self, key):
+        """
+        Look up a cached response.
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        now = time.time()
+        value = self._memory_get(key, now)
+        if value is not None:
+            return value
+
+        stored = self._disk_get(key, now)
+        if stored is not None:
+            value, expires_at = stored
+            self._memory_put(key, value, expires_at)
+            return value
+        return None
+
+    def put(self, key, value):
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Key from make_cache_key
+            value: JSON-serializable response
+        """
+        now = time.time()
+        expires_at = now + self.ttl
+        self._memory_put(key, value, expires_at)
+        self._disk_put(key, value, expires_at, now)
+
+    def record_hit(self):
+        """Count a request answered from the cache (e.g. a replayed stream)."""
+        with self._lock:
+            self.hits += 1
+
+    def record_miss(self):
+        """Count a request that had to call the model."""
+        with self._lock:
+            self.misses += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached response for key, computing it at most once.
+
+        Args:
+            key: Key from make_cache_key
+            compute: Zero-argument callable that calls the model; exceptions
+                propagate to every waiting caller and nothing is cached
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is not None:
+            self.record_hit()
+            return value
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+        if not leader:
+            # Another session is already asking the model the same question
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            self.record_hit()
+            return flight.value
+
+        self.record_miss()
+        try:
+            flight.value = compute()
+            if flight.value is not None:
+                self.put(key, flight.value)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+        if self.path:
+            try:
+                conn = self._connection()
+                with conn:
+                    conn.execute("DELETE FROM llm_cache")
+            except sqlite3.Error:
+                pass
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_response_cache():
+    """
+    Get the process-wide LLM response cache.
+
+    The cache is configured from EDUTUTOR_LLM_CACHE_PATH (set to an empty
+    string to keep the cache in memory only), EDUTUTOR_LLM_CACHE_SIZE,
+    EDUTUTOR_LLM_CACHE_DISK_BYTES and EDUTUTOR_LLM_CACHE_TTL.
+
+    Returns:
+        The shared ResponseCache instance
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    path=os.environ.get("EDUTUTOR_LLM_CACHE_PATH", DEFAULT_CACHE_PATH) or None,
+                    memory_entries=int(os.environ.get("EDUTUTOR_LLM_CACHE_SIZE", DEFAULT_MEMORY_ENTRIES)),
+                    disk_bytes=int(os.environ.get("EDUTUTOR_LLM_CACHE_DISK_BYTES", DEFAULT_DISK_BYTES)),
+                    ttl=float(os.environ.get("EDUTUTOR_LLM_CACHE_TTL", DEFAULT_TTL_SECONDS))
+                )
+    return _cache
+
+def _cache_health(cache):
+    """Hit counts and tier status of the response cache."""
+    details = {"memory_entries": len(cache._memory), "hits": cache.hits, "misses": cache.misses}
+    if cache.path:
+        cache._connection().execute("SELECT 1 FROM llm_cache LIMIT 1")
+        details["disk_path"] = cache.path
+    return details
+
+register_resource("llm_cache", get_response_cache, health=_cache_health)
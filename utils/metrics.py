@@ -0,0 +1,331 @@
+"""
+Timing spans for the app's hot paths.
+
+Data access, grading, LLM calls, chart building and page renders are
+wrapped in named spans. While metrics are enabled (EDUTUTOR_METRICS=1),
+each span's durations go into a process-wide histogram: cumulative bucket
+counts for export, plus a rolling window of recent samples for the
+percentiles on the teacher diagnostics page. While disabled, a span is a
+shared no-op context manager and a timed function costs one flag check.
+
+Set EDUTUTOR_METRICS_EXPORT to a file path to have each worker write its
+metrics there (at most every EDUTUTOR_METRICS_EXPORT_SECONDS), as
+Prometheus text, or as JSON when the path ends in ".json". A "{pid}" in
+the path keeps workers from overwriting each other's files.
+
+Usage:
+    with span("grading.essay"):
+        ...
+
+    @timed("data.get_all_students")
+    def get_all_students():
+        ...
+"""
+import os
+import json
+import time
+import bisect
+import threading
+from functools import wraps
+from contextlib import nullcontext
+from collections import deque
+from utils.resources import register_resource
+
+# Bucket upper bounds in seconds, from sub-millisecond lookups to slow LLM calls
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DEFAULT_WINDOW = 512
+DEFAULT_EXPORT_SECONDS = 15
+METRIC_NAME = "edututor_span_seconds"
+
+_enabled = os.environ.get("EDUTUTOR_METRICS", "0") == "1"
+_NULL_SPAN = nullcontext()
+
+class Histogram:
+    """Durations of one span: cumulative buckets plus a window of recent samples."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Initialize the histogram.
+
+        Args:
+            window: Number of recent samples kept for percentiles
+        """
+        self.bucket_counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        """
+        Record one duration.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        self.bucket_counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dict with the total count and sum, and the mean, p50, p95 and
+            max in milliseconds over the recent window
+        """
+        recent = sorted(self.recent)
+        if not recent:
+            return {"count": self.count, "sum_seconds": self.total}
+
+        def percentile(q):
+            return recent[min(len(recent) - 1, int(q * len(recent)))] * 1000
+
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.total, 6),
+            "mean_ms": round(sum(recent) / len(recent) * 1000, 3),
+            "p50_ms": round(percentile(0.5), 3),
+            "p95_ms": round(percentile(0.95), 3),
+            "max_ms": round(recent[-1] * 1000, 3)
+        }
+
+class MetricsRegistry:
+    """Histograms by span name, shared by every session in the process."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        """
+        Initialize the registry.
+
+        Args:
+            window: Number of recent samples kept per span
+        """
+        self.window = window
+        self.started_at = time.time()
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        """
+        Record a duration for a span.
+
+        Args:
+            name: Span name
+            seconds: Duration in seconds
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.window)
+            histogram.observe(seconds)
+
+    def snapshot(self):
+        """
+        Summarize every span.
+
+        Returns:
+            Dict of {span name: Histogram.summary()} sorted by name
+        """
+        with self._lock:
+            return {name: self._histograms[name].summary() for name in sorted(self._histograms)}
+
+    def reset(self):
+        """Forget every recorded duration."""
+        with self._lock:
+            self._histograms.clear()
+            self.started_at = time.time()
+
+    def to_json(self):
+        """
+        Render the metrics as JSON.
+
+        Returns:
+            str: JSON with the process ID, start time and span summaries
+        """
+        return json.dumps({"pid": os.getpid(), "started_at": self.started_at, "spans": self.snapshot()},
+                          indent=2)
+
+    def to_prometheus(self):
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: One histogram family labelled by span name
+        """
+        lines = [f"# HELP {METRIC_NAME} Duration of instrumented EduTutor spans.",
+                 f"# TYPE {METRIC_NAME} histogram"]
+        with self._lock:
+            histograms = [(name, list(h.bucket_counts), h.count, h.total)
+                          for name, h in sorted(self._histograms.items())]
+        for name, bucket_counts, count, total in histograms:
+            label = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, bucket_counts):
+                cumulative += bucket_count
+                lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{METRIC_NAME}_bucket{{span="{label}",le="+Inf"}} {count}')
+            lines.append(f'{METRIC_NAME}_sum{{span="{label}"}} {total:.6f}')
+            lines.append(f'{METRIC_NAME}_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """
+        Write the metrics to a file, replacing it atomically.
+
+        Args:
+            path: Destination; JSON if it ends in ".json", Prometheus text otherwise
+        """
+        path = path.replace("{pid}", str(os.getpid()))
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        text = self.to_json() if path.endswith(".json") else self.to_prometheus()
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+_registry = None
+_registry_lock = threading.Lock()
+_last_export = 0.0
+
+def get_metrics_registry():
+    """
+    Get the process-wide metrics registry.
+
+    The rolling window size is read from EDUTUTOR_METRICS_WINDOW.
+
+    Returns:
+        The shared MetricsRegistry instance
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(int(os.environ.get("EDUTUTOR_METRICS_WINDOW", DEFAULT_WINDOW)))
+    return _registry
+
+register_resource(
+    "metrics",
+    get_metrics_registry,
+    health=lambda registry: {"enabled": _enabled, "spans": len(registry.snapshot())}
+)
+
+def metrics_enabled():
+    """
+    Check whether spans are being recorded.
+
+    Returns:
+        True if metrics are enabled
+    """
+    return _enabled
+
+def set_metrics_enabled(enabled):
+    """
+    Turn span recording on or off for this process.
+
+    Args:
+        enabled: True to record spans
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+class _Span:
+    """Context manager that records its duration on exit."""
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        get_metrics_registry().observe(self.name, time.perf_counter() - self.started)
+        return False
+
+def span(name):
+    """
+    Time a block of code.
+
+    Args:
+        name: Span name, dotted by area ("data.", "grading.", "llm.", "chart.", "render.")
+
+    Returns:
+        Context manager recording the block's duration, or a shared no-op
+        one while metrics are disabled
+    """
+    return _Span(name) if _enabled else _NULL_SPAN
+
+def timed(name):
+    """
+    Decorator that times every call of a function.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorator for the function
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                get_metrics_registry().observe(name, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+def start_timer():
+    """
+    Start timing a span that does not fit in a with block.
+
+    Returns:
+        Start time for observe_since(), or None while metrics are disabled
+    """
+    return time.perf_counter() if _enabled else None
+
+def observe_since(name, started):
+    """
+    Record the time since start_timer().
+
+    Args:
+        name: Span name
+        started: Value returned by start_timer()
+    """
+    if started is not None:
+        get_metrics_registry().observe(name, time.perf_counter() - started)
+
+def export_metrics(force=False):
+    """
+    Write the metrics to EDUTUTOR_METRICS_EXPORT if it is due.
+
+    Cheap enough to call at the end of every script run: it does nothing
+    while metrics are disabled or no export path is set, and otherwise
+    writes at most once per EDUTUTOR_METRICS_EXPORT_SECONDS.
+
+    Args:
+        force: Write even if the interval has not elapsed
+
+    Returns:
+        True if the file was written
+    """
+    global _last_export
+    path = os.environ.get("EDUTUTOR_METRICS_EXPORT")
+    if not _enabled or not path:
+        return False
+    now = time.time()
+    interval = float(os.environ.get("EDUTUTOR_METRICS_EXPORT_SECONDS", DEFAULT_EXPORT_SECONDS))
+    if not force and now - _last_export < interval:
+        return False
+    _last_export = now
+    get_metrics_registry().export(path)
+    return True
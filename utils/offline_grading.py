@@ -0,0 +1,316 @@
+import os
+import re
+
+# Grades at or above this confidence are returned without calling the model;
+# override with EDUTUTOR_OFFLINE_CONFIDENCE (0 = always offline, >1 = never)
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+OBJECTIVE_TYPES = ("multiple_choice", "true_false")
+
+# Flesch reading ease band expected of school essays
+READABILITY_TARGET = (30, 70)
+
+STOPWORDS = {
+    "about", "above", "after", "again", "also", "analyze", "analysis", "based", "because", "before",
+    "being", "between", "both", "consider", "could", "describe", "discuss", "during", "each",
+    "explain", "factors", "from", "have", "into", "more", "most", "other", "over", "provide",
+    "should", "some", "such", "suggest", "than", "that", "their", "them", "then", "there",
+    "these", "they", "this", "those", "through", "under", "very", "were", "what", "when",
+    "where", "which", "while", "with", "within", "would", "your"
+}
+
+WORD_PATTERN = re.compile(r"[A-Za-z']+")
+SENTENCE_PATTERN = re.compile(r"[.!?]+")
+VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+def get_confidence_threshold():
+    """
+    Get the confidence an offline grade needs to skip the model.
+
+    Returns:
+        float: Threshold from EDUTUTOR_OFFLINE_CONFIDENCE, or the default
+    """
+    try:
+        return float(os.environ.get("EDUTUTOR_OFFLINE_CONFIDENCE", DEFAULT_CONFIDENCE_THRESHOLD))
+    except ValueError:
+        return DEFAULT_CONFIDENCE_THRESHOLD
+
+def is_confident(result, threshold=None):
+    """
+    Check whether an offline grade can be used as the final grade.
+
+    Args:
+        result: Result from grade_objective, prescore_short_answer or prescore_essay
+        threshold: Optional threshold (defaults to get_confidence_threshold())
+
+    Returns:
+        bool: True if the result's confidence meets the threshold
+    """
+    if threshold is None:
+        threshold = get_confidence_threshold()
+    return result.get("confidence", 0) >= threshold
+
+def normalize_answer(value):
+    """Case- and whitespace-insensitive form of an answer for exact comparison."""
+    return re.sub(r"\s+", " ", str(value or "")).strip().casefold()
+
+def _answer_forms(answer, options):
+    """The normalized answer plus the option text or letter it corresponds to."""
+    forms = {normalize_answer(answer)}
+    if isinstance(options, dict):
+        labeled = list(options.items())
+    else:
+        labeled = [("ABCDEFGH"[i], option) for i, option in enumerate(options or [])]
+    for label, option in labeled:
+        if normalize_answer(label) in forms or normalize_answer(option) in forms:
+            forms.update((normalize_answer(label), normalize_answer(option)))
+    return forms
+
+def is_objective(question):
+    """
+    Check whether a question can be graded exactly against an answer key.
+
+    Args:
+        question: Question dictionary
+
+    Returns:
+        bool: True for multiple choice and true/false items with a correct answer
+    """
+    return question.get("type") in OBJECTIVE_TYPES and question.get("correct_answer") not in (None, "")
+
+def grade_objective(question, answer):
+    """
+    Grade a multiple choice or true/false answer exactly.
+
+    Answers match the key regardless of case and spacing, and an option
+    letter matches the option text it labels.
+
+    Args:
+        question: Question dictionary with "correct_answer" (and "options")
+        answer: The student's answer
+
+    Returns:
+        Dict with score (0 or 100), correct flag, feedback and confidence 1.0
+    """
+    correct_answer = question.get("correct_answer")
+    is_correct = normalize_answer(correct_answer) in _answer_forms(answer, question.get("options"))
+    return {
+        "score": 100 if is_correct else 0,
+        "correct": is_correct,
+        "feedback": "Correct!" if is_correct else f"Incorrect. The correct answer is {correct_answer}.",
+        "confidence": 1.0,
+        "grading_tier": "offline"
+    }
+
+def _content_words(text):
+    """Lower-cased content words of text, without stopwords and short words."""
+    return [word for word in WORD_PATTERN.findall(str(text or "").lower())
+            if len(word) > 3 and word not in STOPWORDS]
+
+def _stem(word):
+    """Crude prefix stem so "industrial" and "industrialization" match."""
+    return word[:6]
+
+def keyword_coverage(text, reference):
+    """
+    Get the fraction of the reference's key terms that appear in text.
+
+    Args:
+        text: Student text
+        reference: Prompt, rubric or model answer the key terms come from
+
+    Returns:
+        Tuple of (coverage between 0 and 1, sorted list of missing terms)
+    """
+    keywords = {}
+    for word in _content_words(reference):
+        keywords.setdefault(_stem(word), word)
+    if not keywords:
+        return 1.0, []
+    present = {_stem(word) for word in _content_words(text)}
+    missing = sorted(word for stem, word in keywords.items() if stem not in present)
+    return 1 - len(missing) / len(keywords), missing
+
+def _syllables(word):
+    """Estimate the number of syllables in a word."""
+    word = word.lower().strip("'")
+    count = len(VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith("le") and count > 1:
+        count -= 1
+    return max(1, count)
+
+def readability(text):
+    """
+    Compute the Flesch reading ease of text.
+
+    Args:
+        text: Text to score
+
+    Returns:
+        float: Reading ease (higher is easier; school essays are usually 30-70)
+    """
+    words = WORD_PATTERN.findall(text)
+    if not words:
+        return 0.0
+    sentences = max(1, len([s for s in SENTENCE_PATTERN.split(text) if s.strip()]))
+    syllables = sum(_syllables(word) for word in words)
+    return 206.835 - 1.015 * (len(words) / sentences) - 84.6 * (syllables / len(words))
+
+def _length_score(word_count, word_min, word_max):
+    """Score how well a word count meets the limits (100 inside the range; either limit may be None)."""
+    if word_min and word_count < word_min:
+        return 100 * word_count / word_min
+    if word_max and word_count > word_max:
+        # Going over is penalized gently: 10 points per 10% over the limit
+        return max(50, 100 - 100 * (word_count - word_max) / word_max)
+    return 100
+
+def _readability_score(ease):
+    """Score reading ease against the target band (100 inside the band)."""
+    low, high = READABILITY_TARGET
+    if ease < low:
+        return max(40, 100 - (low - ease) * 2)
+    if ease > high:
+        return max(40, 100 - (ease - high) * 2)
+    return 100
+
+def prescore_short_answer(answer, question):
+    """
+    Pre-score a short answer against the question's model answer or rubric.
+
+    Args:
+        answer: The student's answer
+        question: Question dictionary with "sample_answer" or "rubric"
+
+    Returns:
+        Dict with score, feedback and confidence
+    """
+    reference = question.get("sample_answer") or question.get("rubric") or ""
+    words = len(WORD_PATTERN.findall(answer or ""))
+
+    if words == 0:
+        return {"score": 0, "feedback": "No answer was submitted.", "confidence": 1.0,
+                "grading_tier": "offline"}
+    if not reference:
+        return {"score": 70, "feedback": "", "confidence": 0.0, "grading_tier": "offline"}
+
+    coverage, missing = keyword_coverage(answer, reference)
+    score = round(40 + 60 * coverage)
+    # Only near-complete coverage of the model answer is trusted without the model;
+    # a short partial answer may still be right in other words
+    confidence = 0.9 if coverage >= 0.8 else 0.4
+    feedback = "Your answer covers the key ideas of the model answer."
+    if missing:
+        feedback = f"Your answer could also address: {', '.join(missing[:5])}."
+    return {"score": score, "feedback": feedback, "confidence": confidence, "grading_tier": "offline"}
+
+def prescore_essay(essay_text, prompt, criteria, word_min=None, word_max=None):
+    """
+    Pre-score an essay from cheap text features.
+
+    The features are the word count against the limits, Flesch reading
+    ease, and how many key terms of the prompt and criteria the essay uses.
+    They are enough to grade essays that clearly miss the requirements
+    (far too short, or off topic) with high confidence; essays that meet
+    them get a low confidence so the model makes the final call. Length
+    only counts when the assignment sets a limit.
+
+    Args:
+        essay_text: The student's essay
+        prompt: The essay prompt
+        criteria: Dictionary of grading criteria and weights
+        word_min: Optional minimum word count of the assignment
+        word_max: Optional maximum word count of the assignment
+
+    Returns:
+        Dict in the evaluate_essay format plus "confidence" and "features"
+    """
+    word_count = len(WORD_PATTERN.findall(essay_text or ""))
+    ease = readability(essay_text or "")
+    coverage, missing = keyword_coverage(essay_text, f"{prompt} {' '.join(criteria)}")
+    paragraphs = len([p for p in re.split(r"\n\s*\n", essay_text or "") if p.strip()])
+
+    has_limits = bool(word_min or word_max)
+    readability_score = _readability_score(ease) if word_count else 0
+    coverage_score = 100 * coverage
+    structure_score = min(100, 55 + 15 * paragraphs) if word_count else 0
+
+    if has_limits:
+        base = 0.4 * _length_score(word_count, word_min, word_max) + 0.4 * coverage_score + 0.2 * readability_score
+    else:
+        base = (0.4 * coverage_score + 0.2 * readability_score) / 0.6
+
+    criteria_scores = {}
+    for criterion in criteria:
+        name = criterion.lower()
+        if any(term in name for term in ("organization", "structure")):
+            value = (base + structure_score) / 2
+        elif any(term in name for term in ("grammar", "language", "style")):
+            value = (base + readability_score) / 2
+        else:
+            value = base
+        criteria_scores[criterion] = int(round(min(100, max(0, value))))
+
+    total_weight = sum(criteria.values())
+    overall_score = round(sum(criteria_scores[c] * w for c, w in criteria.items()) / total_weight) \
+        if total_weight else round(base)
+
+    # How sure the features alone are about the grade
+    if word_count == 0 or (word_min and word_count < 0.25 * word_min):
+        confidence = 0.95
+    elif word_min and word_count < 0.5 * word_min:
+        confidence = 0.85
+    elif coverage < 0.1:
+        confidence = 0.8
+    else:
+        confidence = 0.5
+
+    strengths = []
+    areas_for_improvement = []
+    if word_min and word_count < word_min:
+        areas_for_improvement.append(
+            f"Develop your essay further: it has {word_count} words and the minimum is {word_min}"
+        )
+    elif word_max and word_count > word_max:
+        areas_for_improvement.append(f"Tighten your essay to at most {word_max} words (currently {word_count})")
+    elif has_limits:
+        strengths.append(f"Meets the length requirement ({word_count} words)")
+    if coverage >= 0.6:
+        strengths.append("Engages with the key terms of the prompt")
+    else:
+        areas_for_improvement.append(
+            "Address the prompt more directly" + (f", e.g. {', '.join(missing[:4])}" if missing else "")
+        )
+    if readability_score == 100:
+        strengths.append("Sentences are clear and readable")
+    elif word_count:
+        areas_for_improvement.append(
+            "Simplify long sentences" if ease < READABILITY_TARGET[0] else "Use more developed, varied sentences"
+        )
+
+    if has_limits:
+        required = f"{word_min}-{word_max}" if word_min and word_max else \
+            f"at least {word_min}" if word_min else f"at most {word_max}"
+        length = f"{word_count} words (required {required})"
+    else:
+        length = f"{word_count} words"
+    detailed_feedback = (
+        f"Automated pre-assessment: {length}, "
+        f"reading ease {ease:.0f}, {coverage:.0%} of the prompt's key terms covered."
+    )
+
+    return {
+        "overall_score": overall_score,
+        "criteria_scores": criteria_scores,
+        "strengths": strengths,
+        "areas_for_improvement": areas_for_improvement,
+        "detailed_feedback": detailed_feedback,
+        "confidence": confidence,
+        "grading_tier": "offline",
+        "features": {
+            "word_count": word_count,
+            "readability": round(ease, 1),
+            "keyword_coverage": round(coverage, 3),
+            "paragraphs": paragraphs
+        }
+    }
@@ -0,0 +1,618 @@
+import os
+import json
+import threading
+import streamlit as st
+from openai import OpenAI
+from utils.llm_cache import get_response_cache, make_cache_key
+from utils.stub_llm import STUB_BACKEND, StubOpenAIClient, stub_enabled
+from utils.resources import register_resource
+
+# The newest OpenAI model is "gpt-4o" which was released May 13, 2024.
+# Do not change this unless explicitly requested by the user
+DEFAULT_MODEL = "gpt-4o"
+
+_client = None
+_client_config = None
+_client_lock = threading.Lock()
+
+def get_openai_client():
+    """
+    Get the OpenAI client shared by all sessions.
+    
+    The client is created once per API key (or once for the stub backend)
+    and reused; OpenAI clients are safe to share between threads.
+    
+    Returns:
+        OpenAI client instance or None if API key is not available
+    """
+    global _client, _client_config
+    config = STUB_BACKEND if stub_enabled() else os.environ.get("OPENAI_API_KEY")
+    if not config:
+        return None
+    
+    if _client is None or _client_config != config:
+        with _client_lock:
+            if _client is None or _client_config != config:
+                _client = StubOpenAIClient() if config == STUB_BACKEND else OpenAI(api_key=config)
+                _client_config = config
+    return _client
+
+def _client_health(client):
+    """Health details of the shared client (no request is made)."""
+    return {"backend": "stub" if isinstance(client, StubOpenAIClient) else "openai" if client else "none"}
+
+def check_openai_available():
+    """
+    Check if OpenAI integration is available.
+    
+    Returns:
+        bool: True if OpenAI API key is available, False otherwise
+    """
+    return stub_enabled() or os.environ.get("OPENAI_API_KEY") is not None
+
+register_resource("openai_client", get_openai_client, health=_client_health)
+
+def create_chat_completion(client, messages, model=DEFAULT_MODEL, **params):
+    """
+    Call the chat completions API through the shared response cache.
+    
+    Identical requests (after whitespace normalization) are answered from the
+    cache, and concurrent identical requests share a single API call.
+    
+    Args:
+        client: OpenAI client from get_openai_client()
+        messages: List of chat messages
+        model: Model name
+        **params: Extra parameters for chat.completions.create
+        
+    Returns:
+        str: The content of the first choice
+    """
+    def request():
+        response = client.chat.completions.create(model=model, messages=messages, **params)
+        return response.choices[0].message.content
+    
+    key = make_cache_key(model, messages, **params)
+    return get_response_cache().get_or_compute(key, request)
+
+def grade_essay(essay_text, prompt, criteria, raise_errors=False):
+    """
+    Grade an essay submission using OpenAI.
+    
+    Args:
+        essay_text (str): The student's essay text
+        prompt (str): The original essay prompt
+        criteria (dict): Dictionary with grading criteria and their weights
+        raise_errors (bool): Re-raise API errors instead of falling back to
+            mock grading, so callers can retry
+        
+    Returns:
+        dict: Grading results including score, criteria_scores, and detailed feedback
+    """
+    client = get_openai_client()
+    
+    if not client:
+        # Fallback to mock grading if OpenAI integration is not available
+        return mock_grade_essay(essay_text, prompt, criteria)
+    
+    # Prepare the grading criteria as a formatted string
+    criteria_text = "\n".join([f"- {name} ({weight}%)" for name, weight in criteria.items()])
+    
+    # Create the system prompt for GPT
+    system_prompt = f"""
+    You are an expert essay grader with years of experience in education. 
+    Evaluate the student essay based on the following criteria:
+    
+    {criteria_text}
+    
+    Provide a detailed analysis and scoring for each criterion. 
+    Be fair, objective, and constructive in your evaluation. 
+    
+    Return your evaluation as a JSON object with the following structure:
+    {{
+        "overall_score": (integer between 0 and 100),
+        "criteria_scores": {{
+            "criterion1": (score between 0 and 100),
+            "criterion2": (score between 0 and 100),
+            ...
+        }},
+        "strengths": [
+            "strength1",
+            "strength2",
+            ...
+        ],
+        "areas_for_improvement": [
+            "area1",
+            "area2",
+            ...
+        ],
+        "detailed_feedback": "comprehensive paragraph with detailed assessment"
+    }}
+    """
+    
+    # Create the user prompt with the essay information
+    user_prompt = f"""
+    Essay Prompt: {prompt}
+    
+    Student Essay:
+    {essay_text}
+    
+    Please grade this essay based on the criteria provided.
+    """
+    
+    try:
+        # Call the OpenAI API
+        content = create_chat_completion(
+            client,
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"}
+        )
+        
+        # Parse the response
+        result = json.loads(content)
+        
+        # Validate and ensure all required fields are present
+        if "overall_score" not in result:
+            result["overall_score"] = 75  # Default score if missing
+            
+        if "criteria_scores" not in result:
+            result["criteria_scores"] = {criterion: 75 for criterion in criteria.keys()}
+            
+        if "strengths" not in result:
+            result["strengths"] = ["Clear effort shown in the essay"]
+            
+        if "areas_for_improvement" not in result:
+            result["areas_for_improvement"] = ["Continue developing your writing skills"]
+            
+        if "detailed_feedback" not in result:
+            result["detailed_feedback"] = "The essay shows understanding of the topic but could be improved with more detailed analysis."
+            
+        return result
+        
+    except Exception as e:
+        if raise_errors:
+            raise
+        st.error(f"Error during essay grading: {str(e)}")
+        # Fall back to mock grading if the API call fails
+        return mock_grade_essay(essay_text, prompt, criteria)
+
+def essay_result_events(result):
+    """
+    Replay a complete grading result as the events stream_grade_essay yields.
+    
+    Args:
+        result (dict): Grading result from grade_essay or mock_grade_essay
+        
+    Yields:
+        dict: Grading events, ending with a "done" event
+    """
+    for criterion, score in result.get("criteria_scores", {}).items():
+        yield {"type": "criterion", "name": criterion, "score": score}
+    yield {"type": "overall", "score": result.get("overall_score", 75)}
+    for strength in result.get("strengths", []):
+        yield {"type": "strength", "text": strength}
+    for area in result.get("areas_for_improvement", []):
+        yield {"type": "improvement", "text": area}
+    if result.get("detailed_feedback"):
+        yield {"type": "feedback", "text": result["detailed_feedback"]}
+    yield {"type": "done", "result": result}
+
+class _EssayStreamParser:
+    """
+    Incrementally parse the line-based grading format into events.
+    
+    Every line before FEEDBACK is a complete item, so it is emitted as soon as
+    its newline arrives. Everything after "FEEDBACK:" is free text and is
+    passed through as it streams in.
+    """
+    
+    def __init__(self, criteria):
+        self.criteria = criteria
+        self.buffer = ""
+        self.in_feedback = False
+        self.result = {
+            "criteria_scores": {},
+            "strengths": [],
+            "areas_for_improvement": [],
+            "detailed_feedback": ""
+        }
+    
+    def _parse_line(self, line):
+        """Turn one complete line into an event, or None if it is not recognized."""
+        tag, _, value = line.partition(":")
+        tag, value = tag.strip(), value.strip()
+        try:
+            if tag.upper().startswith("SCORE "):
+                name, score = tag[6:].strip(), int(float(value))
+                self.result["criteria_scores"][name] = score
+                return {"type": "criterion", "name": name, "score": score}
+            if tag.upper() == "OVERALL":
+                self.result["overall_score"] = int(float(value))
+                return {"type": "overall", "score": self.result["overall_score"]}
+        except ValueError:
+            return None
+        if tag.upper() == "STRENGTH" and value:
+            self.result["strengths"].append(value)
+            return {"type": "strength", "text": value}
+        if tag.upper() == "IMPROVEMENT" and value:
+            self.result["areas_for_improvement"].append(value)
+            return {"type": "improvement", "text": value}
+        return None
+    
+    def _feedback(self, text):
+        self.result["detailed_feedback"] += text
+        return {"type": "feedback", "text": text}
+    
+    def feed(self, text):
+        """
+        Consume a chunk of model output.
+        
+        Args:
+            text (str): Newly streamed text
+            
+        Returns:
+            list: Events completed by this chunk
+        """
+        if self.in_feedback:
+            return [self._feedback(text)] if text else []
+        
+        events = []
+        self.buffer += text
+        while True:
+            stripped = self.buffer.lstrip()
+            if stripped.upper().startswith("FEEDBACK:"):
+                self.in_feedback = True
+                remainder = stripped[len("FEEDBACK:"):].lstrip(" ")
+                self.buffer = ""
+                if remainder:
+                    events.append(self._feedback(remainder))
+                return events
+            line, newline, rest = self.buffer.partition("\n")
+            if not newline:
+                return events
+            self.buffer = rest
+            event = self._parse_line(line)
+            if event:
+                events.append(event)
+    
+    def finish(self):
+        """
+        Flush any buffered text and complete the result.
+        
+        Returns:
+            list: Remaining events, ending with a "done" event
+        """
+        events = []
+        if self.buffer.strip():
+            event = self._parse_line(self.buffer)
+            if event:
+                events.append(event)
+        self.buffer = ""
+        
+        result = self.result
+        result["detailed_feedback"] = result["detailed_feedback"].strip()
+        if "overall_score" not in result:
+            scores = result["criteria_scores"]
+            total_weight = sum(self.criteria.get(name, 0) for name in scores)
+            result["overall_score"] = round(
+                sum(score * self.criteria.get(name, 0) for name, score in scores.items()) / total_weight
+            ) if total_weight else 75
+            events.append({"type": "overall", "score": result["overall_score"]})
+        events.append({"type": "done", "result": result})
+        return events
+
+def stream_grade_essay(essay_text, prompt, criteria):
+    """
+    Grade an essay, yielding scores and feedback as the model produces them.
+    
+    The model is asked for a line-based format (criterion scores first, then
+    the overall score, strengths, improvements and finally the feedback
+    paragraph) so each item can be shown as soon as its line is complete.
+    Results already in the response cache are replayed immediately. If the
+    backend cannot stream, or the stream breaks, the blocking grade_essay
+    call is used instead.
+    
+    Args:
+        essay_text (str): The student's essay text
+        prompt (str): The original essay prompt
+        criteria (dict): Dictionary with grading criteria and their weights
+        
+    Yields:
+        dict: Events with a "type" of "criterion", "overall", "strength",
+        "improvement", "feedback" (a chunk of text) or "done" (the full result)
+    """
+    client = get_openai_client()
+    
+    if not client:
+        yield from essay_result_events(mock_grade_essay(essay_text, prompt, criteria))
+        return
+    
+    criteria_text = "\n".join([f"- {name} ({weight}%)" for name, weight in criteria.items()])
+    
+    system_prompt = f"""
+    You are an expert essay grader with years of experience in education. 
+    Evaluate the student essay based on the following criteria:
+    
+    {criteria_text}
+    
+    Be fair, objective, and constructive in your evaluation. 
+    
+    Respond in plain text, one item per line, in exactly this order:
+    SCORE <criterion name>: <score between 0 and 100>   (one line per criterion)
+    OVERALL: <integer between 0 and 100>
+    STRENGTH: <strength>   (one line per strength)
+    IMPROVEMENT: <area for improvement>   (one line per area)
+    FEEDBACK: <comprehensive paragraph with detailed assessment>
+    """
+    
+    user_prompt = f"""
+    Essay Prompt: {prompt}
+    
+    Student Essay:
+    {essay_text}
+    
+    Please grade this essay based on the criteria provided.
+    """
+    
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+    cache = get_response_cache()
+    key = make_cache_key(DEFAULT_MODEL, messages, stream=True)
+    
+    cached = cache.get(key)
+    if cached is not None:
+        cache.record_hit()
+        yield from essay_result_events(cached)
+        return
+    
+    parser = _EssayStreamParser(criteria)
+    try:
+        stream = client.chat.completions.create(model=DEFAULT_MODEL, messages=messages, stream=True)
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content
+            if text:
+                yield from parser.feed(text)
+    except Exception:
+        # Streaming is unavailable or broke mid-response; the blocking call
+        # has its own fallbacks, and "done" carries the authoritative result
+        yield {"type": "done", "result": grade_essay(essay_text, prompt, criteria)}
+        return
+    
+    events = parser.finish()
+    result = events[-1]["result"]
+    if not result["criteria_scores"]:
+        # The model ignored the line format; use the JSON grading call instead
+        yield {"type": "done", "result": grade_essay(essay_text, prompt, criteria)}
+        return
+    
+    cache.record_miss()
+    cache.put(key, result)
+    yield from events
+
+def mock_grade_essay(essay_text, prompt, criteria):
+    """
+    Provide a mock grading response when OpenAI integration is not available.
+    
+    Args:
+        essay_text (str): The student's essay text
+        prompt (str): The original essay prompt
+        criteria (dict): Dictionary with grading criteria and their weights
+        
+    Returns:
+        dict: Mock grading results, with grading_tier "simulated"
+    """
+    # Calculate a simple score based on essay length (this is just a basic heuristic)
+    word_count = len(essay_text.split())
+    base_score = min(85, max(60, word_count / 10))  # Score between 60-85 based on length
+    
+    # Generate mock criteria scores with some variation
+    import random
+    criteria_scores = {
+        criterion: min(100, max(50, base_score + random.randint(-10, 10)))
+        for criterion in criteria.keys()
+    }
+    
+    # Calculate overall score as weighted average
+    overall_score = sum(
+        criteria_scores[criterion] * (weight / 100)
+        for criterion, weight in criteria.items()
+    )
+    
+    # Round to nearest integer
+    overall_score = round(overall_score)
+    
+    return {
+        "overall_score": overall_score,
+        "criteria_scores": criteria_scores,
+        "strengths": [
+            "Clear structure with introduction, body, and conclusion",
+            "Good use of vocabulary appropriate to the topic",
+            "Demonstrates understanding of the core concepts"
+        ],
+        "areas_for_improvement": [
+            "Further develop arguments with more specific examples",
+            "Strengthen transitions between paragraphs",
+            "Enhance critical analysis of the subject matter"
+        ],
+        "detailed_feedback": (
+            "The essay demonstrates a solid understanding of the topic and presents "
+            "arguments in a logical structure. The introduction effectively sets up "
+            "the main thesis, and the conclusion summarizes the key points. "
+            "To improve, consider incorporating more specific examples and evidence "
+            "to support your arguments, and develop a deeper analysis of the subject matter. "
+            "Pay attention to paragraph transitions to enhance the overall flow of your writing."
+        ),
+        "grading_tier": "simulated"
+    }
+
+def analyze_writing_patterns(essays, student_id):
+    """
+    Analyze writing patterns across multiple essays from the same student.
+    
+    Args:
+        essays (list): List of essay texts from the student
+        student_id (str): The student's ID for reference
+        
+    Returns:
+        dict: Analysis results including strengths, weaknesses, and growth areas
+    """
+    client = get_openai_client()
+    
+    if not client or not essays:
+        return {
+            "recurring_strengths": ["Clear organization of ideas"],
+            "recurring_issues": ["Consider expanding vocabulary usage"],
+            "growth_areas": ["Focus on developing more nuanced arguments"],
+            "writing_style": "Structured and methodical, with strong organizational skills"
+        }
+    
+    # Truncate essays if they're very long to fit in context window
+    essays_sample = [essay[:1000] + "..." if len(essay) > 1000 else essay for essay in essays]
+    essays_text = "\n\n--- ESSAY BREAK ---\n\n".join(essays_sample)
+    
+    system_prompt = """
+    You are an expert writing coach who analyzes student writing patterns across multiple essays.
+    Based on the provided essays from the same student, identify:
+    
+    1. Recurring strengths in their writing
+    2. Consistent issues or challenges they face
+    3. Areas where they could focus to improve their writing skills
+    4. An overall assessment of their writing style
+    
+    Return your analysis as a JSON object with the following structure:
+    {
+        "recurring_strengths": ["strength1", "strength2", ...],
+        "recurring_issues": ["issue1", "issue2", ...],
+        "growth_areas": ["area1", "area2", ...],
+        "writing_style": "description of overall writing style"
+    }
+    """
+    
+    user_prompt = f"""
+    The following are multiple essays written by student ID {student_id}. 
+    Each essay is separated by "--- ESSAY BREAK ---".
+    
+    {essays_text}
+    
+    Please analyze these essays to identify patterns in the student's writing.
+    """
+    
+    try:
+        content = create_chat_completion(
+            client,
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"}
+        )
+        
+        return json.loads(content)
+        
+    except Exception as e:
+        st.error(f"Error during writing pattern analysis: {str(e)}")
+        return {
+            "recurring_strengths": ["Clear organization of ideas"],
+            "recurring_issues": ["Consider expanding vocabulary usage"],
+            "growth_areas": ["Focus on developing more nuanced arguments"],
+            "writing_style": "Structured and methodical, with strong organizational skills"
+        }
+
+def generate_writing_tips(student_id, analysis=None):
+    """
+    Generate personalized writing tips based on student's past performance.
+    
+    Args:
+        student_id (str): The student's ID
+        analysis (dict, optional): Previous analysis results if available
+        
+    Returns:
+        list: Personalized writing tips
+    """
+    client = get_openai_client()
+    
+    if not client:
+        return [
+            "Structure your essays with clear introduction, body paragraphs, and conclusion",
+            "Use transitional phrases to connect ideas between paragraphs",
+            "Support claims with specific examples and evidence",
+            "Vary sentence structure to maintain reader engagement",
+            "Revise and edit your work to eliminate grammatical errors"
+        ]
+    
+    system_prompt = """
+    You are an experienced writing instructor who provides personalized advice to students.
+    Based on the information about the student's writing patterns, generate 5 specific, 
+    actionable tips that will help them improve their writing skills.
+    
+    Each tip should be targeted to address their specific challenges while building on their strengths.
+    Return your tips as a JSON array of strings.
+    """
+    
+    if analysis:
+        analysis_text = json.dumps(analysis)
+    else:
+        analysis_text = """
+        {
+            "recurring_strengths": ["Clear organization of ideas", "Good understanding of basic concepts"],
+            "recurring_issues": ["Limited vocabulary", "Repetitive sentence structures", "Lack of detailed examples"],
+            "growth_areas": ["Critical analysis", "Argument development", "Evidence incorporation"],
+            "writing_style": "Structured but could benefit from more varied expression and deeper analysis"
+        }
+        """
+    
+    user_prompt = f"""
+    Here is an analysis of writing patterns for student ID {student_id}:
+    
+    {analysis_text}
+    
+    Based on this analysis, please provide 5 personalized, actionable writing tips for this student.
+    """
+    
+    try:
+        content = create_chat_completion(
+            client,
+            [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            response_format={"type": "json_object"}
+        )
+        
+        result = json.loads(content)
+        
+        if isinstance(result, list):
+            return result
+        elif "tips" in result:
+            return result["tips"]
+        else:
+            # Try to extract a list from whatever we got
+            for key, value in result.items():
+                if isinstance(value, list) and len(value) > 0:
+                    return value
+            
+            # Fallback
+            return [
+                "Structure your essays with clear introduction, body paragraphs, and conclusion",
+                "Use transitional phrases to connect ideas between paragraphs",
+                "Support claims with specific examples and evidence",
+                "Vary sentence structure to maintain reader engagement",
+                "Revise and edit your work to eliminate grammatical errors"
+            ]
+            
+    except Exception as e:
+        st.error(f"Error generating writing tips: {str(e)}")
+        return [
+            "Structure your essays with clear introduction, body paragraphs, and conclusion",
+            "Use transitional phrases to connect ideas between paragraphs",
+            "Support claims with specific examples and evidence",
+            "Vary sentence structure to maintain reader engagement",
+            "Revise and edit your work to eliminate grammatical errors"
+        ]
\ No newline at end of file
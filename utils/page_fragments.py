@@ -0,0 +1,202 @@
+from data.database import SUBJECTS
+from utils.templates import register_fragment, render_fragment
+
+# Accent colors of the subject labels used on assessments and challenges
+SUBJECT_COLORS = {"Math": "#4285F4", "Science": "#34A853", "Language Arts": "#FBBC05", "History": "#EA4335"}
+
+# Templates are compiled once at import; rendered fragments are cached by
+# their input values, so an unchanged rerun reuses the same strings
+
+register_fragment("sidebar_student", """
+<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 0.5rem;
+     margin-bottom: 1rem; border-left: 4px solid #4B8BF4; text-align: center;'>
+    <div style='font-size: 0.85rem; color: #666; margin-bottom: 0.2rem;'>STUDENT</div>
+    <div style='font-size: 1.2rem; font-weight: 600; color: #4B8BF4;'>
+        {first_name} {last_name}
+    </div>
+    <div style='font-size: 0.85rem; color: #666; margin-top: 0.2rem;'>ID: {student_id}</div>
+</div>
+""")
+
+register_fragment("sidebar_teacher", """
+<div style='background-color: #f8f9fa; padding: 1rem; border-radius: 0.5rem;
+     margin-bottom: 1rem; border-left: 4px solid #4B8BF4; text-align: center;'>
+    <div style='font-size: 0.85rem; color: #666; margin-bottom: 0.2rem;'>TEACHER</div>
+    <div style='font-size: 1.2rem; font-weight: 600; color: #4B8BF4;'>
+        Teacher Profile
+    </div>
+    <div style='font-size: 0.85rem; color: #666; margin-top: 0.2rem;'>ID: {teacher_id}</div>
+</div>
+""")
+
+register_fragment("hero_banner", """
+<div style="background-color: #4B8BF4; padding: 2rem; border-radius: 0.8rem; margin-bottom: 2rem;
+    background-image: linear-gradient(135deg, #4B8BF4, #3267d6); color: white; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
+    <h1 style="margin: 0; color: white; font-size: 2.2rem;">Welcome, {first_name}!</h1>
+    <p style="color: rgba(255, 255, 255, 0.9); margin: 0.5rem 0 1.5rem 0; font-size: 1.1rem;">
+        Your personalized learning journey continues
+    </p>
+    <div style="display: flex; gap: 1rem; flex-wrap: wrap;">
+        <div style="background: rgba(255,255,255,0.2); padding: 0.7rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
+            <div style="font-size: 0.85rem; opacity: 0.8;">Overall Average</div>
+            <div style="font-size: 1.5rem; font-weight: 600;">{average:.1f}%</div>
+        </div>
+        <div style="background: rgba(255,255,255,0.2); padding: 0.7rem 1rem; border-radius: 0.5rem; backdrop-filter: blur(5px);">
+            <div style="font-size: 0.85rem; opacity: 0.8;">Completed Assessments</div>
+            <div style="font-size: 1.5rem; font-weight: 600;">{completed}</div>
+        </div>
+    </div>
+</div>
+""")
+
+register_fragment("assessment_card", """
+<div style="border-left: 4px solid {color}; padding: 1rem; border-radius: 0.5rem; margin-bottom: 1rem;
+    background-color: white; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+        <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{title}</div>
+        <div style="background-color: {color}; color: white; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem;">
+            {subject}
+        </div>
+    </div>
+    <div style="color: #666; margin-bottom: 0.5rem; font-size: 0.9rem;">Due: {due_date}</div>
+    <div style="margin: 0.8rem 0; font-size: 0.9rem;">Type: {type} • Est. Time: {estimated_time} min</div>
+</div>
+""")
+
+register_fragment("learning_path_header", """
+<div style="background-color: #4B8BF4; padding: 2rem; border-radius: 0.8rem; margin-bottom: 2rem;
+    background-image: linear-gradient(135deg, #4B8BF4, #3267d6); color: white; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
+    <h1 style="margin: 0; color: white; font-size: 2.2rem;">Your Learning Journey</h1>
+    <p style="color: rgba(255, 255, 255, 0.9); margin: 0.5rem 0 0 0; font-size: 1.1rem;">
+        Personalized path to mastery based on your learning style: <b>{learning_style}</b>
+    </p>
+</div>
+""")
+
+register_fragment("module_section", """
+<div style="padding: 0.5rem 0;">
+    <p>This is the content for the {section} {section_name} of {title}.</p>
+    <p>{note}</p>
+</div>
+""")
+
+register_fragment("challenge_card", """
+<div style="background-color: white; border-left: 4px solid {color}; padding: 1rem;
+    border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0.5rem;">
+        <div style="font-weight: 600; font-size: 1.1rem; color: #333;">{title}</div>
+        <div style="background-color: {color}; color: white; font-size: 0.8rem; padding: 0.2rem 0.6rem; border-radius: 1rem;">
+            {subject}
+        </div>
+    </div>
+    <div style="color: #555; margin-bottom: 0.8rem; font-size: 0.95rem;">
+        {description}
+    </div>
+</div>
+""")
+
+def student_card_html(student):
+    """
+    Render the signed-in student's sidebar card.
+
+    Args:
+        student: Student dictionary
+
+    Returns:
+        str: HTML for the card
+    """
+    return render_fragment("sidebar_student", first_name=student['first_name'],
+                           last_name=student['last_name'], student_id=student['id'])
+
+def teacher_card_html(teacher_id):
+    """
+    Render the signed-in teacher's sidebar card.
+
+    Args:
+        teacher_id: The teacher's ID
+
+    Returns:
+        str: HTML for the card
+    """
+    return render_fragment("sidebar_teacher", teacher_id=teacher_id)
+
+def hero_banner_html(student):
+    """
+    Render the dashboard welcome banner.
+
+    Args:
+        student: Student dictionary
+
+    Returns:
+        str: HTML for the banner
+    """
+    performance = student['performance']
+    average = sum(performance[subject] for subject in SUBJECTS) / len(SUBJECTS)
+    return render_fragment("hero_banner", first_name=student['first_name'], average=average,
+                           completed=student['completed_assessments'])
+
+def assessment_card_html(assessment):
+    """
+    Render an upcoming assessment card.
+
+    Args:
+        assessment: Assessment summary dictionary
+
+    Returns:
+        str: HTML for the card
+    """
+    return render_fragment(
+        "assessment_card",
+        color=SUBJECT_COLORS.get(assessment['subject'], SUBJECT_COLORS["History"]),
+        title=assessment['title'],
+        subject=assessment['subject'],
+        due_date=assessment['due_date'],
+        type=assessment['type'],
+        estimated_time=assessment['estimated_time']
+    )
+
+def learning_path_header_html(learning_style):
+    """
+    Render the Learning Path page header.
+
+    Args:
+        learning_style: The student's learning style
+
+    Returns:
+        str: HTML for the header
+    """
+    return render_fragment("learning_path_header", learning_style=learning_style)
+
+def module_section_html(section, section_name, title, note):
+    """
+    Render the placeholder content of one section of a started module.
+
+    Args:
+        section: Section title (e.g. "Introduction")
+        section_name: What the subject calls a section (e.g. "Lesson")
+        title: Module title
+        note: Subject-specific note about the full implementation
+
+    Returns:
+        str: HTML for the section
+    """
+    return render_fragment("module_section", section=section.lower(), section_name=section_name.lower(),
+                           title=title, note=note)
+
+def challenge_card_html(challenge):
+    """
+    Render an advanced challenge card.
+
+    Args:
+        challenge: Challenge dictionary with title, subject and description
+
+    Returns:
+        str: HTML for the card
+    """
+    return render_fragment(
+        "challenge_card",
+        color=SUBJECT_COLORS.get(challenge['subject'], SUBJECT_COLORS["Language Arts"]),
+        title=challenge['title'],
+        subject=challenge['subject'],
+        description=challenge['description']
+    )
@@ -0,0 +1,113 @@
+from datetime import datetime
+import numpy as np
+from data.database import SUBJECTS
+from data.progress_history import get_progress_store
+
+SUBJECT_LABELS = {"math": "Math", "science": "Science", "language_arts": "Language Arts", "history": "History"}
+
+# Points per subject line sent to the progress chart
+DEFAULT_MAX_POINTS = 200
+
+def rolling_mean(values, window):
+    """
+    Compute the trailing moving average of a series.
+
+    The first window - 1 points average over the values seen so far.
+
+    Args:
+        values: Array of values
+        window: Number of points to average over
+
+    Returns:
+        Array of averages, the same length as values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window <= 1 or len(values) == 0:
+        return values
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return sums / counts
+
+def lttb(x, y, threshold):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; every bucket in between contributes
+    the point forming the largest triangle with the previously selected
+    point and the average of the next bucket, which preserves the peaks and
+    troughs a plain stride would drop.
+
+    Args:
+        x: Array of x values, sorted ascending
+        y: Array of y values
+        threshold: Maximum number of points to return
+
+    Returns:
+        Array of the indices of the selected points
+    """
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < 3:
+        return np.linspace(0, n - 1, max(threshold, 0)).astype(int)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else n
+        next_x = x[next_start:next_end].mean()
+        next_y = y[next_start:next_end].mean()
+        # Twice the triangle area for every candidate in the bucket at once
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (next_y - y[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def progress_chart_data(student_id, start=None, end=None, max_points=DEFAULT_MAX_POINTS, window=None):
+    """
+    Build the input of DataProcessor.create_progress_over_time_chart.
+
+    Each subject's history is read from the progress store, optionally
+    smoothed, and downsampled to at most max_points points. Subjects share
+    one date axis; a subject has None where it has no point on a date.
+
+    Args:
+        student_id: The ID of the student
+        start: Optional earliest Unix timestamp
+        end: Optional latest Unix timestamp
+        max_points: Maximum number of points per subject
+        window: Optional rolling-average window (in assessments)
+
+    Returns:
+        Dictionary with 'Month' (date strings) and one list per subject label
+    """
+    store = get_progress_store()
+    selected = {}
+    for subject in SUBJECTS:
+        times, scores = store.series(student_id, subject, start, end)
+        if len(times) == 0:
+            continue
+        if window:
+            scores = rolling_mean(scores, window)
+        keep = lttb(times, scores, max_points)
+        selected[subject] = (times[keep], scores[keep])
+
+    axis = np.unique(np.concatenate([times for times, _ in selected.values()])) if selected else np.empty(0)
+    data = {"Month": [datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M") for t in axis]}
+    for subject, (times, scores) in selected.items():
+        values = [None] * len(axis)
+        for position, score in zip(np.searchsorted(axis, times), scores):
+            values[position] = round(float(score), 1)
+        data[SUBJECT_LABELS[subject]] = values
+    return data
@@ -0,0 +1,231 @@
+import json
+import hashlib
+import threading
+import numpy as np
+from data.database import SUBJECTS
+from data.learning_paths import get_module_catalog, get_catalog_version, level_for_mastery
+from data.student_data import get_student_repository
+from utils.resources import register_resource
+
+LEARNING_STYLES = ["Visual", "Auditory", "Reading/Writing", "Kinesthetic"]
+
+# Subjects scored below this are the student's focus areas
+WEAK_AREA_THRESHOLD = 70
+
+# Mastery levels run from 0 to 10 (subject score // 10)
+MASTERY_LEVELS = 11
+
+DEFAULT_MODULES_PER_SUBJECT = 2
+
+class RecommendationEngine:
+    """
+    Ranks learning modules for students from a precomputed index.
+
+    Every (subject, mastery level, learning style) combination is ranked
+    once when the engine is built, so a recommendation is a dictionary
+    lookup per subject. Results are memoized per student and dropped only
+    when the student's performance or learning style changes.
+    """
+
+    def __init__(self, modules):
+        """
+        Build the ranking index.
+
+        Args:
+            modules: List of module dictionaries from get_module_catalog()
+        """
+        self.modules = modules
+        self._by_id = {module["id"]: module for module in modules}
+        self._index = {}
+        self._memo = {}
+        self._lock = threading.Lock()
+        # Identifies the catalog across processes, unlike the per-process catalog version
+        self.catalog_stamp = hashlib.sha1(json.dumps(sorted(
+            [module["id"], module["level"], module["difficulty"], module["priority"],
+             module["learning_styles"], module["prerequisite_ids"]] for module in modules
+        )).encode("utf-8")).hexdigest()[:12]
+
+        depths = self._prerequisite_depths()
+        for subject in SUBJECTS:
+            rows = [module for module in modules if module["subject"] == subject]
+            for mastery in range(MASTERY_LEVELS):
+                level = level_for_mastery(mastery)
+                candidates = [module for module in rows if module["level"] == level]
+                for style in LEARNING_STYLES + [None]:
+                    self._index[(subject, mastery, style)] = self._rank(candidates, mastery, style, depths)
+
+    def _prerequisite_depths(self):
+        """Length of the longest prerequisite chain below each module."""
+        depths = {}
+        for root in self._by_id:
+            # Iterative depth-first walk so long chains cannot hit the recursion limit
+            stack = [root]
+            visiting = set()
+            while stack:
+                module_id = stack[-1]
+                if module_id in depths:
+                    stack.pop()
+                    continue
+                # Unknown and cyclic prerequisites count as leaves
+                parents = [parent for parent in self._by_id[module_id]["prerequisite_ids"]
+                           if parent in self._by_id and parent not in visiting]
+                pending = [parent for parent in parents if parent not in depths]
+                if pending and module_id not in visiting:
+                    visiting.add(module_id)
+                    stack.extend(pending)
+                    continue
+                visiting.discard(module_id)
+                depths[module_id] = 1 + max((depths.get(parent, 0) for parent in parents), default=-1)
+                stack.pop()
+        return depths
+
+    @staticmethod
+    def _rank(candidates, mastery, style, depths):
+        """Order candidate module IDs best first."""
+        if not candidates:
+            return []
+        priority = np.array([module["priority"] for module in candidates])
+        # 2 = made for this style, 1 = suits every style, 0 = made for other styles
+        style_fit = np.array([
+            2 if style in module["learning_styles"] else 0 if module["learning_styles"] else 1
+            for module in candidates
+        ])
+        distance = np.abs(np.array([module["difficulty"] for module in candidates]) - mastery)
+        depth = np.array([depths.get(module["id"], 0) for module in candidates])
+        # lexsort uses the last key as the primary one
+        order = np.lexsort((depth, distance, -style_fit, -priority))
+        return [candidates[i]["id"] for i in order]
+
+    def ranked_modules(self, subject, mastery, learning_style=None, limit=None):
+        """
+        Get the ranked modules for one subject.
+
+        Args:
+            subject: Subject key (e.g. "math")
+            mastery: Mastery level between 0 and 10
+            learning_style: Optional learning style to favor
+            limit: Maximum number of modules to return
+
+        Returns:
+            List of module dictionaries, best match first
+        """
+        style = learning_style if learning_style in LEARNING_STYLES else None
+        mastery = min(MASTERY_LEVELS - 1, max(0, int(mastery)))
+        ranked = self._index.get((subject, mastery, style), [])
+        return [self._by_id[module_id] for module_id in ranked[:limit]]
+
+    def modules_by_id(self, module_ids):
+        """
+        Look up modules by ID.
+
+        Args:
+            module_ids: Iterable of module IDs
+
+        Returns:
+            List of module dictionaries, skipping IDs no longer in the catalog
+        """
+        return [self._by_id[module_id] for module_id in module_ids if module_id in self._by_id]
+
+    def recommend(self, student, per_subject=DEFAULT_MODULES_PER_SUBJECT, memoize=True):
+        """
+        Get a student's learning path recommendations.
+
+        Args:
+            student: Student dictionary with "performance" and "learning_style"
+            per_subject: Number of modules to recommend per subject
+            memoize: Keep the result for the student's next request (batch
+                jobs over the whole roster turn this off)
+
+        Returns:
+            Dictionary with mastery "levels", recommended "modules" per
+            subject, "weak_areas" (subjects below WEAK_AREA_THRESHOLD) and
+            "priority_subjects" (weakest first)
+        """
+        performance = student.get("performance", {})
+        fingerprint = (
+            tuple(performance.get(subject, 0) for subject in SUBJECTS),
+            student.get("learning_style"),
+            per_subject
+        )
+        key = student.get("id") if memoize else None
+        with self._lock:
+            cached = self._memo.get(key)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+
+        levels = {subject: min(MASTERY_LEVELS - 1, int(performance.get(subject, 0)) // 10) for subject in SUBJECTS}
+        result = {
+            "levels": levels,
+            "modules": {
+                subject: self.ranked_modules(subject, levels[subject], student.get("learning_style"), per_subject)
+                for subject in SUBJECTS
+            },
+            "weak_areas": [subject for subject in SUBJECTS if performance.get(subject, 0) < WEAK_AREA_THRESHOLD],
+            "priority_subjects": sorted(SUBJECTS, key=lambda subject: performance.get(subject, 0))
+        }
+        if key is not None:
+            with self._lock:
+                self._memo[key] = (fingerprint, result)
+        return result
+
+    def forget(self, student_id=None):
+        """
+        Drop memoized recommendations.
+
+        Args:
+            student_id: Student to forget, or None to forget everyone
+        """
+        with self._lock:
+            if student_id is None:
+                self._memo.clear()
+            else:
+                self._memo.pop(student_id, None)
+
+_engine = None
+_engine_version = None
+_engine_lock = threading.Lock()
+
+def _on_student_saved(student):
+    """Drop a student's memoized recommendations when their record changes."""
+    engine = _engine
+    if engine is not None:
+        engine.forget(student["id"] if student else None)
+
+get_student_repository().subscribe(_on_student_saved)
+
+def get_recommendation_engine():
+    """
+    Get the recommendation engine shared by all sessions.
+
+    The engine is rebuilt when the module catalog changes.
+
+    Returns:
+        RecommendationEngine instance
+    """
+    global _engine, _engine_version
+    version = get_catalog_version()
+    if _engine is None or _engine_version != version:
+        with _engine_lock:
+            if _engine is None or _engine_version != version:
+                _engine = RecommendationEngine(get_module_catalog())
+                _engine_version = version
+    return _engine
+
+register_resource(
+    "recommendation_engine",
+    get_recommendation_engine,
+    health=lambda engine: {"modules": len(engine.modules)}
+)
+
+def get_recommendations(student, per_subject=DEFAULT_MODULES_PER_SUBJECT):
+    """
+    Get learning path recommendations for a student.
+
+    Args:
+        student: Student dictionary
+        per_subject: Number of modules to recommend per subject
+
+    Returns:
+        Dictionary from RecommendationEngine.recommend()
+    """
+    return get_recommendation_engine().recommend(student, per_subject)
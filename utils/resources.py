@@ -0,0 +1,135 @@
+"""
+Registry of the process-wide resources shared by all Streamlit sessions.
+
+Modules that own a heavy shared object (model clients, the assessment
+engine, caches and indexes) register its accessor here, with optional
+warm-up and health hooks. The accessor is the module's own thread-safe
+singleton getter, so registering a resource never creates it.
+
+Usage:
+    python -m utils.resources          # warm up everything and print health
+"""
+import sys
+import json
+import time
+import threading
+from collections import OrderedDict
+
+_resources = OrderedDict()
+_warmed = set()
+_warm_lock = threading.Lock()
+
+def register_resource(name, getter, warm_up=None, health=None):
+    """
+    Register a shared resource.
+
+    Args:
+        name: Unique resource name
+        getter: Callable returning the (lazily created) shared instance
+        warm_up: Optional callable(instance) that pre-loads expensive state
+        health: Optional callable(instance) returning a dict of status details;
+            raising marks the resource unhealthy
+    """
+    _resources[name] = {"getter": getter, "warm_up": warm_up, "health": health}
+
+def resource_names():
+    """
+    Get the names of all registered resources.
+
+    Returns:
+        List of names in registration order
+    """
+    return list(_resources)
+
+def get_resource(name):
+    """
+    Get a registered resource, creating it on first use.
+
+    Args:
+        name: Resource name
+
+    Returns:
+        The shared instance
+    """
+    return _resources[name]["getter"]()
+
+def warm_up_resources(names=None, force=False):
+    """
+    Create resources and run their warm-up hooks.
+
+    Each resource is warmed once per process unless force is set, so this
+    is cheap to call at the top of every script run.
+
+    Args:
+        names: Optional list of resource names (defaults to all)
+        force: Warm up resources again even if already warm
+
+    Returns:
+        Dict of {name: {"seconds": float, "error": str or None}} for the
+        resources warmed by this call
+    """
+    report = {}
+    for name in names or list(_resources):
+        if name in _warmed and not force:
+            continue
+        with _warm_lock:
+            if name in _warmed and not force:
+                continue
+            resource = _resources[name]
+            started = time.perf_counter()
+            error = None
+            try:
+                instance = resource["getter"]()
+                if resource["warm_up"] and instance is not None:
+                    resource["warm_up"](instance)
+                _warmed.add(name)
+            except Exception as e:
+                # A resource that fails to warm up is retried on the next call
+                error = f"{type(e).__name__}: {e}"
+            report[name] = {"seconds": round(time.perf_counter() - started, 4), "error": error}
+    return report
+
+def check_health(names=None):
+    """
+    Run the health hooks of registered resources.
+
+    Args:
+        names: Optional list of resource names (defaults to all)
+
+    Returns:
+        Dict of {name: {"healthy": bool, "warm": bool, ...details}}
+    """
+    status = {}
+    for name in names or list(_resources):
+        resource = _resources[name]
+        try:
+            instance = resource["getter"]()
+            details = resource["health"](instance) if resource["health"] else {}
+            status[name] = dict(details, healthy=True, warm=name in _warmed)
+        except Exception as e:
+            status[name] = {"healthy": False, "warm": name in _warmed, "error": f"{type(e).__name__}: {e}"}
+    return status
+
+def main():
+    """Command-line entry point: warm up all resources and print their health."""
+    # Importing the modules registers their resources. Run as a script, this
+    # file is __main__, so use the imported registry the modules filled in.
+    import utils.ai_assessment
+    import utils.data_processing
+    import utils.class_analytics
+    import utils.recommendations
+    import utils.templates
+    import utils.assessment_sessions
+    import utils.adaptive_testing
+    import utils.session_store
+    import utils.auth
+    import utils.student_search
+    import utils.insight_scheduler
+    from utils import resources
+
+    report = {"warm_up": resources.warm_up_resources(), "health": resources.check_health()}
+    print(json.dumps(report, indent=2))
+    return 0 if all(status["healthy"] for status in report["health"].values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,380 @@
+"""
+Seeded generator of synthetic rosters for scale testing.
+
+Produces students with correlated subject scores and engagement, learning
+styles, grade levels, a monthly progress history per subject, and
+submissions to the stored assessments (quiz and test answers, essay
+texts), and streams them into the data layer chunk by chunk. Every column
+of a chunk is drawn with vectorized NumPy calls from a generator seeded
+by (seed, chunk index), so the same seed and chunk size always produce the
+same district, and memory use is bounded by the chunk size.
+
+Throughput target, on one core with the default six months of history
+(24 progress events and about 2.5 submissions per student): 40,000
+students per second generated, and 4,000 students per second written to
+SQLite, so a million-student district loads in about four minutes. The
+writes are bound by SQLite's inserts and index updates, not generation.
+Run --benchmark to check a machine against the target.
+
+Usage:
+    python -m utils.roster_generator --students 1000000
+    python -m utils.roster_generator --students 100000 --seed 7 --history-months 12 --essay-rate 0.5
+    python -m utils.roster_generator --students 200000 --benchmark
+"""
+import sys
+import json
+import time
+import argparse
+import numpy as np
+from data.database import SUBJECTS
+from data.student_data import save_student_columns
+from data.progress_history import save_progress_events, SECONDS_PER_MONTH
+from data.sample_assessments import get_available_assessments, record_submissions
+
+DEFAULT_CHUNK_SIZE = 10000
+DEFAULT_HISTORY_MONTHS = 6
+DEFAULT_ESSAY_RATE = 0.3
+TARGET_GENERATED_PER_SECOND = 40000
+TARGET_WRITTEN_PER_SECOND = 4000
+
+FIRST_NAMES = [
+    "Emma", "Liam", "Olivia", "Noah", "Ava", "Elijah", "Sophia", "James", "Isabella", "Lucas", "Mia", "Mason",
+    "Amelia", "Ethan", "Harper", "Logan", "Evelyn", "Aiden", "Abigail", "Jacob", "Emily", "Michael", "Ella",
+    "Daniel", "Chloe", "Henry", "Grace", "Jackson", "Zoey", "Sebastian", "Nora", "Mateo", "Lily", "Leo",
+    "Hannah", "Wyatt", "Layla", "Owen", "Aria", "Samuel", "Riley", "Carter", "Zoe", "Jayden", "Camila", "Luke",
+    "Priya", "Arjun", "Mei", "Wei", "Fatima", "Omar", "Aisha", "Yusuf", "Sofia", "Diego", "Valentina", "Kenji",
+    "Yuki", "Amara", "Kwame", "Ingrid", "Lars", "Anya", "Dmitri", "Chiara", "Marco", "Leila", "Ravi", "Nia"
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Perez", "Thompson", "White", "Harris", "Sanchez", "Clark", "Ramirez", "Lewis", "Robinson", "Walker",
+    "Young", "Allen", "King", "Wright", "Scott", "Torres", "Nguyen", "Hill", "Flores", "Green", "Adams",
+    "Nelson", "Baker", "Hall", "Rivera", "Campbell", "Mitchell", "Carter", "Roberts", "Patel", "Kim", "Chen",
+    "Wang", "Singh", "Khan", "Ali", "Okafor", "Mensah", "Tanaka", "Sato", "Rossi", "Novak", "Ivanova", "Larsen"
+]
+LEARNING_STYLES = ["Visual", "Auditory", "Reading/Writing", "Kinesthetic"]
+LEARNING_STYLE_SHARES = [0.35, 0.25, 0.2, 0.2]
+GRADE_LEVELS = [9, 10, 11, 12]
+# Later grades are slightly smaller as students leave the district
+GRADE_LEVEL_SHARES = [0.27, 0.26, 0.24, 0.23]
+
+# Mean score and spread of each subject, and how strongly it follows general ability
+SUBJECT_MEANS = {"math": 74, "science": 76, "language_arts": 80, "history": 77}
+SUBJECT_SPREAD = 11
+ABILITY_WEIGHT = 0.75
+
+# Essay sentences by role, roughly ordered from weakest to strongest
+ESSAY_THESES = [
+    "The Industrial Revolution changed a lot of things in Europe.",
+    "The Industrial Revolution was a time when factories were built and life changed.",
+    "The Industrial Revolution reshaped European society by moving work from farms to factories.",
+    "The Industrial Revolution transformed European society, trading rural stability for urban growth and "
+    "a new class structure built on wage labour.",
+]
+ESSAY_EVIDENCE = [
+    "Factories were built in cities like Manchester and people moved there to work.",
+    "Between 1800 and 1850 the population of Manchester grew from about 75,000 to over 300,000.",
+    "Child labour was common, and the Factory Act of 1833 limited the hours children could work.",
+    "Railways cut the cost of moving coal and goods, connecting markets across the country.",
+    "Workers often lived in crowded housing with poor sanitation, which spread diseases such as cholera.",
+    "The middle class grew as merchants, engineers and factory owners gained wealth and influence.",
+    "Steam power let mills run all year instead of depending on rivers and the seasons.",
+    "Trade unions formed to bargain for better wages and safer working conditions.",
+]
+ESSAY_ANALYSIS = [
+    "This was bad for a lot of people.",
+    "This shows that economic growth did not benefit everyone equally.",
+    "As a result, the gap between owners and workers shaped politics for the rest of the century.",
+    "Consequently, urbanization created both opportunity and hardship, and reform movements grew out of "
+    "that tension.",
+]
+ESSAY_TRANSITIONS = ["Also,", "However,", "Furthermore,", "In addition,", "For example,", "Therefore,",
+                     "Moreover,", "On the other hand,"]
+ESSAY_CONCLUSIONS = [
+    "In conclusion, the Industrial Revolution was important.",
+    "In conclusion, the Industrial Revolution brought growth but also many problems for workers.",
+    "In conclusion, the Industrial Revolution created modern industrial society while exposing deep "
+    "inequalities that later reforms tried to address.",
+]
+
+def _name_weights(count):
+    """Zipf-like popularity of the names in a pool, most common first."""
+    weights = 1 / np.arange(1, count + 1) ** 0.6
+    return weights / weights.sum()
+
+_FIRST_NAME_WEIGHTS = _name_weights(len(FIRST_NAMES))
+_LAST_NAME_WEIGHTS = _name_weights(len(LAST_NAMES))
+
+def student_ids(start, count):
+    """
+    Build the IDs of a range of synthetic students.
+
+    Args:
+        start: Zero-based index of the first student
+        count: Number of students
+
+    Returns:
+        List of IDs "S0000001", "S0000002", ...
+    """
+    return [f"S{i:07d}" for i in range(start + 1, start + count + 1)]
+
+def _submitted_at(now, ages):
+    """UTC timestamps in SQLite's datetime('now') format, ages seconds before now."""
+    stamps = (np.datetime64(int(now), "s") - ages.astype("timedelta64[s]")).astype(str)
+    return np.char.replace(stamps, "T", " ").tolist()
+
+def _essay_texts(rng, quality):
+    """Essays whose length and sentence choice follow each author's quality (0 to 1)."""
+    count = len(quality)
+    paragraphs = np.clip(np.rint(2 + quality * 4 + rng.normal(0, 0.7, count)), 2, 7).astype(int)
+    level = np.clip(quality[:, None] + rng.normal(0, 0.15, (count, 8)), 0, 0.999)
+    theses = (level[:, 0] * len(ESSAY_THESES)).astype(int)
+    analyses = (level[:, 1:] * len(ESSAY_ANALYSIS)).astype(int)
+    conclusions = (level[:, 7] * len(ESSAY_CONCLUSIONS)).astype(int)
+    evidence = rng.integers(len(ESSAY_EVIDENCE), size=(count, 14))
+    transitions = rng.integers(len(ESSAY_TRANSITIONS), size=(count, 7))
+
+    essays = []
+    for i in range(count):
+        body = [ESSAY_THESES[theses[i]]]
+        for p in range(paragraphs[i] - 1):
+            body.append(f"{ESSAY_TRANSITIONS[transitions[i, p]]} {ESSAY_EVIDENCE[evidence[i, 2 * p]]} "
+                        f"{ESSAY_EVIDENCE[evidence[i, 2 * p + 1]]} {ESSAY_ANALYSIS[analyses[i, p]]}")
+        body.append(ESSAY_CONCLUSIONS[conclusions[i]])
+        essays.append("\n\n".join(body))
+    return essays
+
+def _objective_answers(rng, questions, scores):
+    """JSON answer lists for a quiz: each objective question right with probability score/100."""
+    count = len(scores)
+    correct = rng.random((count, len(questions))) < (scores[:, None] / 100)
+    columns = []
+    for j, question in enumerate(questions):
+        right = question.get("correct_answer")
+        if question.get("type") == "multiple_choice":
+            wrong = [option for option in question.get("options", []) if option != right] or [right]
+            wrong_answers = np.array(wrong, dtype=object)[rng.integers(len(wrong), size=count)]
+        elif question.get("type") == "true_false":
+            wrong_answers = np.full(count, "False" if str(right) == "True" else "True", dtype=object)
+        else:
+            # Open questions are left for the grader
+            columns.append([None] * count)
+            continue
+        columns.append(np.where(correct[:, j], right, wrong_answers).tolist())
+    return [json.dumps(list(answers)) for answers in zip(*columns)] if columns else [None] * count
+
+class RosterGenerator:
+    """Draws synthetic students and their histories in vectorized chunks."""
+
+    def __init__(self, seed=0, history_months=DEFAULT_HISTORY_MONTHS, essay_rate=DEFAULT_ESSAY_RATE,
+                 assessments=None, now=None):
+        """
+        Initialize the generator.
+
+        Args:
+            seed: Random seed
+            history_months: Monthly progress events per subject, ending at the current score
+            essay_rate: Share of students who submitted the essay assessments
+            assessments: Assessments students submit to (defaults to the stored ones)
+            now: Unix time the histories end at (defaults to now)
+        """
+        self.seed = seed
+        self.history_months = history_months
+        self.essay_rate = essay_rate
+        self.assessments = get_available_assessments() if assessments is None else assessments
+        self.now = time.time() if now is None else now
+
+    def students(self, chunk_index, start, count):
+        """
+        Draw one chunk of students.
+
+        Args:
+            chunk_index: Index of the chunk, which seeds its random stream
+            start: Zero-based index of the chunk's first student
+            count: Number of students in the chunk
+
+        Returns:
+            Tuple of (columns for save_student_columns(), ability array,
+            {subject: score array}, numpy Generator for the rest of the chunk)
+        """
+        rng = np.random.default_rng([self.seed, chunk_index])
+        ability = rng.standard_normal(count)
+        grade_levels = rng.choice(GRADE_LEVELS, size=count, p=GRADE_LEVEL_SHARES)
+        latent = ABILITY_WEIGHT * ability[:, None] + np.sqrt(1 - ABILITY_WEIGHT ** 2) * rng.standard_normal(
+            (count, len(SUBJECTS))
+        )
+        means = np.array([SUBJECT_MEANS[subject] for subject in SUBJECTS])
+        # Scores pile up below 100 rather than past it, as real grade books do
+        scores = np.clip(np.rint(means + SUBJECT_SPREAD * latent - 2.5 * np.maximum(latent, 0) ** 2), 30, 100)
+        engagement = np.clip(np.rint(6 + 1.6 * latent + rng.normal(0, 1.3, latent.shape)), 1, 10).astype(int)
+        completed = rng.poisson(np.clip(8 + 2 * (grade_levels - 9) + 2 * engagement.mean(axis=1) - 12, 1, None))
+
+        columns = {
+            "id": student_ids(start, count),
+            "first_name": np.array(FIRST_NAMES)[rng.choice(len(FIRST_NAMES), size=count, p=_FIRST_NAME_WEIGHTS)]
+            .tolist(),
+            "last_name": np.array(LAST_NAMES)[rng.choice(len(LAST_NAMES), size=count, p=_LAST_NAME_WEIGHTS)]
+            .tolist(),
+            "grade_level": grade_levels.tolist(),
+            "learning_style": np.array(LEARNING_STYLES)[
+                rng.choice(len(LEARNING_STYLES), size=count, p=LEARNING_STYLE_SHARES)
+            ].tolist(),
+            "completed_assessments": completed.tolist(),
+            "performance": {subject: scores[:, j].astype(int).tolist() for j, subject in enumerate(SUBJECTS)},
+            "engagement": {subject: engagement[:, j].tolist() for j, subject in enumerate(SUBJECTS)}
+        }
+        return columns, ability, {subject: scores[:, j] for j, subject in enumerate(SUBJECTS)}, rng
+
+    def progress_events(self, rng, ids, scores):
+        """
+        Draw each student's monthly history, ending at their current score.
+
+        Args:
+            rng: The chunk's random generator
+            ids: Student IDs of the chunk
+            scores: {subject: current score array}
+
+        Returns:
+            List of (student_id, subject, recorded_at, score, source) tuples
+        """
+        months = self.history_months
+        if months <= 1:
+            return []
+        count = len(ids)
+        events = []
+        offsets = (np.arange(months - 1, 0, -1) * SECONDS_PER_MONTH)[None, :]
+        for subject, current in scores.items():
+            # Walk backwards from the current score: students improve a little each month on average
+            gains = rng.normal(1.2, 3.5, (count, months - 1))
+            history = np.clip(np.rint(current[:, None] - np.cumsum(gains[:, ::-1], axis=1)[:, ::-1]), 20, 100)
+            recorded_at = self.now - offsets + rng.uniform(-5, 5, (count, months - 1)) * 86400
+            for j in range(months - 1):
+                events.extend(zip(ids, [subject] * count, recorded_at[:, j].tolist(), history[:, j].tolist(),
+                                  ["synthetic"] * count))
+            events.extend(zip(ids, [subject] * count, [self.now] * count, current.tolist(), ["synthetic"] * count))
+        return events
+
+    def submissions(self, rng, ids, ability, scores):
+        """
+        Draw the students' submissions to the stored assessments.
+
+        Args:
+            rng: The chunk's random generator
+            ids: Student IDs of the chunk
+            ability: General ability array
+            scores: {subject: current score array}
+
+        Returns:
+            List of tuples for record_submissions()
+        """
+        count = len(ids)
+        rows = []
+        for assessment in self.assessments:
+            subject = assessment["subject"].lower().replace(" ", "_")
+            subject_scores = scores.get(subject, scores[SUBJECTS[0]])
+            rate = self.essay_rate if assessment["type"] == "Essay" else 0.55 + 0.1 * np.tanh(ability)
+            submitted = np.flatnonzero(rng.random(count) < rate)
+            if not len(submitted):
+                continue
+            score = np.clip(np.rint(subject_scores[submitted] + rng.normal(0, 6, len(submitted))), 0, 100)
+            ages = rng.integers(3600, 120 * 86400, size=len(submitted))
+            if assessment["type"] == "Essay":
+                content = _essay_texts(rng, np.clip((score - 40) / 60, 0, 1))
+            elif assessment.get("questions"):
+                content = _objective_answers(rng, assessment["questions"], score)
+            else:
+                content = [None] * len(submitted)
+            results = [f'{{"overall_score": {value}, "grading_tier": "synthetic"}}' for value in score.astype(int)]
+            rows.extend(zip([assessment["id"]] * len(submitted), [ids[i] for i in submitted],
+                            _submitted_at(self.now, ages), score.tolist(), content, results))
+        return rows
+
+    def chunks(self, students, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Generate a roster chunk by chunk.
+
+        Args:
+            students: Total number of students
+            chunk_size: Students per chunk
+
+        Yields:
+            Dicts with "columns", "progress_events" and "submissions" for one chunk
+        """
+        for chunk_index, start in enumerate(range(0, students, chunk_size)):
+            count = min(chunk_size, students - start)
+            columns, ability, scores, rng = self.students(chunk_index, start, count)
+            yield {
+                "columns": columns,
+                "progress_events": self.progress_events(rng, columns["id"], scores),
+                "submissions": self.submissions(rng, columns["id"], ability, scores)
+            }
+
+def load_roster(students, seed=0, chunk_size=DEFAULT_CHUNK_SIZE, history_months=DEFAULT_HISTORY_MONTHS,
+                essay_rate=DEFAULT_ESSAY_RATE, write=True, progress=None):
+    """
+    Generate a roster and stream it into the database.
+
+    Args:
+        students: Number of students
+        seed: Random seed
+        chunk_size: Students generated and written per transaction
+        history_months: Monthly progress events per subject
+        essay_rate: Share of students who submitted the essay assessments
+        write: Set False to generate without writing (to time generation alone)
+        progress: Optional callable(students done, elapsed seconds) called after each chunk
+
+    Returns:
+        Dict with counts of students, progress events and submissions, the
+        seconds taken and students per second
+    """
+    generator = RosterGenerator(seed, history_months, essay_rate)
+    totals = {"students": 0, "progress_events": 0, "submissions": 0}
+    started = time.perf_counter()
+    for chunk in generator.chunks(students, chunk_size):
+        if write:
+            save_student_columns(chunk["columns"])
+            save_progress_events(chunk["progress_events"])
+            record_submissions(chunk["submissions"])
+        totals["students"] += len(chunk["columns"]["id"])
+        totals["progress_events"] += len(chunk["progress_events"])
+        totals["submissions"] += len(chunk["submissions"])
+        if progress:
+            progress(totals["students"], time.perf_counter() - started)
+    seconds = time.perf_counter() - started
+    return dict(totals, seconds=round(seconds, 2), students_per_second=round(totals["students"] / max(seconds, 1e-9)))
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic roster into the EduTutor database.")
+    parser.add_argument("--students", type=int, default=100000, help="Number of students")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Students per transaction")
+    parser.add_argument("--history-months", type=int, default=DEFAULT_HISTORY_MONTHS,
+                        help="Monthly progress events per subject")
+    parser.add_argument("--essay-rate", type=float, default=DEFAULT_ESSAY_RATE,
+                        help="Share of students with an essay submission")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time generation alone, then generation and writing, against the throughput target")
+    args = parser.parse_args(argv)
+
+    options = dict(seed=args.seed, chunk_size=args.chunk_size, history_months=args.history_months,
+                   essay_rate=args.essay_rate)
+
+    def report(done, elapsed):
+        print(f"\r{done:,} students in {elapsed:.1f} s", end="", file=sys.stderr, flush=True)
+
+    if args.benchmark:
+        generated = load_roster(args.students, write=False, **options)
+        print(f"generated: {json.dumps(generated)} (target {TARGET_GENERATED_PER_SECOND:,}/s)")
+    written = load_roster(args.students, progress=report, **options)
+    print(file=sys.stderr)
+    print(f"written: {json.dumps(written)} (target {TARGET_WRITTEN_PER_SECOND:,}/s)")
+    if args.benchmark:
+        below = (generated["students_per_second"] < TARGET_GENERATED_PER_SECOND
+                 or written["students_per_second"] < TARGET_WRITTEN_PER_SECOND)
+        return 1 if below else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
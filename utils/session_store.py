@@ -0,0 +1,390 @@
+import os
+import re
+import hmac
+import json
+import time
+import hashlib
+import secrets
+import threading
+import streamlit as st
+from data.database import get_connection
+from utils.resources import register_resource
+
+# st.session_state keys that follow a user between worker processes. Other
+# keys are per-connection caches (rendered results, open tests) that are
+# rebuilt on demand; assessment answers are saved by utils.assessment_sessions.
+PERSISTENT_KEYS = (
+    "auth_token", "user_type", "current_user", "authenticated", "page", "student_nav", "teacher_nav",
+    "current_assessment", "adaptive_subject", "current_module", "current_science_module",
+    "current_language_arts_module", "current_history_module", "show_advanced_challenges"
+)
+
+# Keys restored only for the browser that logged in, never from the URL alone
+AUTH_KEYS = ("auth_token", "user_type", "current_user", "authenticated")
+
+# Query parameter carrying the session ID, so any worker can serve any request.
+# The ID alone is not a credential: a copied link restores navigation only.
+SESSION_PARAM = "sid"
+SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{16,64}$")
+
+# Cookie holding the browser secret a logged-in session is bound to
+BROWSER_COOKIE = "edututor_browser"
+BROWSER_SECRET_PATTERN = re.compile(r"^[A-Za-z0-9_-]{32,64}$")
+
+DEFAULT_BACKEND = "sqlite"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_STATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sessions")
+PURGE_INTERVAL_SECONDS = 300
+
+# Keys of st.session_state used by this module itself
+_LOADED_KEY = "_state_session_id"
+_SAVED_KEY = "_state_saved"
+_BINDING_KEY = "_state_browser_binding"
+_PENDING_COOKIE_KEY = "_state_pending_cookie"
+
+# Stored field with the hash of the browser secret
+_BINDING_FIELD = "browser_binding"
+
+class SQLiteStateBackend:
+    """Session state stored in the app database, shared by every worker on the host."""
+
+    name = "sqlite"
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS):
+        """
+        Initialize the backend.
+
+        Args:
+            ttl_seconds: Time an unused session is kept
+        """
+        self.ttl_seconds = ttl_seconds
+
+    def load(self, session_id):
+        """
+        Load a session's state.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            State dictionary, or None if the session is unknown or expired
+        """
+        row = get_connection().execute(
+            "SELECT state FROM user_sessions WHERE id = ? AND expires_at > ?", (session_id, time.time())
+        ).fetchone()
+        return json.loads(row["state"]) if row else None
+
+    def save(self, session_id, state):
+        """
+        Store a session's state and extend its expiry.
+
+        Args:
+            session_id: The session ID
+            state: JSON-serializable state dictionary
+        """
+        conn = get_connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO user_sessions (id, state, expires_at) VALUES (?, ?, ?)",
+                (session_id, json.dumps(state), time.time() + self.ttl_seconds)
+            )
+
+    def delete(self, session_id):
+        """
+        Forget a session.
+
+        Args:
+            session_id: The session ID
+        """
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM user_sessions WHERE id = ?", (session_id,))
+
+    def purge(self):
+        """
+        Delete expired sessions.
+
+        Returns:
+            int: Number of sessions deleted
+        """
+        conn = get_connection()
+        with conn:
+            return conn.execute("DELETE FROM user_sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self):
+        """Number of stored sessions."""
+        return {"sessions": get_connection().execute("SELECT COUNT(*) FROM user_sessions").fetchone()[0]}
+
+class FileStateBackend:
+    """
+    Session state stored as one JSON file per session.
+
+    Point the directory at a shared volume to spread workers across nodes
+    without a database server.
+    """
+
+    name = "file"
+
+    def __init__(self, directory=DEFAULT_STATE_DIR, ttl_seconds=DEFAULT_TTL_SECONDS):
+        """
+        Initialize the backend.
+
+        Args:
+            directory: Directory holding the session files
+            ttl_seconds: Time an unused session is kept
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, session_id):
+        """Path of a session's file; IDs are validated before they get here."""
+        return os.path.join(self.directory, f"{session_id}.json")
+
+    def load(self, session_id):
+        """
+        Load a session's state.
+
+        Args:
+            session_id: The session ID
+
+        Returns:
+            State dictionary, or None if the session is unknown or expired
+        """
+        try:
+            with open(self._path(session_id), encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record["state"] if record.get("expires_at", 0) > time.time() else None
+
+    def save(self, session_id, state):
+        """
+        Store a session's state and extend its expiry.
+
+        Args:
+            session_id: The session ID
+            state: JSON-serializable state dictionary
+        """
+        path = self._path(session_id)
+        temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": time.time() + self.ttl_seconds, "state": state}, f)
+        # Readers in other workers see either the old file or the new one
+        os.replace(temporary, path)
+
+    def delete(self, session_id):
+        """
+        Forget a session.
+
+        Args:
+            session_id: The session ID
+        """
+        try:
+            os.remove(self._path(session_id))
+        except FileNotFoundError:
+            pass
+
+    def purge(self):
+        """
+        Delete expired sessions.
+
+        Returns:
+            int: Number of sessions deleted
+        """
+        deleted = 0
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and self.load(name[:-len(".json")]) is None:
+                self.delete(name[:-len(".json")])
+                deleted += 1
+        return deleted
+
+    def stats(self):
+        """Number of stored sessions."""
+        return {"sessions": sum(name.endswith(".json") for name in os.listdir(self.directory))}
+
+# Backend factories by EDUTUTOR_STATE_BACKEND name; each takes the TTL in seconds
+_BACKENDS = {
+    "sqlite": SQLiteStateBackend,
+    "file": lambda ttl_seconds: FileStateBackend(os.environ.get("EDUTUTOR_STATE_DIR", DEFAULT_STATE_DIR),
+                                                 ttl_seconds),
+}
+
+def register_state_backend(name, factory):
+    """
+    Make a state backend available to EDUTUTOR_STATE_BACKEND.
+
+    A backend provides load, save, delete, purge and stats with the same
+    signatures as SQLiteStateBackend, so a Redis store plugs in here
+    without changes to the pages.
+
+    Args:
+        name: Backend name
+        factory: Callable taking the TTL in seconds and returning the backend
+    """
+    _BACKENDS[name] = factory
+
+_backend = None
+_backend_lock = threading.Lock()
+_last_purge = 0.0
+
+def get_state_backend():
+    """
+    Get the session state backend shared by all sessions.
+
+    The backend is chosen by EDUTUTOR_STATE_BACKEND ("sqlite" or "file")
+    and keeps sessions for EDUTUTOR_STATE_TTL_SECONDS.
+
+    Returns:
+        The backend instance
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = os.environ.get("EDUTUTOR_STATE_BACKEND", DEFAULT_BACKEND)
+                if name not in _BACKENDS:
+                    raise ValueError(f"Unknown state backend {name!r}; expected one of {sorted(_BACKENDS)}")
+                _backend = _BACKENDS[name](float(os.environ.get("EDUTUTOR_STATE_TTL_SECONDS", DEFAULT_TTL_SECONDS)))
+    return _backend
+
+register_resource(
+    "state_backend",
+    get_state_backend,
+    health=lambda backend: dict(backend.stats(), backend=backend.name)
+)
+
+def _session_id():
+    """The session ID from the URL, creating one for a new visitor."""
+    session_id = st.query_params.get(SESSION_PARAM)
+    if not session_id or not SESSION_ID_PATTERN.match(session_id):
+        session_id = secrets.token_urlsafe(24)
+        st.query_params[SESSION_PARAM] = session_id
+    return session_id
+
+def _browser_binding(secret):
+    """Hash of a browser secret as stored with the session."""
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()
+
+def _browser_secret():
+    """The browser secret from this connection's cookies, or None."""
+    secret = st.context.cookies.get(BROWSER_COOKIE)
+    return secret if isinstance(secret, str) and BROWSER_SECRET_PATTERN.match(secret) else None
+
+def _storable(value):
+    """Whether a session value can be stored as JSON."""
+    if value is None:
+        return False
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+def restore_session_state():
+    """
+    Load the user's stored state into st.session_state.
+
+    Runs at the top of every script run, but only reads the backend when
+    this connection has not loaded the session yet (a new tab, a reconnect
+    or a request served by another worker), so sessions need no affinity
+    to the process that created them. The login keys are restored only
+    when the browser presents the cookie the session was bound to at
+    login, so the session ID in a copied or planted link is not enough.
+    """
+    session_id = _session_id()
+    if st.session_state.get(_LOADED_KEY) == session_id:
+        return
+    state = get_state_backend().load(session_id) or {}
+    binding = state.get(_BINDING_FIELD)
+    secret = _browser_secret()
+    bound = bool(binding and secret and hmac.compare_digest(binding, _browser_binding(secret)))
+    for key, value in state.items():
+        if key in PERSISTENT_KEYS and (bound or key not in AUTH_KEYS):
+            st.session_state[key] = value
+    if bound:
+        st.session_state[_BINDING_KEY] = binding
+    elif binding:
+        # Another browser's session: continue under a new ID rather than overwrite it
+        session_id = secrets.token_urlsafe(24)
+        st.query_params[SESSION_PARAM] = session_id
+        state = None
+    st.session_state[_LOADED_KEY] = session_id
+    st.session_state[_SAVED_KEY] = state
+
+def start_authenticated_session():
+    """
+    Move the user to a new session ID bound to this browser (call on login).
+
+    A fresh ID means a session ID known before login, for example one
+    planted in a link, never gains the login. The session is bound to a
+    random secret kept in a cookie, reusing the browser's existing one.
+    """
+    old_session_id = st.session_state.get(_LOADED_KEY)
+    if old_session_id:
+        get_state_backend().delete(old_session_id)
+    session_id = secrets.token_urlsafe(24)
+    st.query_params[SESSION_PARAM] = session_id
+    st.session_state[_LOADED_KEY] = session_id
+    st.session_state[_SAVED_KEY] = None
+
+    secret = _browser_secret()
+    if secret is None:
+        secret = secrets.token_urlsafe(32)
+        # Written by the next complete run; st.rerun() would drop the script
+        st.session_state[_PENDING_COOKIE_KEY] = secret
+    st.session_state[_BINDING_KEY] = _browser_binding(secret)
+
+def _write_browser_cookie(secret, max_age):
+    """Set the browser secret cookie from the page."""
+    # Imported here: only runs once per login
+    import streamlit.components.v1 as components
+
+    # The component is an about:srcdoc frame, which cannot set cookies itself
+    components.html(f"""<script>
+        var secure = window.parent.location.protocol === "https:" ? "; Secure" : "";
+        window.parent.document.cookie = "{BROWSER_COOKIE}={secret}; path=/; max-age={int(max_age)}; SameSite=Strict" + secure;
+    </script>""", height=0)
+
+def persist_session_state():
+    """
+    Store the persistent keys of st.session_state if they changed.
+
+    Runs at the end of every script run; st.rerun() skips it, but the run
+    it starts saves the state in its place.
+    """
+    global _last_purge
+    session_id = st.session_state.get(_LOADED_KEY)
+    if not session_id:
+        return
+    backend = get_state_backend()
+    secret = st.session_state.pop(_PENDING_COOKIE_KEY, None)
+    if secret:
+        _write_browser_cookie(secret, getattr(backend, "ttl_seconds", DEFAULT_TTL_SECONDS))
+    state = {}
+    for key in PERSISTENT_KEYS:
+        value = st.session_state.get(key)
+        if _storable(value):
+            state[key] = value
+    binding = st.session_state.get(_BINDING_KEY)
+    if binding:
+        state[_BINDING_FIELD] = binding
+    if state == st.session_state.get(_SAVED_KEY):
+        return
+    backend.save(session_id, state)
+    st.session_state[_SAVED_KEY] = state
+
+    now = time.time()
+    if now - _last_purge > PURGE_INTERVAL_SECONDS:
+        _last_purge = now
+        backend.purge()
+
+def clear_session_state():
+    """Forget the user's stored state and everything in st.session_state (logout)."""
+    session_id = st.session_state.get(_LOADED_KEY)
+    if session_id:
+        get_state_backend().delete(session_id)
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    # A fresh ID, so a copied link to the old session cannot restore it
+    st.query_params[SESSION_PARAM] = secrets.token_urlsafe(24)
@@ -0,0 +1,434 @@
+import os
+import re
+import json
+import math
+import zlib
+import sqlite3
+import hashlib
+import threading
+from collections import Counter
+from functools import lru_cache
+import numpy as np
+from data.database import get_connection
+from utils.resources import register_resource
+
+# MinHash signature length and LSH banding (32 bands of 4 rows); pairs with a
+# shingle Jaccard similarity above roughly 0.45 are very likely to share a band
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 5
+
+# Estimated Jaccard similarity of word 5-shingles above which essays are
+# flagged as near-duplicates, and above which a student's own resubmission
+# reuses its earlier feedback
+NEAR_DUPLICATE_THRESHOLD = 0.5
+REUSE_THRESHOLD = 0.9
+# Cosine similarity of embeddings above which essays are flagged as similar
+SIMILAR_THRESHOLD = 0.9
+MAX_MATCHES = 5
+
+# Grading tiers whose results are never handed out again (placeholder grades made without the model)
+UNREUSABLE_TIERS = ("simulated",)
+
+# Fixed seed: signatures are stored, so every process must use the same permutations
+_rng = np.random.default_rng(9241)
+_PERM_A = _rng.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+STOPWORDS = {
+    "the", "and", "for", "are", "but", "not", "you", "all", "can", "her", "was", "one", "our",
+    "has", "had", "his", "how", "its", "who", "did", "this", "that", "with", "from", "they",
+    "have", "were", "been", "their", "there", "which", "would", "could", "should", "about",
+    "into", "than", "then", "them", "these", "those", "also", "such", "more", "most", "very"
+}
+
+INDEX_ROWS_QUERY = """
+    SELECT id, student_id, context, embedder, minhash, embedding
+    FROM essay_index WHERE id > ? ORDER BY id
+"""
+INSERT_ESSAY = """
+    INSERT INTO essay_index (student_id, context, embedder, minhash, embedding, result)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+def tokenize(text):
+    """Lower-cased word tokens of text."""
+    return TOKEN_PATTERN.findall(str(text or "").lower())
+
+def minhash_signature(tokens):
+    """
+    Compute the MinHash signature of a text's word shingles.
+
+    Args:
+        tokens: Word tokens from tokenize()
+
+    Returns:
+        uint32 array of NUM_PERMUTATIONS minimum hash values
+    """
+    size = min(SHINGLE_SIZE, len(tokens))
+    shingles = {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    # Multiply-shift hashing; uint64 arithmetic wraps, which the scheme relies on
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) >> np.uint64(32)
+    return permuted.min(axis=0).astype(np.uint32)
+
+def context_key(prompt, criteria):
+    """
+    Identify the grading context of an essay, so feedback is only reused
+    for the same prompt and rubric.
+
+    Args:
+        prompt: The essay prompt
+        criteria: Dictionary of grading criteria and weights
+
+    Returns:
+        Hex digest of the prompt and criteria
+    """
+    payload = json.dumps({"prompt": " ".join(str(prompt).split()), "criteria": criteria}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+class HashingEmbedder:
+    """
+    Embed text as a signed feature-hashing vector of words and word pairs.
+
+    Term counts are sublinearly scaled (1 + log tf) and the vector is
+    L2-normalized, so dot products are cosine similarities. Needs no
+    vocabulary, training data or network access.
+    """
+
+    def __init__(self, dim=256):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, tokens):
+        """
+        Embed tokenized text.
+
+        Args:
+            tokens: Word tokens from tokenize()
+
+        Returns:
+            float32 unit vector of length dim (all zeros for empty text)
+        """
+        words = [token for token in tokens if len(token) > 2 and token not in STOPWORDS]
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, count in features.items():
+            h = zlib.crc32(feature.encode("utf-8"))
+            vector[h % self.dim] += (1.0 if h & 0x80000000 else -1.0) * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+# Embedders selectable with EDUTUTOR_EMBEDDER; register_embedder adds more
+EMBEDDERS = {"hashing": HashingEmbedder}
+
+def register_embedder(name, factory):
+    """
+    Make an embedder available to the similarity index.
+
+    Args:
+        name: Value of EDUTUTOR_EMBEDDER that selects it
+        factory: Zero-argument callable returning an object with "name" and
+            "dim" attributes and an embed(tokens) method returning a unit
+            vector of length dim
+    """
+    EMBEDDERS[name] = factory
+
+def get_embedder():
+    """
+    Get the embedder selected by EDUTUTOR_EMBEDDER (default "hashing").
+
+    Returns:
+        An embedder instance
+    """
+    return EMBEDDERS.get(os.environ.get("EDUTUTOR_EMBEDDER", "hashing"), HashingEmbedder)()
+
+class SimilarityIndex:
+    """
+    Index of submitted essays for near-duplicate and similarity checks.
+
+    Each essay is stored as a MinHash signature and an embedding; the text
+    itself is not kept. Near-duplicate candidates are found through LSH
+    buckets, so a check only compares against essays that share a band,
+    and semantic neighbours are found with one matrix-vector product over
+    the embeddings. Essays are persisted in the essay_index table and new
+    rows written by other workers are picked up before every check.
+    """
+
+    def __init__(self, embedder=None):
+        """
+        Initialize an empty index.
+
+        Args:
+            embedder: Optional embedder (defaults to get_embedder())
+        """
+        self.embedder = embedder or get_embedder()
+        self._lock = threading.RLock()
+        self._size = 0
+        self._last_id = 0
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._signatures = np.zeros((0, NUM_PERMUTATIONS), dtype=np.uint32)
+        self._embeddings = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self._student_ids = []
+        self._contexts = []
+        self._buckets = [{} for _ in range(LSH_BANDS)]
+
+    def __len__(self):
+        return self._size
+
+    @lru_cache(maxsize=64)
+    def _fingerprint(self, text):
+        """Signature and embedding of a text (cached so check + add compute them once)."""
+        tokens = tokenize(text)
+        if not tokens:
+            return None
+        return minhash_signature(tokens), self.embedder.embed(tokens)
+
+    def _reserve(self, count):
+        """Grow the arrays to hold at least count essays."""
+        if count <= len(self._ids):
+            return
+        capacity = max(count, 2 * len(self._ids), 1024)
+        for name in ("_ids", "_signatures", "_embeddings"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def _band_keys(self, signatures):
+        """
+        Bucket keys of the LSH bands of one or more signatures.
+
+        Each band's rows are folded into one 64-bit integer; a collision
+        only merges two buckets, and candidates are verified afterwards.
+        """
+        halves = np.ascontiguousarray(signatures).reshape(-1, NUM_PERMUTATIONS).view(np.uint64)
+        halves = halves.reshape(len(halves), LSH_BANDS, ROWS_PER_BAND // 2)
+        keys = halves[:, :, 0]
+        for column in range(1, ROWS_PER_BAND // 2):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) ^ halves[:, :, column]
+        return keys
+
+    def _extend(self, essay_ids, student_ids, contexts, signatures, embeddings):
+        """Add a block of essays to the in-memory structures."""
+        start, count = self._size, len(essay_ids)
+        self._reserve(start + count)
+        self._ids[start:start + count] = essay_ids
+        self._signatures[start:start + count] = signatures
+        self._embeddings[start:start + count] = embeddings
+        self._student_ids.extend(student_ids)
+        self._contexts.extend(contexts)
+        for row, keys in enumerate(self._band_keys(signatures).tolist(), start=start):
+            for bucket, key in zip(self._buckets, keys):
+                bucket.setdefault(key, []).append(row)
+        self._size += count
+        self._last_id = max(self._last_id, int(max(essay_ids)))
+
+    def refresh(self):
+        """Load essays added to the database since the last refresh."""
+        with self._lock:
+            rows = get_connection().execute(INDEX_ROWS_QUERY, (self._last_id,)).fetchall()
+            if not rows:
+                return
+            signatures = np.frombuffer(b"".join(row["minhash"] for row in rows), dtype=np.uint32)
+            # Essays stored with another embedder are usable for near-duplicates only
+            empty = bytes(4 * self.embedder.dim)
+            embeddings = np.frombuffer(b"".join(
+                row["embedding"] if row["embedder"] == self.embedder.name else empty for row in rows
+            ), dtype=np.float32)
+            self._extend(
+                [row["id"] for row in rows],
+                [row["student_id"] for row in rows],
+                [row["context"] for row in rows],
+                signatures.reshape(len(rows), NUM_PERMUTATIONS),
+                embeddings.reshape(len(rows), self.embedder.dim)
+            )
+
+    def check(self, text, student_id=None, context=None):
+        """
+        Compare an essay with every indexed essay.
+
+        Args:
+            text: Essay text
+            student_id: Optional ID of the author; their own earlier essays
+                are reported but not flagged
+            context: Optional context_key(); only the same student's essays
+                graded in the same context are offered for feedback reuse
+
+        Returns:
+            Dict with "flags" (messages for teachers), "matches" (up to
+            MAX_MATCHES closest essays) and "reusable_id" (ID of the
+            student's own essay whose stored feedback can be reused, or None)
+        """
+        report = {"flags": [], "matches": [], "reusable_id": None}
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return report
+        signature, embedding = fingerprint
+
+        with self._lock:
+            self.refresh()
+            if not self._size:
+                return report
+
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(signature)[0].tolist()):
+                candidates.update(bucket.get(key, ()))
+
+            cosine = self._embeddings[:self._size] @ embedding
+            nearest = np.argpartition(-cosine, min(MAX_MATCHES, self._size - 1))[:MAX_MATCHES]
+            candidates.update(int(row) for row in nearest if cosine[row] >= SIMILAR_THRESHOLD)
+            if not candidates:
+                return report
+
+            rows = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            jaccard = (self._signatures[rows] == signature).mean(axis=1)
+            order = np.lexsort((-cosine[rows], -jaccard))[:MAX_MATCHES]
+
+            for row, similarity in zip(rows[order], jaccard[order]):
+                similarity, row_cosine = float(similarity), float(cosine[row])
+                if similarity < NEAR_DUPLICATE_THRESHOLD and row_cosine < SIMILAR_THRESHOLD:
+                    continue
+                match_student = self._student_ids[row]
+                same_student = student_id is not None and match_student == student_id
+                report["matches"].append({
+                    "essay_id": int(self._ids[row]),
+                    "student_id": match_student,
+                    "jaccard": round(similarity, 3),
+                    "cosine": round(row_cosine, 3),
+                    "same_student": same_student
+                })
+                # Another student's grade is never handed out: a copy must be graded and flagged
+                if report["reusable_id"] is None and same_student and similarity >= REUSE_THRESHOLD \
+                        and context is not None and self._contexts[row] == context:
+                    report["reusable_id"] = int(self._ids[row])
+                if not same_student:
+                    author = match_student or "another submission"
+                    if similarity >= NEAR_DUPLICATE_THRESHOLD:
+                        report["flags"].append(
+                            f"Near-duplicate of essay #{self._ids[row]} by {author} ({similarity:.0%} overlap)"
+                        )
+                    else:
+                        report["flags"].append(
+                            f"Highly similar to essay #{self._ids[row]} by {author} (similarity {row_cosine:.2f})"
+                        )
+            return report
+
+    def add(self, text, student_id=None, context="", result=None):
+        """
+        Index an essay and store its grading result for reuse.
+
+        Args:
+            text: Essay text
+            student_id: Optional ID of the author
+            context: context_key() of the prompt and criteria
+            result: Optional grading result dictionary
+
+        Returns:
+            The new essay ID, or None for empty text
+        """
+        fingerprint = self._fingerprint(text)
+        if fingerprint is None:
+            return None
+        signature, embedding = fingerprint
+
+        with self._lock:
+            self.refresh()
+            conn = get_connection()
+            with conn:
+                cursor = conn.execute(INSERT_ESSAY, (
+                    student_id, context, self.embedder.name,
+                    signature.tobytes(), embedding.astype(np.float32).tobytes(),
+                    json.dumps(result) if result is not None else None
+                ))
+            self._extend([cursor.lastrowid], [student_id], [context], signature[None], embedding[None])
+            return cursor.lastrowid
+
+    def get_result(self, essay_id):
+        """
+        Get the stored grading result of an indexed essay.
+
+        Args:
+            essay_id: ID from add() or a check() match
+
+        Returns:
+            The result dictionary, or None if none is stored or it may not be reused
+        """
+        row = get_connection().execute("SELECT result FROM essay_index WHERE id = ?", (essay_id,)).fetchone()
+        result = json.loads(row["result"]) if row and row["result"] else None
+        return None if result is None or result.get("grading_tier") in UNREUSABLE_TIERS else result
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_similarity_index():
+    """
+    Get the essay similarity index shared by all sessions.
+
+    Returns:
+        The shared SimilarityIndex
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SimilarityIndex()
+    return _index
+
+register_resource(
+    "similarity_index",
+    get_similarity_index,
+    warm_up=lambda index: index.refresh(),
+    health=lambda index: {"essays": len(index), "embedder": index.embedder.name}
+)
+
+def find_similar(text, student_id, prompt, criteria):
+    """
+    Check an essay against the index before grading it.
+
+    Args:
+        text: Essay text
+        student_id: Optional ID of the author
+        prompt: The essay prompt
+        criteria: Dictionary of grading criteria and weights
+
+    Returns:
+        Tuple of (similarity report or None if the index is unavailable,
+        stored result of the student's own near-identical essay graded in
+        the same context or None)
+    """
+    index = get_similarity_index()
+    try:
+        similarity = index.check(text, student_id, context_key(prompt, criteria))
+        reused = index.get_result(similarity["reusable_id"]) if similarity["reusable_id"] else None
+    except sqlite3.Error:
+        # The index is advisory; grading must not fail because of it
+        return None, None
+    return similarity, reused
+
+def index_essay(text, student_id, prompt, criteria, result):
+    """
+    Add a graded essay to the index.
+
+    Args:
+        text: Essay text
+        student_id: Optional ID of the author
+        prompt: The essay prompt
+        criteria: Dictionary of grading criteria and weights
+        result: Grading result to store for reuse
+    """
+    if result.get("grading_tier") in UNREUSABLE_TIERS:
+        # The essay still counts for similarity flags, but its placeholder grade is not stored
+        result = None
+    else:
+        result = {key: value for key, value in result.items() if key != "similarity"}
+    try:
+        get_similarity_index().add(text, student_id, context_key(prompt, criteria), result)
+    except sqlite3.Error:
+        pass
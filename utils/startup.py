@@ -0,0 +1,190 @@
+"""
+Cold-start helpers for the Streamlit app.
+
+app.py imports only what the login page needs; the modules that pull in
+langchain, openai, plotly and pandas are imported by the pages that use
+them. Once the first page has been sent to the browser, the end of that
+script run imports them and warms their shared resources, so the first
+visit to those pages is not slowed down either. The preload runs on the
+script thread rather than in the background: plotly and streamlit look up
+pandas in sys.modules without importing it, and would see a half-imported
+module while another thread is loading it.
+
+The startup profile runs app.py once, outside Streamlit, under
+``python -X importtime`` and reports where the import time goes.
+
+Usage:
+    python app.py --profile-startup                  # profile the cold start
+    python -m utils.startup --top 15 --budget-ms 1500
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+import importlib
+import subprocess
+
+# Modules deferred by app.py, in the order the preload imports them
+HEAVY_MODULES = [
+    "utils.data_processing",
+    "utils.visualization",
+    "utils.class_analytics",
+    "utils.progress_series",
+    "utils.recommendations",
+    "utils.insight_scheduler",
+    "utils.ai_assessment",
+]
+
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+DEFAULT_TOP_MODULES = 25
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+_preloaded = False
+_preload_lock = threading.Lock()
+
+def preload_enabled():
+    """Check whether preloading is on (EDUTUTOR_PRELOAD, default on)."""
+    return os.environ.get("EDUTUTOR_PRELOAD", "1").lower() not in ("0", "false", "no", "off")
+
+def preload_deferred_modules(modules=None):
+    """
+    Import the deferred modules and warm their resources, once per process.
+
+    Call this at the end of a script run: everything the page draws has
+    already been sent to the browser, so the preload never delays it.
+
+    Args:
+        modules: Optional list of module names (defaults to HEAVY_MODULES)
+
+    Returns:
+        True if this call ran the preload, False if it was done already or
+        preloading is disabled
+    """
+    global _preloaded
+    if _preloaded or not preload_enabled():
+        return False
+    with _preload_lock:
+        if _preloaded:
+            return False
+        for name in modules or HEAVY_MODULES:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                # The page that needs the module will raise the error itself
+                continue
+        # Imported here so the registry used is the one the modules filled in
+        from utils.resources import warm_up_resources
+        warm_up_resources()
+        _preloaded = True
+    return True
+
+def parse_import_times(lines):
+    """
+    Parse the output of ``python -X importtime``.
+
+    Args:
+        lines: Iterable of stderr lines
+
+    Returns:
+        List of {"module", "self_ms", "cumulative_ms", "depth"} dicts in
+        the order the imports finished
+    """
+    imports = []
+    for line in lines:
+        match = IMPORT_TIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        imports.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+            # Nested imports are indented two spaces per level
+            "depth": (len(indent) - 1) // 2
+        })
+    return imports
+
+def profile_startup(script=APP_SCRIPT, top=DEFAULT_TOP_MODULES):
+    """
+    Measure the import time of one cold run of a Streamlit script.
+
+    The script runs in a fresh interpreter in Streamlit's bare mode with
+    preloading disabled, so only the imports of the first page are counted.
+
+    Args:
+        script: Path of the script to profile
+        top: Number of slowest modules to report
+
+    Returns:
+        Dictionary with "total_ms" (all imports), "packages" (self time by
+        top-level package, slowest first) and "modules" (the top slowest
+        imports by cumulative time)
+    """
+    script = os.path.abspath(script)
+    code = (
+        "import sys, runpy; "
+        f"sys.path.insert(0, {os.path.dirname(script)!r}); "
+        f"runpy.run_path({script!r}, run_name='__main__')"
+    )
+    env = dict(os.environ, EDUTUTOR_PRELOAD="0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=os.path.dirname(script),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    imports = parse_import_times(result.stderr.splitlines())
+    if result.returncode != 0:
+        raise RuntimeError(f"{script} exited with status {result.returncode}:\n{result.stderr[-2000:]}")
+
+    packages = {}
+    for entry in imports:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0) + entry["self_ms"]
+    slowest = sorted(imports, key=lambda entry: entry["cumulative_ms"], reverse=True)
+    return {
+        "total_ms": round(sum(entry["cumulative_ms"] for entry in imports if entry["depth"] == 0), 1),
+        "packages": {
+            package: round(ms, 1)
+            for package, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)
+        },
+        "modules": [
+            {"module": entry["module"], "self_ms": round(entry["self_ms"], 1), "cumulative_ms": round(entry["cumulative_ms"], 1)}
+            for entry in slowest[:top]
+        ]
+    }
+
+def main(argv=None):
+    """Command-line entry point: print the startup profile of app.py."""
+    parser = argparse.ArgumentParser(description="Report the import time of the EduTutor app's cold start.")
+    parser.add_argument("--script", default=APP_SCRIPT, help="Streamlit script to profile")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_MODULES, help="Number of slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=os.environ.get("EDUTUTOR_STARTUP_BUDGET_MS"),
+                        help="Fail if total import time exceeds this many milliseconds")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = profile_startup(args.script, args.top)
+    over_budget = args.budget_ms is not None and report["total_ms"] > float(args.budget_ms)
+    if args.json:
+        print(json.dumps(dict(report, budget_ms=args.budget_ms, over_budget=over_budget), indent=2))
+    else:
+        print(f"Total import time: {report['total_ms']:.1f} ms")
+        if args.budget_ms is not None:
+            print(f"Budget: {float(args.budget_ms):.1f} ms ({'OVER' if over_budget else 'ok'})")
+        print("\nSelf time by package:")
+        for package, ms in list(report["packages"].items())[:args.top]:
+            print(f"  {ms:9.1f} ms  {package}")
+        print("\nSlowest imports (cumulative):")
+        for entry in report["modules"]:
+            print(f"  {entry['cumulative_ms']:9.1f} ms  {entry['self_ms']:8.1f} ms self  {entry['module']}")
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
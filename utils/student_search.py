@@ -0,0 +1,279 @@
+"""
+Type-ahead search over the student roster.
+
+The index answers a query in two passes. A prefix pass binary-searches a
+sorted list of first names, last names, full names and IDs, so "emm",
+"johnson" and "s10" each find their matches with one bisect. When that
+yields fewer than the requested matches, a trigram pass over the distinct
+full names finds infix matches and typos ("ohnso", "emma jonson") by
+counting shared trigrams with one bincount. Results are student IDs, so
+students who share a name stay distinct.
+
+Usage:
+    python -m utils.student_search --benchmark            # time queries on 100,000 students
+    python -m utils.student_search --benchmark --students 1000000
+"""
+import sys
+import json
+import time
+import bisect
+import argparse
+import threading
+import numpy as np
+import streamlit as st
+from data.student_data import get_all_students, get_student_repository
+from utils.resources import register_resource
+
+DEFAULT_LIMIT = 20
+# Share of a query's trigrams a name must contain to count as a fuzzy match
+MIN_TRIGRAM_SHARE = 0.5
+# Prefix entries read per match wanted, to leave room for students hit by two keys
+PREFIX_OVERSCAN = 4
+
+def _normalize(text):
+    """Lower-case text with runs of whitespace collapsed to single spaces."""
+    return " ".join(str(text).lower().split())
+
+def _trigrams(text):
+    """The distinct three-character substrings of a normalized string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class StudentSearchIndex:
+    """Prefix and trigram index of student names and IDs."""
+
+    def __init__(self, students):
+        """
+        Build the index.
+
+        Args:
+            students: List of student dictionaries in roster order
+        """
+        self.ids = [student["id"] for student in students]
+        self.names = [get_student_repository().display_name(student) for student in students]
+        self._positions = {student_id: i for i, student_id in enumerate(self.ids)}
+
+        keys = []
+        owners = []
+        students_by_name = {}
+        for i, (student, name) in enumerate(zip(students, self.names)):
+            full = _normalize(name)
+            for key in {_normalize(student["first_name"]), _normalize(student["last_name"]), full,
+                        student["id"].lower()}:
+                keys.append(key)
+                owners.append(i)
+            students_by_name.setdefault(full, []).append(i)
+
+        # A stable sort keeps students with the same key in roster order
+        order = np.argsort(np.array(keys), kind="stable")
+        self._keys = [keys[i] for i in order]
+        self._key_owners = np.asarray(owners, dtype=np.int32)[order]
+
+        self._distinct_names = list(students_by_name)
+        self._name_students = [np.asarray(positions, dtype=np.int32) for positions in students_by_name.values()]
+        postings = {}
+        for name_index, name in enumerate(self._distinct_names):
+            for gram in _trigrams(f" {name} "):
+                postings.setdefault(gram, []).append(name_index)
+        self._postings = {gram: np.asarray(indexes, dtype=np.int32) for gram, indexes in postings.items()}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, student_id):
+        return student_id in self._positions
+
+    def label(self, student_id):
+        """
+        Get the text shown for a student in the picker.
+
+        Args:
+            student_id: The ID of the student
+
+        Returns:
+            str: "First Last (ID)"
+        """
+        position = self._positions.get(student_id)
+        return student_id if position is None else f"{self.names[position]} ({student_id})"
+
+    def _prefix_matches(self, query, limit, results, seen):
+        """Add the students with a key starting with the query."""
+        low = bisect.bisect_left(self._keys, query)
+        high = bisect.bisect_left(self._keys, query + "￿", low, min(len(self._keys), low + limit * PREFIX_OVERSCAN))
+        for position in self._key_owners[low:high].tolist():
+            if position not in seen:
+                seen.add(position)
+                results.append(position)
+                if len(results) == limit:
+                    return
+
+    def _trigram_matches(self, query, limit, results, seen):
+        """Add the students whose names share most of the query's trigrams, best first."""
+        grams = _trigrams(query)
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return
+        counts = np.bincount(np.concatenate(postings), minlength=len(self._distinct_names))
+        candidates = np.flatnonzero(counts >= max(1, MIN_TRIGRAM_SHARE * len(grams)))
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-counts[candidates], limit - 1)[:limit]]
+        # Most shared trigrams first, then shorter (closer) names
+        for name_index in sorted(candidates.tolist(),
+                                 key=lambda n: (-counts[n], len(self._distinct_names[n]), n)):
+            for position in self._name_students[name_index].tolist():
+                if position not in seen:
+                    seen.add(position)
+                    results.append(position)
+                    if len(results) == limit:
+                        return
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """
+        Find the students best matching a query.
+
+        Args:
+            query: Part of a first name, last name, full name or student ID
+            limit: Maximum number of matches
+
+        Returns:
+            List of student IDs, best match first; the first students of the
+            roster for an empty query
+        """
+        query = _normalize(query)
+        if not query:
+            return self.ids[:limit]
+
+        results = []
+        seen = set()
+        exact = self._positions.get(query.upper())
+        if exact is not None:
+            results.append(exact)
+            seen.add(exact)
+        if len(results) < limit:
+            self._prefix_matches(query, limit, results, seen)
+        if len(results) < limit and len(query) >= 3:
+            self._trigram_matches(query, limit, results, seen)
+        return [self.ids[position] for position in results]
+
+_index = None
+# Reentrant: a build that reads a stale roster notifies the listener on the same thread
+_index_lock = threading.RLock()
+
+def _on_student_saved(student):
+    """Rebuild the index lazily after any roster change."""
+    global _index
+    with _index_lock:
+        _index = None
+
+get_student_repository().subscribe(_on_student_saved)
+
+def get_student_search_index():
+    """
+    Get the search index shared by all sessions.
+
+    Returns:
+        StudentSearchIndex for the current roster
+    """
+    global _index
+    index = _index
+    if index is None:
+        with _index_lock:
+            if _index is None:
+                _index = StudentSearchIndex(get_all_students())
+            index = _index
+    return index
+
+register_resource(
+    "student_search",
+    get_student_search_index,
+    health=lambda index: {"students": len(index)}
+)
+
+def student_picker(label, key, container=None, limit=DEFAULT_LIMIT, label_visibility="visible"):
+    """
+    Draw a search box and a selectbox of the students matching it.
+
+    Only the top matches are sent to the browser. The selectbox holds
+    student IDs, and a new search selects its best match unless the
+    current student is still among the results.
+
+    Args:
+        label: Label of the search box
+        key: Widget key; the selected ID is kept in st.session_state[key]
+        container: Streamlit container to draw in (defaults to st)
+        limit: Most matches offered
+        label_visibility: Label visibility of the search box
+
+    Returns:
+        The selected student ID, or None if nothing matches
+    """
+    container = container or st
+    index = get_student_search_index()
+    query = container.text_input(label, key=f"{key}_query", placeholder="Type a name or student ID",
+                                 label_visibility=label_visibility)
+    matches = index.search(query, limit)
+    if st.session_state.get(key) not in matches:
+        st.session_state.pop(key, None)
+    if not matches:
+        container.caption("No students match your search.")
+        return None
+    return container.selectbox(f"{label} (matches)", matches, format_func=index.label, key=key,
+                               label_visibility="collapsed")
+
+def benchmark(students=100000, queries=2000, limit=DEFAULT_LIMIT, seed=0):
+    """
+    Time searches on a synthetic roster.
+
+    Args:
+        students: Roster size
+        queries: Number of queries timed per kind
+        limit: Matches per query
+        seed: Roster seed
+
+    Returns:
+        Dict with the build time and mean/p99 query time per query kind
+    """
+    from utils.roster_generator import RosterGenerator
+
+    columns = RosterGenerator(seed, assessments=[]).students(0, 0, students)[0]
+    roster = [{"id": student_id, "first_name": first, "last_name": last}
+              for student_id, first, last in zip(columns["id"], columns["first_name"], columns["last_name"])]
+    started = time.perf_counter()
+    index = StudentSearchIndex(roster)
+    report = {"students": students, "build_seconds": round(time.perf_counter() - started, 3)}
+
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(students, size=queries)
+    kinds = {
+        "prefix": [index.names[i][:3] for i in picks],
+        "full_name": [index.names[i] for i in picks],
+        "id": [index.ids[i] for i in picks],
+        "infix": [index.names[i][2:7] for i in picks],
+        "typo": [index.names[i][:-2] + index.names[i][-1] for i in picks]
+    }
+    for kind, texts in kinds.items():
+        timings = []
+        for text in texts:
+            started = time.perf_counter()
+            index.search(text, limit)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+        report[kind] = {"mean_ms": round(sum(timings) / len(timings) * 1000, 4),
+                        "p99_ms": round(timings[int(0.99 * len(timings))] * 1000, 4)}
+    return report
+
+def main(argv=None):
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the student search index.")
+    parser.add_argument("--benchmark", action="store_true", help="Time queries on a synthetic roster")
+    parser.add_argument("--students", type=int, default=100000, help="Roster size")
+    parser.add_argument("--queries", type=int, default=2000, help="Queries timed per kind")
+    parser.add_argument("--seed", type=int, default=0, help="Roster seed")
+    args = parser.parse_args(argv)
+    if not args.benchmark:
+        parser.print_help()
+        return 0
+    print(json.dumps(benchmark(args.students, args.queries, seed=args.seed), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
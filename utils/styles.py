@@ -0,0 +1,34 @@
+import os
+from functools import lru_cache
+import streamlit as st
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+@lru_cache(maxsize=None)
+def stylesheet(name):
+    """
+    Get a stylesheet from the assets directory as a <style> block.
+
+    The file is read once per process; every later rerun and session
+    reuses the same string.
+
+    Args:
+        name: Stylesheet name without extension (e.g. "app")
+
+    Returns:
+        HTML string with the stylesheet wrapped in a <style> tag
+    """
+    with open(os.path.join(ASSETS_DIR, f"{name}.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+def apply_stylesheet(name):
+    """
+    Add a stylesheet to the current page.
+
+    Streamlit drops elements a rerun does not emit again, so pages call
+    this on every run rather than once at import.
+
+    Args:
+        name: Stylesheet name without extension (e.g. "app")
+    """
+    st.markdown(stylesheet(name), unsafe_allow_html=True)
@@ -0,0 +1,229 @@
+import os
+import time
+import threading
+from functools import wraps
+from string import Formatter
+from collections import OrderedDict
+from utils.resources import register_resource
+
+DEFAULT_MAX_FRAGMENTS = 2048
+
+class Fragment:
+    """
+    An HTML template compiled once into its literal text and fields.
+
+    The source uses str.format placeholders ("{title}", "{average:.1f}");
+    only plain names are allowed, so rendering is a single join over the
+    precomputed parts.
+    """
+
+    def __init__(self, name, source):
+        """
+        Compile a template.
+
+        Args:
+            name: Unique fragment name
+            source: Template text with {field} placeholders
+        """
+        self.name = name
+        self.source = source
+        self._parts = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (not field.isidentifier() or conversion):
+                raise ValueError(f"Fragment {name!r}: unsupported placeholder {{{field}}}")
+            self._parts.append((literal, field, spec or ""))
+        self.fields = frozenset(field for _, field, _ in self._parts if field is not None)
+
+    def render(self, values):
+        """
+        Render the fragment.
+
+        Args:
+            values: Dictionary with a value for every field
+
+        Returns:
+            str: The rendered HTML
+        """
+        missing = self.fields.difference(values)
+        if missing:
+            raise KeyError(f"Fragment {self.name!r} is missing {', '.join(sorted(missing))}")
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(values[field], spec))
+        return "".join(out)
+
+class FragmentCache:
+    """
+    Bounded LRU of rendered HTML fragments shared by all sessions.
+
+    Entries are keyed by the fragment name and its input values, so a
+    rerun with unchanged data gets the string rendered the first time.
+    Hits, renders and render time are counted per fragment.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_FRAGMENTS):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of rendered fragments kept
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def get_or_render(self, name, key, render):
+        """
+        Get a rendered fragment, rendering it on a miss.
+
+        Args:
+            name: Fragment name the statistics are kept under
+            key: Hashable fingerprint of the fragment and its inputs
+            render: Callable returning the HTML
+
+        Returns:
+            str: The rendered HTML
+        """
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                self._stats.setdefault(name, [0, 0, 0.0, 0.0])[0] += 1
+                return html
+
+        started = time.perf_counter()
+        html = render()
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            stats = self._stats.setdefault(name, [0, 0, 0.0, 0.0])
+            stats[1] += 1
+            stats[2] += elapsed
+            stats[3] = max(stats[3], elapsed)
+        return html
+
+    def stats(self):
+        """
+        Get the per-fragment statistics.
+
+        Returns:
+            Dict of {name: {"hits", "renders", "hit_rate", "render_ms",
+            "mean_render_ms", "max_render_ms"}}
+        """
+        with self._lock:
+            snapshot = {name: list(stats) for name, stats in self._stats.items()}
+        return {
+            name: {
+                "hits": hits,
+                "renders": renders,
+                "hit_rate": round(hits / (hits + renders), 3) if hits + renders else 0.0,
+                "render_ms": round(seconds * 1000, 3),
+                "mean_render_ms": round(seconds * 1000 / renders, 3) if renders else 0.0,
+                "max_render_ms": round(slowest * 1000, 3)
+            }
+            for name, (hits, renders, seconds, slowest) in snapshot.items()
+        }
+
+    def clear(self):
+        """Drop every rendered fragment and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+_fragment_cache = None
+_fragment_cache_lock = threading.Lock()
+
+def get_fragment_cache():
+    """
+    Get the process-wide fragment cache.
+
+    The size is read from EDUTUTOR_FRAGMENT_CACHE_SIZE.
+
+    Returns:
+        The shared FragmentCache instance
+    """
+    global _fragment_cache
+    if _fragment_cache is None:
+        with _fragment_cache_lock:
+            if _fragment_cache is None:
+                _fragment_cache = FragmentCache(int(os.environ.get("EDUTUTOR_FRAGMENT_CACHE_SIZE", DEFAULT_MAX_FRAGMENTS)))
+    return _fragment_cache
+
+register_resource(
+    "fragment_cache",
+    get_fragment_cache,
+    health=lambda cache: {"fragments": len(cache), "stats": cache.stats()}
+)
+
+_fragments = {}
+
+def register_fragment(name, source):
+    """
+    Compile and register a template fragment.
+
+    Args:
+        name: Unique fragment name
+        source: Template text with {field} placeholders
+
+    Returns:
+        The compiled Fragment
+    """
+    fragment = Fragment(name, source)
+    _fragments[name] = fragment
+    return fragment
+
+def render_fragment(name, **values):
+    """
+    Render a registered fragment through the fragment cache.
+
+    Args:
+        name: Fragment name
+        **values: Field values; they must be hashable (strings and numbers)
+
+    Returns:
+        str: The rendered HTML
+    """
+    fragment = _fragments[name]
+    key = (name, tuple(sorted(values.items())))
+    return get_fragment_cache().get_or_render(name, key, lambda: fragment.render(values))
+
+def cached_fragment(builder):
+    """
+    Decorator that serves an HTML builder's output from the fragment cache.
+
+    For fragments assembled with loops or lookups that a template cannot
+    express. The builder must depend only on its (hashable) arguments.
+
+    Args:
+        builder: Function returning an HTML string
+
+    Returns:
+        The wrapped builder
+    """
+    name = builder.__name__
+
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        key = (f"{builder.__module__}.{builder.__qualname__}", args, tuple(sorted(kwargs.items())))
+        return get_fragment_cache().get_or_render(name, key, lambda: builder(*args, **kwargs))
+
+    return wrapper
+
+def fragment_stats():
+    """
+    Get the render statistics of every fragment rendered so far.
+
+    Returns:
+        Dict from FragmentCache.stats()
+    """
+    return get_fragment_cache().stats()